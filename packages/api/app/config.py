@@ -19,11 +19,20 @@ class Settings(BaseSettings):
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 60  # Short-lived for security (industry standard: 15-60 min)
     JWT_REFRESH_TOKEN_EXPIRE_DAYS: int = 30  # Extended from 7 to 30 days for better UX (industry standard: 7-30 days)
 
+    BCRYPT_ROUNDS: int = 12  # Existing hashes are upgraded to this cost on next login
+    PASSWORD_HASH_WORKERS: int = 2  # Threads for bcrypt; bounds concurrent hashing per process
+
     S3_ENDPOINT_URL: str = "http://localhost:9000"
     S3_ACCESS_KEY: str = "bugspark"
     S3_SECRET_KEY: str = "bugspark_dev"
     S3_BUCKET_NAME: str = "bugspark-uploads"
     S3_PUBLIC_URL: str = "http://localhost:9000/bugspark-uploads"
+    S3_REGION: str = ""  # Empty: "auto" for Cloudflare R2, else us-east-1
+    S3_MAX_CONNECTIONS: int = 50  # Pooled HTTP connections to storage per process
+    S3_TIMEOUT_SECONDS: float = 30.0  # Per-attempt read/write timeout
+    S3_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    S3_MAX_ATTEMPTS: int = 3  # Retry budget for connection errors, throttling and 5xx
+    IMAGE_PROCESSING_WORKERS: int = 2  # Processes for screenshot thumbnails; 0 disables the pipeline
 
     ANTHROPIC_API_KEY: str = ""
     AI_MODEL: str = "claude-haiku-4-5-20251001"
@@ -55,11 +64,17 @@ class Settings(BaseSettings):
     STRIPE_SECRET_KEY: str = ""
     STRIPE_PUBLISHABLE_KEY: str = ""
     STRIPE_WEBHOOK_SECRET: str = ""
+    STRIPE_API_BASE: str = ""  # Override to point the SDK at a local fake such as stripe-mock
+    STRIPE_TIMEOUT_SECONDS: float = 10.0  # Per-attempt HTTP timeout for Stripe calls
+    STRIPE_MAX_CONCURRENCY: int = 4  # Threads for blocking Stripe SDK calls per process
     STRIPE_PRICE_STARTER_MONTHLY: str = ""
     STRIPE_PRICE_STARTER_YEARLY: str = ""
     STRIPE_PRICE_TEAM_MONTHLY: str = ""
     STRIPE_PRICE_TEAM_YEARLY: str = ""
 
+    # Reject repeated report floods from an in-process fingerprint cache
+    DEDUPE_CACHE_ENABLED: bool = True
+
     ENVIRONMENT: str = "development"
 
     @property
@@ -20,6 +20,9 @@ from app.models.enums import BetaStatus, Role
 from app.models.personal_access_token import PersonalAccessToken
 from app.models.project import Project
 from app.models.user import User
+from app.services.api_key_cache_service import cache_invalid_key, cache_project, get_cached_project
+from app.services.pat_usage_service import pat_usage_tracker
+from app.services.user_cache_service import cache_user, get_cached_user
 
 logger = logging.getLogger(__name__)
 
@@ -61,9 +64,8 @@ async def _authenticate_via_pat(
             if pat_expires is not None and pat_expires < datetime.now(timezone.utc):
                 raise UnauthorizedException(translate("auth.token_expired", locale))
 
-            # Persist last_used_at — flush alone would roll back on read-only routes
-            pat.last_used_at = datetime.now(timezone.utc)
-            await db.commit()
+            # Written in batches by the task processor; see pat_usage_service
+            pat_usage_tracker.record(pat.id, datetime.now(timezone.utc))
 
             # Load the user
             user_result = await db.execute(select(User).where(User.id == pat.user_id))
@@ -109,12 +111,22 @@ async def get_current_user(
     if user_id is None:
         raise UnauthorizedException(translate("auth.token_missing_subject", locale))
 
-    result = await db.execute(select(User).where(User.id == user_id))
+    try:
+        user_uuid = uuid.UUID(user_id)
+    except ValueError:
+        raise UnauthorizedException(translate("auth.user_not_found", locale))
+
+    cached_user = get_cached_user(user_uuid, token, db)
+    if cached_user is not None:
+        return cached_user
+
+    result = await db.execute(select(User).where(User.id == user_uuid))
     user = result.scalar_one_or_none()
 
     if user is None:
         raise UnauthorizedException(translate("auth.user_not_found", locale))
 
+    cache_user(token, user)
     return user
 
 
@@ -166,9 +178,21 @@ async def validate_api_key(
     x_api_key: str = Header(..., alias="X-API-Key"),
     db: AsyncSession = Depends(get_db),
 ) -> Project:
+    """Resolve the widget API key to its active project (with owner).
+
+    Served from an in-process cache after the first lookup; see
+    ``api_key_cache_service``. The returned project is not attached to ``db``.
+    """
     locale = get_locale(request)
-    prefix = x_api_key[:12] if len(x_api_key) >= 12 else x_api_key
+    incoming_hash = hashlib.sha256(x_api_key.encode()).hexdigest()
+
+    hit, cached_project = get_cached_project(incoming_hash)
+    if hit:
+        if cached_project is None:
+            raise UnauthorizedException(translate("auth.invalid_api_key", locale))
+        return cached_project
 
+    prefix = x_api_key[:12] if len(x_api_key) >= 12 else x_api_key
     result = await db.execute(
         select(Project).where(
             Project.api_key_prefix == prefix,
@@ -177,29 +201,27 @@ async def validate_api_key(
     )
     candidates = result.scalars().all()
 
-    incoming_hash = hashlib.sha256(x_api_key.encode()).hexdigest()
     for project in candidates:
         if hmac.compare_digest(project.api_key_hash, incoming_hash):
+            cache_project(incoming_hash, project)
             return project
 
+    cache_invalid_key(incoming_hash)
     raise UnauthorizedException(translate("auth.invalid_api_key", locale))
 
 
 async def get_accessible_project_ids(
     user: User,
     db: AsyncSession,
-) -> list[uuid.UUID]:
-    """Return project IDs where user is owner OR has an accepted ProjectMember entry."""
-    from app.models.project_member import ProjectMember
-
-    owner_query = select(Project.id).where(Project.owner_id == user.id)
-    member_query = select(ProjectMember.project_id).where(
-        ProjectMember.user_id == user.id,
-        ProjectMember.invite_accepted_at.is_not(None),
-    )
-    combined = owner_query.union(member_query)
-    result = await db.execute(combined)
-    return [row[0] for row in result.all()]
+) -> frozenset[uuid.UUID]:
+    """Return project IDs where user is owner OR has an accepted ProjectMember entry.
+
+    Cached per user for a few seconds; list queries should filter with
+    ``accessible_project_filter`` rather than an ``IN`` over this set.
+    """
+    from app.services.project_access_service import get_accessible_project_ids as _cached_ids
+
+    return await _cached_ids(user.id, db)
 
 
 async def get_owned_project(
@@ -237,17 +259,7 @@ async def get_accessible_project(
     if user.role == Role.SUPERADMIN or project.owner_id == user.id:
         return project
 
-    from app.models.project_member import ProjectMember
-
-    member_result = await db.execute(
-        select(ProjectMember).where(
-            ProjectMember.project_id == project.id,
-            ProjectMember.user_id == user.id,
-            ProjectMember.invite_accepted_at.is_not(None),
-        )
-    )
-    member = member_result.scalar_one_or_none()
-    if member is None:
+    if project.id not in await get_accessible_project_ids(user, db):
         raise ForbiddenException(translate("project.not_owner", locale))
 
     return project
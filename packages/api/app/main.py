@@ -70,11 +70,19 @@ if settings.SENTRY_DSN:
 @asynccontextmanager
 async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
     """Start background task processor on startup, cancel on shutdown."""
-    from app.services.task_queue_service import start_task_processor
+    from app.services.image_processing_service import shutdown_executor
+    from app.services.storage_service import close_s3_client
+    from app.services.task_queue_service import flush_pat_usage, start_task_processor
 
     task = asyncio.create_task(start_task_processor())
     yield
     task.cancel()
+    try:
+        await flush_pat_usage(force=True)
+    except Exception as exc:
+        logger.error("PAT last-used flush on shutdown failed: %s", exc)
+    await close_s3_client()
+    shutdown_executor()
 
 
 app = FastAPI(
@@ -25,7 +25,9 @@ from starlette.responses import Response
 # Paths that ONLY the widget calls (never the dashboard).
 _WIDGET_ONLY_PREFIXES = (
     "/api/v1/projects/widget-config",
+    "/api/v1/projects/widget-bootstrap",
     "/api/v1/projects/console-log-quota",
+    "/api/v1/reports/batch",
     "/api/v1/upload/screenshot",
 )
 
@@ -66,6 +68,13 @@ def _is_widget_request(request: Request) -> bool:
     return False
 
 
+def _vary_on_origin(response: Response) -> None:
+    """The allowed origin is the request's own, so caches must key responses on it."""
+    vary = [value.strip() for value in response.headers.get("vary", "").split(",") if value.strip()]
+    if not any(value.lower() == "origin" for value in vary):
+        response.headers["Vary"] = ", ".join([*vary, "Origin"])
+
+
 class WidgetCORSMiddleware(BaseHTTPMiddleware):
     """Allow any origin for widget-facing endpoints."""
 
@@ -92,4 +101,5 @@ class WidgetCORSMiddleware(BaseHTTPMiddleware):
         response.headers["Access-Control-Allow-Origin"] = origin
         response.headers["Access-Control-Allow-Methods"] = _ALLOWED_METHODS
         response.headers["Access-Control-Allow-Headers"] = _ALLOWED_HEADERS
+        _vary_on_origin(response)
         return response
@@ -1,6 +1,7 @@
 from app.models.app_settings import AppSettings
 from app.models.background_task import BackgroundTask
 from app.models.comment import Comment
+from app.models.console_log_usage import ConsoleLogUsage
 from app.models.device_auth import DeviceAuthSession
 from app.models.enums import BetaStatus, Plan, Role
 from app.models.integration import Integration
@@ -9,8 +10,10 @@ from app.models.project import Project
 from app.models.project_member import ProjectMember
 from app.models.report import Category, Report, Severity, Status
 from app.models.report_analysis import ReportAnalysis
+from app.models.report_daily_stat import ReportDailyStat
 from app.models.stripe_webhook_event import StripeWebhookEvent
 from app.models.subscription import Subscription
+from app.models.usage_counter import UsageCounter
 from app.models.user import User
 from app.models.webhook import Webhook
 
@@ -19,6 +22,7 @@ __all__ = [
     "BackgroundTask",
     "BetaStatus",
     "Comment",
+    "ConsoleLogUsage",
     "DeviceAuthSession",
     "Integration",
     "PersonalAccessToken",
@@ -27,12 +31,14 @@ __all__ = [
     "ProjectMember",
     "Report",
     "ReportAnalysis",
+    "ReportDailyStat",
     "Role",
     "Severity",
     "Category",
     "Status",
     "StripeWebhookEvent",
     "Subscription",
+    "UsageCounter",
     "User",
     "Webhook",
 ]
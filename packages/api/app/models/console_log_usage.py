@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import uuid
+from datetime import date
+
+from sqlalchemy import Date, ForeignKey, Integer
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class ConsoleLogUsage(Base):
+    """Console-log-included reports per project and UTC day.
+
+    Slots are reserved with a single upsert (``console_log_quota_service``),
+    so concurrent submits can never push ``used`` past the daily limit.
+    """
+
+    __tablename__ = "console_log_usage"
+
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    used: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    # Slots granted by the reservation that last wrote the row, so one upsert
+    # can both apply a grant and return its size. Only meaningful in that
+    # statement's RETURNING.
+    last_granted: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
@@ -9,6 +9,7 @@ from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
+from app.utils.fingerprint import report_fingerprint
 from typing import Optional
 
 
@@ -35,10 +36,17 @@ class Status(str, enum.Enum):
     CLOSED = "closed"
 
 
+def _default_fingerprint(context) -> str:
+    params = context.get_current_parameters()
+    return report_fingerprint(params["title"], params.get("description"))
+
+
 class Report(Base):
     __tablename__ = "reports"
     __table_args__ = (
         Index("ix_reports_project_status_created", "project_id", "status", "created_at"),
+        Index("ix_reports_project_fingerprint_created", "project_id", "fingerprint", "created_at"),
+        Index("ix_reports_status_updated", "status", "updated_at"),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -50,6 +58,10 @@ class Report(Base):
     tracking_id: Mapped[str] = mapped_column(String(20), nullable=False)
     title: Mapped[str] = mapped_column(String(500), nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=False)
+    # Dedupe key: see app.utils.fingerprint. NULL for rows created before it existed.
+    fingerprint: Mapped[Optional[str]] = mapped_column(
+        String(64), nullable=True, default=_default_fingerprint
+    )
     severity: Mapped[Severity] = mapped_column(
         Enum(Severity, name="severity_enum", values_callable=lambda e: [x.value for x in e]),
         nullable=False,
@@ -71,6 +83,10 @@ class Report(Base):
     )
     screenshot_url: Mapped[Optional[str]] = mapped_column(String(1000), nullable=True)
     annotated_screenshot_url: Mapped[Optional[str]] = mapped_column(String(1000), nullable=True)
+    # Set by the image pipeline once both WebP renditions of screenshot_url are stored
+    screenshot_renditions_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
     console_logs: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
     network_logs: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
     user_actions: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
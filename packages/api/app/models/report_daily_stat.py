@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import uuid
+from datetime import date
+
+from sqlalchemy import DDL, Date, Enum, Float, ForeignKey, Index, Integer, SmallInteger, event
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+from app.models.report import Category, Severity, Status
+from app.models.usage_counter import COUNTER_SHARDS
+
+
+class ReportDailyStat(Base):
+    """Report counts per project, creation day (UTC) and severity/status/category.
+
+    Database triggers on ``reports`` apply signed deltas on INSERT, UPDATE and
+    DELETE, so dashboard stats read a table that grows with days and projects
+    rather than with report volume. Like ``usage_counters``, each bucket is
+    split across ``shard`` rows that readers sum.
+    ``stats_service.rebuild_report_daily_stats``
+    (``scripts/backfill_report_stats.py``) recomputes it from ``reports``.
+    """
+
+    __tablename__ = "report_daily_stats"
+    __table_args__ = (
+        Index("ix_report_daily_stats_day", "day"),
+    )
+
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    severity: Mapped[Severity] = mapped_column(
+        Enum(Severity, name="severity_enum", values_callable=lambda e: [x.value for x in e]),
+        primary_key=True,
+    )
+    status: Mapped[Status] = mapped_column(
+        Enum(Status, name="status_enum", values_callable=lambda e: [x.value for x in e]),
+        primary_key=True,
+    )
+    category: Mapped[Category] = mapped_column(
+        Enum(Category, name="category_enum", values_callable=lambda e: [x.value for x in e]),
+        primary_key=True,
+    )
+    shard: Mapped[int] = mapped_column(SmallInteger, primary_key=True, default=0, server_default="0")
+    report_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    # Sum of (updated_at - created_at) over the bucket's reports; divided by
+    # report_count on resolved/closed buckets it gives the average resolution time.
+    resolution_seconds: Mapped[float] = mapped_column(
+        Float, default=0, server_default="0", nullable=False
+    )
+
+
+# ---------- Trigger DDL for Base.metadata.create_all (tests, seed scripts) ----------
+# Alembic migration y6z7a8b9c0d1 installs the same PostgreSQL triggers in deployed databases.
+
+_PG_TRIGGER_DDL = [
+    f"""
+    CREATE OR REPLACE FUNCTION report_daily_stats_after_report_insert() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO report_daily_stats
+            (project_id, day, severity, status, category, shard, report_count, resolution_seconds)
+        SELECT project_id, (created_at AT TIME ZONE 'UTC')::date, severity, status, category,
+               mod(pg_backend_pid(), {COUNTER_SHARDS}), count(*),
+               sum(extract(epoch FROM updated_at - created_at))
+        FROM new_reports
+        GROUP BY 1, 2, 3, 4, 5
+        ON CONFLICT (project_id, day, severity, status, category, shard) DO UPDATE
+        SET report_count = report_daily_stats.report_count + EXCLUDED.report_count,
+            resolution_seconds = report_daily_stats.resolution_seconds + EXCLUDED.resolution_seconds;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    f"""
+    CREATE OR REPLACE FUNCTION report_daily_stats_after_report_update() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO report_daily_stats
+            (project_id, day, severity, status, category, shard, report_count, resolution_seconds)
+        SELECT project_id, day, severity, status, category,
+               mod(pg_backend_pid(), {COUNTER_SHARDS}), sum(cnt), sum(secs)
+        FROM (
+            SELECT project_id, (created_at AT TIME ZONE 'UTC')::date AS day, severity, status,
+                   category, 1 AS cnt, extract(epoch FROM updated_at - created_at) AS secs
+            FROM new_reports
+            UNION ALL
+            SELECT project_id, (created_at AT TIME ZONE 'UTC')::date, severity, status,
+                   category, -1, -extract(epoch FROM updated_at - created_at)
+            FROM old_reports
+        ) AS d
+        GROUP BY 1, 2, 3, 4, 5
+        ON CONFLICT (project_id, day, severity, status, category, shard) DO UPDATE
+        SET report_count = report_daily_stats.report_count + EXCLUDED.report_count,
+            resolution_seconds = report_daily_stats.resolution_seconds + EXCLUDED.resolution_seconds;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    f"""
+    CREATE OR REPLACE FUNCTION report_daily_stats_after_report_delete() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO report_daily_stats
+            (project_id, day, severity, status, category, shard, report_count, resolution_seconds)
+        SELECT project_id, (created_at AT TIME ZONE 'UTC')::date, severity, status, category,
+               mod(pg_backend_pid(), {COUNTER_SHARDS}), -count(*),
+               -sum(extract(epoch FROM updated_at - created_at))
+        FROM old_reports
+        WHERE EXISTS (SELECT 1 FROM projects p WHERE p.id = old_reports.project_id)
+        GROUP BY 1, 2, 3, 4, 5
+        ON CONFLICT (project_id, day, severity, status, category, shard) DO UPDATE
+        SET report_count = report_daily_stats.report_count + EXCLUDED.report_count,
+            resolution_seconds = report_daily_stats.resolution_seconds + EXCLUDED.resolution_seconds;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER trg_reports_daily_stats_insert
+    AFTER INSERT ON reports
+    REFERENCING NEW TABLE AS new_reports
+    FOR EACH STATEMENT EXECUTE FUNCTION report_daily_stats_after_report_insert()
+    """,
+    """
+    CREATE TRIGGER trg_reports_daily_stats_update
+    AFTER UPDATE ON reports
+    REFERENCING OLD TABLE AS old_reports NEW TABLE AS new_reports
+    FOR EACH STATEMENT EXECUTE FUNCTION report_daily_stats_after_report_update()
+    """,
+    """
+    CREATE TRIGGER trg_reports_daily_stats_delete
+    AFTER DELETE ON reports
+    REFERENCING OLD TABLE AS old_reports
+    FOR EACH STATEMENT EXECUTE FUNCTION report_daily_stats_after_report_delete()
+    """,
+]
+
+# SQLite has no statement-level triggers, so apply deltas row by row on shard 0.
+_SQLITE_ADD_ROW = """
+        INSERT INTO report_daily_stats
+            (project_id, day, severity, status, category, report_count, resolution_seconds)
+        VALUES ({row}.project_id, date({row}.created_at), {row}.severity, {row}.status, {row}.category,
+                {sign}1, {sign}(julianday({row}.updated_at) - julianday({row}.created_at)) * 86400)
+        ON CONFLICT (project_id, day, severity, status, category, shard) DO UPDATE
+        SET report_count = report_count + excluded.report_count,
+            resolution_seconds = resolution_seconds + excluded.resolution_seconds;
+"""
+
+_SQLITE_TRIGGER_DDL = [
+    f"""
+    CREATE TRIGGER trg_reports_daily_stats_insert
+    AFTER INSERT ON reports
+    BEGIN
+        {_SQLITE_ADD_ROW.format(row="NEW", sign="")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER trg_reports_daily_stats_update
+    AFTER UPDATE ON reports
+    BEGIN
+        {_SQLITE_ADD_ROW.format(row="OLD", sign="-")}
+        {_SQLITE_ADD_ROW.format(row="NEW", sign="")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER trg_reports_daily_stats_delete
+    AFTER DELETE ON reports
+    BEGIN
+        {_SQLITE_ADD_ROW.format(row="OLD", sign="-")}
+    END
+    """,
+]
+
+for _statement in _PG_TRIGGER_DDL:
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+for _statement in _SQLITE_TRIGGER_DDL:
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DDL, DateTime, ForeignKey, Index, Integer, SmallInteger, String, event, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+# Period key for the lifetime per-project counter; monthly rows use "YYYY-MM" (UTC).
+TOTAL_PERIOD = "total"
+
+# PostgreSQL triggers spread each counter over this many rows, picked by
+# backend PID, so concurrent ingests on different connections don't queue on
+# one row lock until commit. Readers always sum a counter over its shards.
+COUNTER_SHARDS = 16
+
+
+class UsageCounter(Base):
+    """Report counts per owner, project and period, kept in step with ``reports``.
+
+    Database triggers on ``reports`` add to the ``total`` row and the row for
+    the report's creation month on INSERT, and subtract from them on DELETE, so
+    every write path (ORM, bulk insert, raw SQL, FK cascades) stays consistent.
+    Each counter is split across ``shard`` rows (see ``COUNTER_SHARDS``); its
+    value is the sum over them, and a single shard may go negative.
+    ``usage_counter_service.reconcile_usage_counters`` repairs any drift.
+    """
+
+    __tablename__ = "usage_counters"
+    __table_args__ = (
+        Index("ix_usage_counters_owner_period", "owner_id", "period"),
+    )
+
+    owner_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    period: Mapped[str] = mapped_column(String(7), primary_key=True)
+    shard: Mapped[int] = mapped_column(SmallInteger, primary_key=True, default=0, server_default="0")
+    report_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+
+
+# ---------- Trigger DDL for Base.metadata.create_all (tests, seed scripts) ----------
+# Alembic migration u2v3w4x5y6z7 installs the same PostgreSQL triggers in deployed databases.
+
+_PG_TRIGGER_DDL = [
+    f"""
+    CREATE OR REPLACE FUNCTION usage_counters_after_report_insert() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO usage_counters (owner_id, project_id, period, shard, report_count)
+        SELECT p.owner_id, n.project_id, n.period, mod(pg_backend_pid(), {COUNTER_SHARDS}), n.cnt
+        FROM (
+            SELECT project_id, 'total' AS period, count(*) AS cnt
+            FROM new_reports GROUP BY project_id
+            UNION ALL
+            SELECT project_id, to_char(created_at AT TIME ZONE 'UTC', 'YYYY-MM'), count(*)
+            FROM new_reports GROUP BY 1, 2
+        ) AS n
+        JOIN projects p ON p.id = n.project_id
+        ON CONFLICT (owner_id, project_id, period, shard) DO UPDATE
+        SET report_count = usage_counters.report_count + EXCLUDED.report_count,
+            updated_at = now();
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    f"""
+    CREATE OR REPLACE FUNCTION usage_counters_after_report_delete() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO usage_counters (owner_id, project_id, period, shard, report_count)
+        SELECT p.owner_id, o.project_id, o.period, mod(pg_backend_pid(), {COUNTER_SHARDS}), -o.cnt
+        FROM (
+            SELECT project_id, 'total' AS period, count(*) AS cnt
+            FROM old_reports GROUP BY project_id
+            UNION ALL
+            SELECT project_id, to_char(created_at AT TIME ZONE 'UTC', 'YYYY-MM'), count(*)
+            FROM old_reports GROUP BY 1, 2
+        ) AS o
+        JOIN projects p ON p.id = o.project_id
+        ON CONFLICT (owner_id, project_id, period, shard) DO UPDATE
+        SET report_count = usage_counters.report_count + EXCLUDED.report_count,
+            updated_at = now();
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER trg_reports_usage_counters_insert
+    AFTER INSERT ON reports
+    REFERENCING NEW TABLE AS new_reports
+    FOR EACH STATEMENT EXECUTE FUNCTION usage_counters_after_report_insert()
+    """,
+    """
+    CREATE TRIGGER trg_reports_usage_counters_delete
+    AFTER DELETE ON reports
+    REFERENCING OLD TABLE AS old_reports
+    FOR EACH STATEMENT EXECUTE FUNCTION usage_counters_after_report_delete()
+    """,
+]
+
+# SQLite has no statement-level triggers, so count row by row. It serialises
+# writers anyway, so everything stays on shard 0.
+# Literal "%" must be doubled because DDL strings go through %-formatting.
+_SQLITE_TRIGGER_DDL = [
+    """
+    CREATE TRIGGER trg_reports_usage_counters_insert
+    AFTER INSERT ON reports
+    BEGIN
+        INSERT INTO usage_counters (owner_id, project_id, period, report_count, updated_at)
+        SELECT owner_id, NEW.project_id, 'total', 1, CURRENT_TIMESTAMP
+        FROM projects WHERE id = NEW.project_id
+        ON CONFLICT (owner_id, project_id, period, shard) DO UPDATE
+        SET report_count = report_count + 1;
+        INSERT INTO usage_counters (owner_id, project_id, period, report_count, updated_at)
+        SELECT owner_id, NEW.project_id, strftime('%%Y-%%m', NEW.created_at), 1, CURRENT_TIMESTAMP
+        FROM projects WHERE id = NEW.project_id
+        ON CONFLICT (owner_id, project_id, period, shard) DO UPDATE
+        SET report_count = report_count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER trg_reports_usage_counters_delete
+    AFTER DELETE ON reports
+    BEGIN
+        UPDATE usage_counters
+        SET report_count = max(report_count - 1, 0)
+        WHERE project_id = OLD.project_id
+          AND period IN ('total', strftime('%%Y-%%m', OLD.created_at));
+    END
+    """,
+]
+
+for _statement in _PG_TRIGGER_DDL:
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+for _statement in _SQLITE_TRIGGER_DDL:
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
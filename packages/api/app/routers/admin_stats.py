@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import asyncio
 import uuid
 
 from fastapi import APIRouter, Depends, Query
@@ -11,11 +10,14 @@ from app.dependencies import get_db, require_superadmin
 from app.models.enums import BetaStatus, Plan, Role
 from app.models.project import Project
 from app.models.report import Report
+from app.models.report_daily_stat import ReportDailyStat
 from app.models.user import User
 from app.schemas.admin import PlatformStats
 from app.schemas.project import ProjectResponse
 from app.schemas.report import ReportListResponse
-from app.utils.sql_helpers import escape_like
+from app.services.report_list_service import REPORT_LIST_COLUMNS, report_list_items, report_search_filter
+from app.services.stats_service import cached_stats
+from app.utils.pagination import fetch_page
 
 router = APIRouter()
 
@@ -25,42 +27,53 @@ async def platform_stats(
     current_user: User = Depends(require_superadmin),
     db: AsyncSession = Depends(get_db),
 ) -> PlatformStats:
-    total_users_result = await db.execute(select(func.count(User.id)))
-    total_users = total_users_result.scalar() or 0
+    return await cached_stats(("platform",), lambda: _compute_platform_stats(db))
 
-    total_projects_result = await db.execute(
-        select(func.count(Project.id)).where(Project.is_active.is_(True))
-    )
-    total_projects = total_projects_result.scalar() or 0
 
-    total_reports_result = await db.execute(select(func.count(Report.id)))
-    total_reports = total_reports_result.scalar() or 0
+async def _compute_platform_stats(db: AsyncSession) -> PlatformStats:
+    """Every platform counter in one statement.
 
-    plan_result = await db.execute(
-        select(User.plan, func.count(User.id)).group_by(User.plan)
+    Users are grouped by (plan, role), at most a dozen rows, and the per-plan,
+    per-role and total figures are summed from those. The report total comes
+    from the daily rollup instead of counting ``reports``.
+    """
+    active_projects = (
+        select(func.count(Project.id)).where(Project.is_active.is_(True)).scalar_subquery()
     )
-    users_by_plan = {
-        (row[0].value if isinstance(row[0], Plan) else row[0]): row[1]
-        for row in plan_result.all()
-    }
-
-    role_result = await db.execute(
-        select(User.role, func.count(User.id)).group_by(User.role)
+    total_reports = select(
+        func.coalesce(func.sum(ReportDailyStat.report_count), 0)
+    ).scalar_subquery()
+    result = await db.execute(
+        select(
+            User.plan,
+            User.role,
+            func.count(User.id),
+            func.count(User.id).filter(User.beta_status == BetaStatus.PENDING),
+            active_projects,
+            total_reports,
+        ).group_by(User.plan, User.role)
     )
-    users_by_role = {
-        (row[0].value if isinstance(row[0], Role) else row[0]): row[1]
-        for row in role_result.all()
-    }
 
-    pending_beta_result = await db.execute(
-        select(func.count(User.id)).where(User.beta_status == BetaStatus.PENDING)
-    )
-    pending_beta_count = pending_beta_result.scalar() or 0
+    total_users = 0
+    total_projects = 0
+    total_reports_count = 0
+    pending_beta_count = 0
+    users_by_plan: dict[str, int] = {}
+    users_by_role: dict[str, int] = {}
+    for plan, role, user_count, pending_count, project_count, report_count in result.all():
+        plan_key = plan.value if isinstance(plan, Plan) else plan
+        role_key = role.value if isinstance(role, Role) else role
+        users_by_plan[plan_key] = users_by_plan.get(plan_key, 0) + user_count
+        users_by_role[role_key] = users_by_role.get(role_key, 0) + user_count
+        total_users += user_count
+        pending_beta_count += pending_count
+        total_projects = project_count or 0
+        total_reports_count = report_count or 0
 
     return PlatformStats(
         total_users=total_users,
         total_projects=total_projects,
-        total_reports=total_reports,
+        total_reports=total_reports_count,
         users_by_plan=users_by_plan,
         users_by_role=users_by_role,
         pending_beta_count=pending_beta_count,
@@ -108,17 +121,21 @@ async def list_all_reports(
     project_id: uuid.UUID | None = Query(None),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None),
+    exact_total: bool = Query(False),
 ) -> ReportListResponse:
-    from app.routers.reports import _report_to_response
-
-    query = select(Report)
+    query = select(*REPORT_LIST_COLUMNS)
 
+    search_rank = None
     if search:
-        escaped = escape_like(search)
-        search_filter = f"%{escaped}%"
-        query = query.where(
-            Report.title.ilike(search_filter) | Report.tracking_id.ilike(search_filter)
+        search_condition, search_rank = report_search_filter(
+            search,
+            dialect=db.bind.dialect.name if db.bind else "",
+            fallback_columns=(Report.title, Report.tracking_id),
         )
+        query = query.where(search_condition)
+        if search_rank is not None:
+            query = query.add_columns(search_rank)
     if severity:
         query = query.where(Report.severity.in_(severity.split(",")))
     if status:
@@ -126,21 +143,17 @@ async def list_all_reports(
     if project_id:
         query = query.where(Report.project_id == project_id)
 
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-
-    query = query.order_by(Report.created_at.desc())
-    query = query.offset((page - 1) * page_size).limit(page_size)
-
-    result = await db.execute(query)
-    reports = result.scalars().all()
-
-    items = await asyncio.gather(*[_report_to_response(r) for r in reports])
+    result = await fetch_page(
+        db, query, Report.created_at, Report.id,
+        cursor=cursor, page=page, page_size=page_size, exact_total=exact_total,
+        rank_column=search_rank,
+    )
 
     return ReportListResponse(
-        items=items,
-        total=total,
+        items=await report_list_items(result.rows),
+        total=result.total,
         page=page,
         page_size=page_size,
+        next_cursor=result.next_cursor,
+        total_is_estimate=result.total_is_estimate,
     )
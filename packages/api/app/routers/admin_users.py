@@ -16,6 +16,7 @@ from app.models.report import Report
 from app.models.user import User
 from app.schemas.admin import AdminUserListResponse, AdminUserResponse
 from app.schemas.user import AdminUserUpdate
+from app.utils.pagination import fetch_page
 
 router = APIRouter()
 
@@ -50,6 +51,8 @@ async def list_users(
     plan: str | None = Query(None),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None),
+    exact_total: bool = Query(False),
 ) -> AdminUserListResponse:
     from app.utils.sql_helpers import escape_like
 
@@ -66,15 +69,11 @@ async def list_users(
     if plan is not None:
         query = query.where(User.plan == Plan(plan))
 
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-
-    query = query.order_by(User.created_at.desc())
-    query = query.offset((page - 1) * page_size).limit(page_size)
-
-    result = await db.execute(query)
-    users = result.scalars().all()
+    result = await fetch_page(
+        db, query, User.created_at, User.id,
+        cursor=cursor, page=page, page_size=page_size, exact_total=exact_total, scalars=True,
+    )
+    users = result.rows
 
     user_ids = [u.id for u in users]
 
@@ -108,9 +107,11 @@ async def list_users(
             )
             for u in users
         ],
-        total=total,
+        total=result.total,
         page=page,
         page_size=page_size,
+        next_cursor=result.next_cursor,
+        total_is_estimate=result.total_is_estimate,
     )
 
 
@@ -5,7 +5,7 @@ import math
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, BackgroundTasks, Depends, Request, Response
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
@@ -14,8 +14,6 @@ from app.exceptions import BadRequestException, UnauthorizedException
 from app.i18n import get_locale, translate
 from app.models.enums import BetaStatus
 from app.models.personal_access_token import PersonalAccessToken
-from app.models.project import Project
-from app.models.report import Report
 from app.models.user import User
 from app.rate_limiter import limiter
 from app.routers.auth_helpers import (
@@ -32,13 +30,15 @@ from app.schemas.auth import (
 from app.schemas.user import UserResponse, UserUpdate, build_user_response
 from app.schemas.usage import QuotaUsage, UserUsage
 from app.services.auth_service import (
-    hash_password,
-    verify_password,
+    hash_password_async,
+    rehash_password_if_needed,
+    verify_password_async,
     verify_token,
 )
 from app.services.data_export_service import export_user_data
 from app.services.email_verification_service import send_verification_email
 from app.services.plan_limits_service import PLAN_LIMITS
+from app.services.usage_service import get_usage_snapshot
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -61,7 +61,7 @@ async def register(
 
     user = User(
         email=body.email,
-        hashed_password=hash_password(body.password),
+        hashed_password=await hash_password_async(body.password),
         name=body.name,
     )
 
@@ -97,13 +97,18 @@ async def login(
     result = await db.execute(select(User).where(User.email == body.email))
     user = result.scalar_one_or_none()
 
-    if user is None or not user.hashed_password or not verify_password(body.password, user.hashed_password):
+    if (
+        user is None
+        or not user.hashed_password
+        or not await verify_password_async(body.password, user.hashed_password)
+    ):
         raise UnauthorizedException(translate("auth.invalid_credentials", locale))
 
     if not user.is_active:
         raise UnauthorizedException(translate("auth.account_deactivated", locale))
 
     check_beta_status(user, locale)
+    await rehash_password_if_needed(user, body.password)
 
     await issue_tokens(user, response, db)
 
@@ -247,36 +252,15 @@ async def get_user_usage(
     """Get current user's quota usage (projects, reports this month)."""
     limits = PLAN_LIMITS[current_user.plan]
 
-    # Count projects
-    projects_result = await db.execute(
-        select(func.count())
-        .select_from(Project)
-        .where(Project.owner_id == current_user.id, Project.is_active.is_(True))
-    )
-    projects_count = projects_result.scalar() or 0
-
-    # Count reports this month
-    now = datetime.now(timezone.utc)
-    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-
-    owner_project_ids = select(Project.id).where(Project.owner_id == current_user.id)
-    reports_result = await db.execute(
-        select(func.count())
-        .select_from(Report)
-        .where(
-            Report.project_id.in_(owner_project_ids),
-            Report.created_at >= month_start,
-        )
-    )
-    reports_count = reports_result.scalar() or 0
+    snapshot = await get_usage_snapshot(db, current_user.id)
 
     return UserUsage(
         projects=QuotaUsage(
-            current=projects_count,
+            current=len(snapshot.active_projects),
             limit=int(limits.max_projects) if math.isfinite(limits.max_projects) else None,
         ),
         reports_this_month=QuotaUsage(
-            current=reports_count,
+            current=snapshot.monthly_reports_count,
             limit=int(limits.max_reports_per_month) if math.isfinite(limits.max_reports_per_month) else None,
         ),
     )
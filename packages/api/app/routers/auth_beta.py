@@ -15,7 +15,7 @@ from app.models.user import User
 from app.rate_limiter import limiter
 from app.routers.auth_helpers import is_beta_mode
 from app.schemas.auth import BetaRegisterRequest, BetaRegisterResponse
-from app.services.auth_service import hash_password
+from app.services.auth_service import hash_password_async
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -30,7 +30,7 @@ async def _create_beta_user(
 
     user = User(
         email=body.email,
-        hashed_password=hash_password(body.password),
+        hashed_password=await hash_password_async(body.password),
         name=body.name,
         beta_status=BetaStatus.PENDING,
         beta_applied_at=datetime.now(timezone.utc),
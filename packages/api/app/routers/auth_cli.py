@@ -23,8 +23,9 @@ from app.schemas.auth import (
 )
 from app.services.auth_service import (
     create_cli_pat,
-    hash_password,
-    verify_password,
+    hash_password_async,
+    rehash_password_if_needed,
+    verify_password_async,
 )
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -45,7 +46,7 @@ async def cli_register(
 
     user = User(
         email=body.email,
-        hashed_password=hash_password(body.password),
+        hashed_password=await hash_password_async(body.password),
         name=body.name,
     )
 
@@ -88,13 +89,18 @@ async def cli_login(
     result = await db.execute(select(User).where(User.email == body.email))
     user = result.scalar_one_or_none()
 
-    if user is None or not user.hashed_password or not verify_password(body.password, user.hashed_password):
+    if (
+        user is None
+        or not user.hashed_password
+        or not await verify_password_async(body.password, user.hashed_password)
+    ):
         raise UnauthorizedException(translate("auth.invalid_credentials", locale))
 
     if not user.is_active:
         raise UnauthorizedException(translate("auth.account_deactivated", locale))
 
     check_beta_status(user, locale)
+    await rehash_password_if_needed(user, body.password)
 
     # Clean up old CLI PATs for this user
     old_pats = await db.execute(
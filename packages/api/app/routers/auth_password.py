@@ -12,7 +12,7 @@ from app.models.user import User
 from app.rate_limiter import limiter
 from app.schemas.auth import ForgotPasswordRequest, ResetPasswordRequest, SetPasswordRequest
 from app.schemas.user import PasswordChange
-from app.services.auth_service import hash_password, verify_password
+from app.services.auth_service import hash_password_async, verify_password_async
 from app.services.password_reset_service import (
     request_password_reset,
     reset_password as do_reset_password,
@@ -34,10 +34,10 @@ async def change_password(
     if not current_user.hashed_password:
         raise BadRequestException(translate("auth.no_password_set", locale))
 
-    if not verify_password(body.current_password, current_user.hashed_password):
+    if not await verify_password_async(body.current_password, current_user.hashed_password):
         raise BadRequestException(translate("auth.wrong_current_password", locale))
 
-    current_user.hashed_password = hash_password(body.new_password)
+    current_user.hashed_password = await hash_password_async(body.new_password)
     # Invalidate all existing sessions by clearing the refresh token JTI
     current_user.refresh_token_jti = None
     await db.commit()
@@ -87,7 +87,7 @@ async def set_password(
     if current_user.hashed_password:
         raise BadRequestException(translate("auth.password_already_set", locale))
 
-    current_user.hashed_password = hash_password(body.new_password)
+    current_user.hashed_password = await hash_password_async(body.new_password)
     await db.commit()
 
     return {"detail": translate("auth.password_set", locale)}
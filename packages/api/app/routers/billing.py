@@ -24,21 +24,11 @@ from app.schemas.billing import (
     ReactivateSubscriptionResponse,
     SubscriptionResponse,
 )
-
-# Optional stripe import - allows tests to run without stripe installed
-try:
-    import stripe
-    from stripe import StripeError
-except ImportError:
-    stripe = None  # type: ignore[assignment]
-
-    class StripeError(Exception):  # noqa: N818
-        """Stub when stripe package is not installed."""
-
-        user_message: str = ""
+from app.services import billing_client
+from app.services.billing_client import StripeError
 
 if TYPE_CHECKING:
-    import stripe as stripe_module
+    import stripe
 
 logger = logging.getLogger(__name__)
 
@@ -71,22 +61,13 @@ def _resolve_price_id(plan: str, interval: str) -> str:
     return price_id
 
 
-def _init_stripe() -> None:
-    """Set the Stripe API key from settings."""
-    if stripe is None:
-        raise BadRequestException("Stripe is not installed. Please install the stripe package.")
-    settings = get_settings()
-    stripe.api_key = settings.STRIPE_SECRET_KEY
-
-
 async def _get_or_create_customer(user: User, db: AsyncSession) -> str:
     """Return existing Stripe customer ID or create a new one."""
     if user.stripe_customer_id:
         return user.stripe_customer_id
 
-    _init_stripe()
     try:
-        customer = stripe.Customer.create(
+        customer = await billing_client.create_customer(
             email=user.email,
             name=user.name,
             metadata={"user_id": str(user.id)},
@@ -114,10 +95,9 @@ async def create_checkout_session(
     customer_id = await _get_or_create_customer(user, db)
     price_id = _resolve_price_id(body.plan, body.billing_interval)
 
-    _init_stripe()
     settings = get_settings()
     try:
-        session = stripe.checkout.Session.create(
+        session = await billing_client.create_checkout_session(
             customer=customer_id,
             mode="subscription",
             ui_mode="hosted",
@@ -154,8 +134,6 @@ async def change_plan(
     if current_level == new_level:
         raise BadRequestException("You are already on this plan.")
 
-    _init_stripe()
-
     is_upgrade = new_level > current_level
 
     if body.new_plan == "free":
@@ -168,7 +146,7 @@ async def change_plan(
     new_price_id = _resolve_price_id(body.new_plan, interval)
 
     try:
-        sub = stripe.Subscription.retrieve(user.stripe_subscription_id)
+        sub = await billing_client.retrieve_subscription(user.stripe_subscription_id, fresh=True)
         subscription_item_id = sub["items"]["data"][0]["id"]
 
         if is_upgrade:
@@ -180,7 +158,7 @@ async def change_plan(
             # Prorated upgrade: credit unused time on old plan, start new billing
             # cycle now. E.g. Starter→Team on day 15/30: credit ~50% of Starter,
             # charge full Team price for a new period starting today.
-            updated_sub = stripe.Subscription.modify(
+            updated_sub = await billing_client.modify_subscription(
                 user.stripe_subscription_id,
                 items=[{"id": subscription_item_id, "price": new_price_id}],
                 proration_behavior="always_invoice",
@@ -204,13 +182,12 @@ async def change_plan(
             # Downgrade between paid plans: defer to end of billing period
             # using Stripe Subscription Schedules
             current_price_id = sub["items"]["data"][0]["price"]["id"]
-            schedule = stripe.SubscriptionSchedule.create(
-                from_subscription=user.stripe_subscription_id,
-            )
+            schedule = await billing_client.create_subscription_schedule(user.stripe_subscription_id)
 
             period_end_ts = sub.get("current_period_end")
-            stripe.SubscriptionSchedule.modify(
+            await billing_client.modify_subscription_schedule(
                 schedule.id,
+                user.stripe_subscription_id,
                 phases=[
                     {
                         "items": [{"price": current_price_id, "quantity": 1}],
@@ -252,13 +229,13 @@ async def change_plan(
 async def _release_subscription_schedule(subscription_id: str) -> None:
     """Release any active Stripe SubscriptionSchedule tied to this subscription."""
     try:
-        sub = stripe.Subscription.retrieve(subscription_id)
+        sub = await billing_client.retrieve_subscription(subscription_id, fresh=True)
         schedule_id = sub.get("schedule")
         if not schedule_id:
             return
-        schedule = stripe.SubscriptionSchedule.retrieve(schedule_id)
+        schedule = await billing_client.retrieve_subscription_schedule(schedule_id)
         if schedule.status in ("not_started", "active"):
-            stripe.SubscriptionSchedule.release(schedule_id)
+            await billing_client.release_subscription_schedule(schedule_id, subscription_id)
     except StripeError as e:
         logger.warning("Could not release subscription schedule: %s", e)
 
@@ -274,15 +251,13 @@ async def cancel_subscription(
     if not user.stripe_subscription_id:
         raise BadRequestException("No active subscription to cancel.")
 
-    _init_stripe()
-
     # Release any pending downgrade schedule before canceling
     if user.pending_downgrade_plan:
         await _release_subscription_schedule(user.stripe_subscription_id)
         user.pending_downgrade_plan = None
 
     try:
-        updated_sub = stripe.Subscription.modify(
+        updated_sub = await billing_client.modify_subscription(
             user.stripe_subscription_id,
             cancel_at_period_end=True,
         )
@@ -332,8 +307,6 @@ async def reactivate_subscription(
     if not user.cancel_at_period_end:
         raise BadRequestException("Subscription is not set to cancel.")
 
-    _init_stripe()
-
     # Release any subscription schedule before modifying cancel behavior.
     # Stripe disallows direct cancel_at_period_end changes on schedule-managed subs.
     await _release_subscription_schedule(user.stripe_subscription_id)
@@ -341,7 +314,7 @@ async def reactivate_subscription(
         user.pending_downgrade_plan = None
 
     try:
-        stripe.Subscription.modify(
+        await billing_client.modify_subscription(
             user.stripe_subscription_id,
             cancel_at_period_end=False,
         )
@@ -413,9 +386,8 @@ async def get_invoices(
     if not user.stripe_customer_id:
         return []
 
-    _init_stripe()
     try:
-        invoices = stripe.Invoice.list(customer=user.stripe_customer_id, limit=24)
+        invoices = await billing_client.list_invoices(user.stripe_customer_id, limit=24)
     except StripeError as e:
         logger.error("Stripe error fetching invoices for user %s: %s", user.id, e)
         return []
@@ -443,7 +415,7 @@ async def _downgrade_to_free(user: User, db: AsyncSession) -> SubscriptionRespon
         user.pending_downgrade_plan = None
 
     try:
-        updated_sub = stripe.Subscription.modify(
+        updated_sub = await billing_client.modify_subscription(
             user.stripe_subscription_id,
             cancel_at_period_end=True,
         )
@@ -5,11 +5,8 @@ import logging
 import secrets
 import uuid
 
-from datetime import date, datetime, time, timezone
-
-from fastapi import APIRouter, Depends, Query, Request
-from pydantic import BaseModel
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.dependencies import get_accessible_project, get_active_user, get_db, get_owned_project, validate_api_key
@@ -20,21 +17,25 @@ from app.models.enums import Plan, Role
 from app.models.project import Project
 from app.models.report import Report
 from app.models.user import User
-from app.schemas.project import ProjectCreate, ProjectResponse, ProjectUpdate, WidgetConfigResponse
+from app.schemas.project import (
+    ConsoleLogQuotaResponse,
+    ProjectCreate,
+    ProjectResponse,
+    ProjectUpdate,
+    WidgetBootstrapResponse,
+    WidgetConfigResponse,
+)
+from app.services.console_log_quota_service import CONSOLE_LOG_DAILY_LIMIT, get_console_log_usage
 from app.services.plan_limits_service import PLAN_FEATURES, check_project_limit
-from app.services.storage_service import delete_files
+from app.services.project_access_service import invalidate_project_access, invalidate_user_access
+from app.services.storage_service import delete_files, with_variant_keys
+from app.utils.http_cache import is_not_modified, weak_etag
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
 
-class ConsoleLogQuotaResponse(BaseModel):
-    remaining: int
-    limit: int
-    allowed: bool
-
-
 def _generate_api_key() -> str:
     return f"bsk_pub_{secrets.token_urlsafe(48)}="
 
@@ -77,10 +78,14 @@ def _project_response(
     )
 
 
-@router.get("/widget-config", response_model=WidgetConfigResponse)
-async def get_widget_config(
-    project: Project = Depends(validate_api_key),
-) -> WidgetConfigResponse:
+# Config only changes when the owner edits settings or the plan changes, so
+# browsers and CDNs may reuse it briefly and then revalidate with If-None-Match.
+WIDGET_CONFIG_CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=600"
+# The bootstrap payload carries today's quota, so it is always revalidated.
+WIDGET_BOOTSTRAP_CACHE_CONTROL = "private, no-cache"
+
+
+def _build_widget_config(project: Project) -> WidgetConfigResponse:
     settings = project.settings or {}
     owner_plan = project.owner.plan.value if project.owner else "free"
     try:
@@ -100,7 +105,41 @@ async def get_widget_config(
     )
 
 
-CONSOLE_LOG_DAILY_LIMIT = 5
+async def _build_console_log_quota(db: AsyncSession, project: Project) -> ConsoleLogQuotaResponse:
+    used = await get_console_log_usage(db, project.id)
+    remaining = max(0, CONSOLE_LOG_DAILY_LIMIT - used)
+    return ConsoleLogQuotaResponse(
+        remaining=remaining,
+        limit=CONSOLE_LOG_DAILY_LIMIT,
+        allowed=remaining > 0,
+    )
+
+
+def _set_cache_headers(response: Response, etag: str, cache_control: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    # WidgetCORSMiddleware adds Origin, since it reflects it into the response
+    response.headers["Vary"] = "X-API-Key"
+
+
+def _not_modified(etag: str, cache_control: str) -> Response:
+    response = Response(status_code=304)
+    _set_cache_headers(response, etag, cache_control)
+    return response
+
+
+@router.get("/widget-config", response_model=WidgetConfigResponse)
+async def get_widget_config(
+    request: Request,
+    response: Response,
+    project: Project = Depends(validate_api_key),
+) -> WidgetConfigResponse | Response:
+    config = _build_widget_config(project)
+    etag = weak_etag(config.model_dump_json())
+    if is_not_modified(request, etag):
+        return _not_modified(etag, WIDGET_CONFIG_CACHE_CONTROL)
+    _set_cache_headers(response, etag, WIDGET_CONFIG_CACHE_CONTROL)
+    return config
 
 
 @router.get("/console-log-quota", response_model=ConsoleLogQuotaResponse)
@@ -109,23 +148,27 @@ async def get_console_log_quota(
     db: AsyncSession = Depends(get_db),
 ) -> ConsoleLogQuotaResponse:
     """Check how many console-log-included reports the project owner has left today."""
-    today_start = datetime.combine(datetime.now(timezone.utc).date(), time.min, tzinfo=timezone.utc)
-    count_result = await db.execute(
-        select(func.count())
-        .select_from(Report)
-        .where(
-            Report.project_id == project.id,
-            Report.console_logs_included.is_(True),
-            Report.created_at >= today_start,
-        )
-    )
-    used = count_result.scalar() or 0
-    remaining = max(0, CONSOLE_LOG_DAILY_LIMIT - used)
-    return ConsoleLogQuotaResponse(
-        remaining=remaining,
-        limit=CONSOLE_LOG_DAILY_LIMIT,
-        allowed=remaining > 0,
-    )
+    return await _build_console_log_quota(db, project)
+
+
+@router.get("/widget-bootstrap", response_model=WidgetBootstrapResponse)
+async def get_widget_bootstrap(
+    request: Request,
+    response: Response,
+    project: Project = Depends(validate_api_key),
+    db: AsyncSession = Depends(get_db),
+) -> WidgetBootstrapResponse | Response:
+    """Widget config and today's console-log quota in one response.
+
+    The ETag covers both parts, so an unchanged page view revalidates to a 304.
+    """
+    config = _build_widget_config(project)
+    quota = await _build_console_log_quota(db, project)
+    etag = weak_etag(config.model_dump_json(), quota.model_dump_json())
+    if is_not_modified(request, etag):
+        return _not_modified(etag, WIDGET_BOOTSTRAP_CACHE_CONTROL)
+    _set_cache_headers(response, etag, WIDGET_BOOTSTRAP_CACHE_CONTROL)
+    return WidgetBootstrapResponse(config=config, console_log_quota=quota)
 
 
 @router.post("", response_model=ProjectResponse, status_code=201)
@@ -145,6 +188,7 @@ async def create_project(
     )
     db.add(project)
     await db.commit()
+    invalidate_user_access(current_user.id)
     await db.refresh(project)
 
     return _project_response(project, full_api_key=raw_key)
@@ -243,7 +287,7 @@ async def delete_project(
         # Delete files from R2/S3
         if file_keys:
             logger.info(f"Deleting {len(file_keys)} screenshot(s) from R2 for project {project_id}")
-            await delete_files(file_keys)
+            await delete_files(with_variant_keys(file_keys))
 
         # Hard delete: removes project and cascades to reports (via DB FK)
         await db.delete(project)
@@ -252,6 +296,8 @@ async def delete_project(
         project.is_active = False
 
     await db.commit()
+    if permanent:
+        invalidate_project_access(project_id)
 
 
 @router.post("/{project_id}/rotate-key", response_model=ProjectResponse)
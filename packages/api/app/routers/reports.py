@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import asyncio
+import math
 import uuid
 from datetime import date, datetime, time, timedelta, timezone
+from typing import Any
 
 from fastapi import APIRouter, BackgroundTasks, Depends, Query, Request
-from sqlalchemy import delete as sql_delete, func, select
+from sqlalchemy import ColumnElement, delete as sql_delete, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -19,21 +21,54 @@ from app.models.report import Category, Report, Severity, Status
 from app.models.report_analysis import ReportAnalysis
 from app.models.comment import Comment
 from app.models.user import User
-from app.schemas.report import ReportCreate, ReportListItemResponse, ReportListResponse, ReportResponse, ReportUpdate
+from app.schemas.report import (
+    ReportBatchCreate,
+    ReportBatchItemResult,
+    ReportBatchResponse,
+    ReportCreate,
+    ReportFacetsResponse,
+    ReportListResponse,
+    ReportResponse,
+    ReportUpdate,
+)
 from app.schemas.similarity import SimilarReportItem, SimilarReportsResponse
-from app.services.plan_limits_service import check_report_limit
-from app.utils.sql_helpers import escape_like
-from app.services.spam_protection_service import check_honeypot, is_duplicate_report, validate_origin
+from app.services.console_log_quota_service import reserve_console_log_slots
+from app.services.plan_limits_service import get_remaining_report_quota
+from app.services.project_access_service import accessible_project_filter
+from app.services.report_list_service import (
+    REPORT_LIST_COLUMNS,
+    count_report_facets,
+    report_list_items,
+    report_search_filter,
+)
+from app.services.report_ingest_service import build_report_values, ingest_report
+from app.utils.fingerprint import report_fingerprint
+from app.utils.pagination import fetch_page
+from app.services.spam_protection_service import (
+    check_honeypot,
+    find_duplicate_reports,
+    remember_fingerprint,
+    validate_origin,
+)
 from app.services.similarity_service import find_similar_reports
-from app.services.storage_service import delete_file, generate_presigned_url, validate_object_key
-from app.services.tracking_id_service import generate_tracking_id
+from app.services.image_processing_service import is_enabled as image_processing_enabled
+from app.services.image_processing_service import process_screenshot
+from app.services.storage_service import (
+    OPTIMIZED_VARIANT,
+    THUMBNAIL_VARIANT,
+    delete_files,
+    generate_presigned_url,
+    generate_variant_url,
+    validate_object_key,
+    with_variant_keys,
+)
+from app.services.tracking_id_service import generate_tracking_ids
+from app.services.usage_service import invalidate_project_usage_on_commit
 from app.services.notification_service import notify_new_report
-from app.services.webhook_service import dispatch_webhooks
+from app.services.webhook_service import dispatch_webhooks, dispatch_webhooks_many
 
 router = APIRouter(prefix="/reports", tags=["reports"])
 
-DAILY_CONSOLE_LOG_LIMIT = 5
-
 
 async def _resolve_screenshot_url(key_or_url: str | None) -> str | None:
     """Generate a presigned URL from an S3 object key. Handles legacy full URLs gracefully."""
@@ -47,11 +82,18 @@ async def _resolve_screenshot_url(key_or_url: str | None) -> str | None:
     return await generate_presigned_url(key_or_url)
 
 
+def _schedule_screenshot_processing(background_tasks: BackgroundTasks, report: Report) -> None:
+    if report.screenshot_url and image_processing_enabled():
+        background_tasks.add_task(process_screenshot, report.id, report.screenshot_url)
+
+
 async def _report_to_response(report: Report) -> ReportResponse:
     """Build ReportResponse avoiding the metadata/metadata_ naming conflict."""
-    screenshot_url, annotated_screenshot_url = await asyncio.gather(
+    screenshot_url, annotated_screenshot_url, thumbnail_url, optimized_url = await asyncio.gather(
         _resolve_screenshot_url(report.screenshot_url),
         _resolve_screenshot_url(report.annotated_screenshot_url),
+        generate_variant_url(report.screenshot_url, THUMBNAIL_VARIANT, report.screenshot_renditions_at),
+        generate_variant_url(report.screenshot_url, OPTIMIZED_VARIANT, report.screenshot_renditions_at),
     )
     return ReportResponse(
         id=report.id,
@@ -65,6 +107,8 @@ async def _report_to_response(report: Report) -> ReportResponse:
         assignee_id=report.assignee_id,
         screenshot_url=screenshot_url,
         annotated_screenshot_url=annotated_screenshot_url,
+        screenshot_thumbnail_url=thumbnail_url,
+        screenshot_optimized_url=optimized_url,
         console_logs=report.console_logs,
         network_logs=report.network_logs,
         user_actions=report.user_actions,
@@ -76,22 +120,12 @@ async def _report_to_response(report: Report) -> ReportResponse:
     )
 
 
-def _report_to_list_item(report: Report) -> ReportListItemResponse:
-    """Build a lightweight list item — no presigned URL generation."""
-    return ReportListItemResponse(
-        id=report.id,
-        project_id=report.project_id,
-        tracking_id=report.tracking_id,
-        title=report.title,
-        description=report.description,
-        severity=report.severity.value if isinstance(report.severity, Severity) else report.severity,
-        category=report.category.value if isinstance(report.category, Category) else report.category,
-        status=report.status.value if isinstance(report.status, Status) else report.status,
-        assignee_id=report.assignee_id,
-        reporter_identifier=report.reporter_identifier,
-        created_at=report.created_at,
-        updated_at=report.updated_at,
-    )
+def _has_valid_screenshot_keys(body: ReportCreate) -> bool:
+    """Validate screenshot keys match upload-generated format before persisting."""
+    for key in (body.screenshot_url, body.annotated_screenshot_url):
+        if key and not key.startswith(("http://", "https://")) and not validate_object_key(key):
+            return False
+    return True
 
 
 @router.post("", response_model=ReportResponse, status_code=201)
@@ -109,58 +143,10 @@ async def create_report(
     if not validate_origin(request, project):
         raise BadRequestException("Invalid origin")
 
-    if await is_duplicate_report(db, str(project.id), body.title, body.description):
-        raise BadRequestException("Duplicate report detected")
-
-    await check_report_limit(db, project)
+    if not _has_valid_screenshot_keys(body):
+        raise BadRequestException("Invalid screenshot key")
 
-    # Validate screenshot keys match upload-generated format before persisting
-    for key in (body.screenshot_url, body.annotated_screenshot_url):
-        if key and not key.startswith(("http://", "https://")) and not validate_object_key(key):
-            raise BadRequestException("Invalid screenshot key")
-
-    tracking_id = await generate_tracking_id(db, str(project.id))
-
-    # Determine whether console logs should be flagged as included
-    has_console_logs = bool(body.console_logs)
-    console_logs_included = False
-    if has_console_logs:
-        today_start = datetime.combine(datetime.now(timezone.utc).date(), time.min, tzinfo=timezone.utc)
-        count_result = await db.execute(
-            select(func.count())
-            .select_from(Report)
-            .where(
-                Report.project_id == project.id,
-                Report.console_logs_included.is_(True),
-                Report.created_at >= today_start,
-            )
-        )
-        used = count_result.scalar() or 0
-        if used >= DAILY_CONSOLE_LOG_LIMIT:
-            # Strip console logs — daily limit exceeded
-            body.console_logs = None
-        else:
-            console_logs_included = True
-
-    report = Report(
-        project_id=project.id,
-        tracking_id=tracking_id,
-        title=body.title,
-        description=body.description,
-        severity=Severity(body.severity),
-        category=Category(body.category),
-        reporter_identifier=body.reporter_identifier,
-        screenshot_url=body.screenshot_url,
-        annotated_screenshot_url=body.annotated_screenshot_url,
-        console_logs=body.console_logs,
-        network_logs=body.network_logs,
-        user_actions=body.user_actions,
-        metadata_=body.metadata,
-        console_logs_included=console_logs_included,
-    )
-    db.add(report)
-    await db.commit()
-    await db.refresh(report)
+    report = await ingest_report(db, project, body)
 
     response = await _report_to_response(report)
     await dispatch_webhooks(
@@ -170,47 +156,147 @@ async def create_report(
     report_data = response.model_dump(mode="json")
     project_id_str = str(project.id)
     background_tasks.add_task(notify_new_report, project_id_str, report_data)
+    _schedule_screenshot_processing(background_tasks, report)
 
     return response
 
 
-@router.get("", response_model=ReportListResponse)
-async def list_reports(
-    current_user: User = Depends(get_active_user),
+@router.post("/batch", response_model=ReportBatchResponse)
+@limiter.limit("10/minute")
+async def create_reports_batch(
+    request: Request,
+    body: ReportBatchCreate,
+    background_tasks: BackgroundTasks,
+    project: Project = Depends(validate_api_key),
     db: AsyncSession = Depends(get_db),
-    project_id: uuid.UUID | None = Query(None),
-    status: str | None = Query(None),
-    severity: str | None = Query(None),
-    search: str | None = Query(None),
-    date_range: str | None = Query(None),
-    page: int = Query(1, ge=1),
-    page_size: int = Query(20, ge=1, le=100),
-) -> ReportListResponse:
-    query = select(Report)
+) -> ReportBatchResponse:
+    """Ingest a buffered burst of reports with one dedupe query, one quota check and one insert.
+
+    Every item gets its own result so offline clients can retry only the
+    items that were not created. Spam and origin checks still reject the
+    whole request.
+    """
+    if any(check_honeypot(item.hp_field) for item in body.reports):
+        raise BadRequestException("Invalid request")
+
+    if not validate_origin(request, project):
+        raise BadRequestException("Invalid origin")
+
+    results: dict[int, ReportBatchItemResult] = {}
+    candidates: list[int] = []
+    for index, item in enumerate(body.reports):
+        if _has_valid_screenshot_keys(item):
+            candidates.append(index)
+        else:
+            results[index] = ReportBatchItemResult(
+                index=index, status="invalid", detail="Invalid screenshot key"
+            )
+
+    duplicate_flags = await find_duplicate_reports(
+        db,
+        str(project.id),
+        [(body.reports[i].title, body.reports[i].description) for i in candidates],
+    )
+    accepted: list[int] = []
+    for index, is_duplicate in zip(candidates, duplicate_flags):
+        if is_duplicate:
+            results[index] = ReportBatchItemResult(
+                index=index, status="duplicate", detail="Duplicate report detected"
+            )
+        else:
+            accepted.append(index)
+
+    if accepted:
+        remaining = await get_remaining_report_quota(db, project)
+        if math.isfinite(remaining):
+            for index in accepted[int(remaining):]:
+                results[index] = ReportBatchItemResult(
+                    index=index, status="over_quota", detail="Plan report limit reached"
+                )
+            accepted = accepted[: int(remaining)]
+
+    created_reports: list[Report] = []
+    if accepted:
+        tracking_ids = await generate_tracking_ids(db, str(project.id), len(accepted))
+
+        wanted = sum(1 for i in accepted if body.reports[i].console_logs)
+        console_log_slots = await reserve_console_log_slots(db, project.id, wanted) if wanted else 0
+
+        rows: list[dict] = []
+        for index, tracking_id in zip(accepted, tracking_ids):
+            item = body.reports[index]
+            console_logs_included = bool(item.console_logs) and console_log_slots > 0
+            if console_logs_included:
+                console_log_slots -= 1
+            rows.append(build_report_values(project.id, item, tracking_id, console_logs_included))
+
+        insert_result = await db.scalars(
+            insert(Report).returning(Report, sort_by_parameter_order=True), rows
+        )
+        created_reports = list(insert_result.all())
+        # Core INSERT bypasses the flush the usage cache listens to
+        invalidate_project_usage_on_commit(db, project.id)
+        await db.commit()
+
+        for index, report in zip(accepted, created_reports):
+            results[index] = ReportBatchItemResult(
+                index=index, status="created", id=report.id, tracking_id=report.tracking_id
+            )
+            remember_fingerprint(project.id, report.fingerprint)
+
+        responses = await asyncio.gather(*(_report_to_response(r) for r in created_reports))
+        report_payloads = [response.model_dump(mode="json") for response in responses]
+        await dispatch_webhooks_many(
+            db, background_tasks, str(project.id), "report.created", report_payloads
+        )
+        project_id_str = str(project.id)
+        for report_data in report_payloads:
+            background_tasks.add_task(notify_new_report, project_id_str, report_data)
+        for report in created_reports:
+            _schedule_screenshot_processing(background_tasks, report)
+
+    return ReportBatchResponse(
+        results=[results[index] for index in range(len(body.reports))],
+        created=len(created_reports),
+    )
+
+
+async def _report_list_filters(
+    db: AsyncSession,
+    current_user: User,
+    project_id: uuid.UUID | None,
+    status: str | None,
+    severity: str | None,
+    search: str | None,
+    date_range: str | None,
+) -> tuple[list[ColumnElement[bool]], Any | None]:
+    """WHERE conditions shared by the report list and its facets, plus the search rank column."""
+    conditions: list[ColumnElement[bool]] = []
     if current_user.role != Role.SUPERADMIN:
-        accessible_ids = await get_accessible_project_ids(current_user, db)
-        query = query.where(Report.project_id.in_(accessible_ids))
+        conditions.append(accessible_project_filter(current_user.id, Report.project_id))
 
     if project_id is not None:
-        query = query.where(Report.project_id == project_id)
+        conditions.append(Report.project_id == project_id)
     if status is not None:
         status_values = [Status(s.strip()) for s in status.split(",") if s.strip()]
         if len(status_values) == 1:
-            query = query.where(Report.status == status_values[0])
+            conditions.append(Report.status == status_values[0])
         elif status_values:
-            query = query.where(Report.status.in_(status_values))
+            conditions.append(Report.status.in_(status_values))
     if severity is not None:
         severity_values = [Severity(s.strip()) for s in severity.split(",") if s.strip()]
         if len(severity_values) == 1:
-            query = query.where(Report.severity == severity_values[0])
+            conditions.append(Report.severity == severity_values[0])
         elif severity_values:
-            query = query.where(Report.severity.in_(severity_values))
+            conditions.append(Report.severity.in_(severity_values))
+    search_rank = None
     if search is not None:
-        escaped_search = escape_like(search)
-        search_filter = f"%{escaped_search}%"
-        query = query.where(
-            Report.title.ilike(search_filter) | Report.description.ilike(search_filter)
+        search_condition, search_rank = report_search_filter(
+            search,
+            dialect=db.bind.dialect.name if db.bind else "",
+            fallback_columns=(Report.title, Report.description),
         )
+        conditions.append(search_condition)
     if date_range is not None and date_range != "all":
         now_utc = datetime.now(timezone.utc)
         if date_range == "today":
@@ -224,21 +310,62 @@ async def list_reports(
         else:
             cutoff = None
         if cutoff is not None:
-            query = query.where(Report.created_at >= cutoff)
+            conditions.append(Report.created_at >= cutoff)
+    return conditions, search_rank
 
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
 
-    query = query.order_by(Report.created_at.desc())
-    query = query.offset((page - 1) * page_size).limit(page_size)
+@router.get("", response_model=ReportListResponse)
+async def list_reports(
+    current_user: User = Depends(get_active_user),
+    db: AsyncSession = Depends(get_db),
+    project_id: uuid.UUID | None = Query(None),
+    status: str | None = Query(None),
+    severity: str | None = Query(None),
+    search: str | None = Query(None),
+    date_range: str | None = Query(None),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None),
+    exact_total: bool = Query(False),
+) -> ReportListResponse:
+    conditions, search_rank = await _report_list_filters(
+        db, current_user, project_id, status, severity, search, date_range
+    )
+    query = select(*REPORT_LIST_COLUMNS).where(*conditions)
+    if search_rank is not None:
+        query = query.add_columns(search_rank)
+
+    result = await fetch_page(
+        db, query, Report.created_at, Report.id,
+        cursor=cursor, page=page, page_size=page_size, exact_total=exact_total,
+        rank_column=search_rank,
+    )
 
-    result = await db.execute(query)
-    reports = result.scalars().all()
+    return ReportListResponse(
+        items=await report_list_items(result.rows),
+        total=result.total,
+        page=page,
+        page_size=page_size,
+        next_cursor=result.next_cursor,
+        total_is_estimate=result.total_is_estimate,
+    )
 
-    items = [_report_to_list_item(report) for report in reports]
 
-    return ReportListResponse(items=items, total=total, page=page, page_size=page_size)
+@router.get("/facets", response_model=ReportFacetsResponse)
+async def list_report_facets(
+    current_user: User = Depends(get_active_user),
+    db: AsyncSession = Depends(get_db),
+    project_id: uuid.UUID | None = Query(None),
+    status: str | None = Query(None),
+    severity: str | None = Query(None),
+    search: str | None = Query(None),
+    date_range: str | None = Query(None),
+) -> ReportFacetsResponse:
+    """Status, severity and category counts for the same filters ``list_reports`` takes."""
+    conditions, _ = await _report_list_filters(
+        db, current_user, project_id, status, severity, search, date_range
+    )
+    return await count_report_facets(db, conditions)
 
 
 @router.get("/{report_id}", response_model=ReportResponse)
@@ -298,6 +425,8 @@ async def update_report(
     for field, value in update_data.items():
         if field in _REPORT_UPDATABLE_FIELDS:
             setattr(report, field, value)
+    if "title" in update_data or "description" in update_data:
+        report.fingerprint = report_fingerprint(report.title, report.description)
 
     await db.commit()
     await db.refresh(report)
@@ -342,11 +471,10 @@ async def delete_report(
     await db.delete(report)
     await db.commit()
 
-    # Clean up screenshots from R2/S3 after successful DB deletion
-    if screenshot_key:
-        await delete_file(screenshot_key)
-    if annotated_key:
-        await delete_file(annotated_key)
+    # Clean up screenshots and their renditions from R2/S3 after successful DB deletion
+    file_keys = [key for key in (screenshot_key, annotated_key) if key]
+    if file_keys:
+        await delete_files(with_variant_keys(file_keys))
 
 
 @router.get("/{report_id}/similar", response_model=SimilarReportsResponse)
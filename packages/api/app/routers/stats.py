@@ -13,7 +13,12 @@ from app.models.project import Project
 from app.models.user import User
 from app.rate_limiter import limiter
 from app.schemas.stats import OverviewStats, ProjectStats
-from app.services.stats_service import get_aggregated_project_stats, get_overview_stats, get_project_stats
+from app.services.stats_service import (
+    cached_stats,
+    get_aggregated_project_stats,
+    get_overview_stats,
+    get_project_stats,
+)
 
 router = APIRouter(prefix="/stats", tags=["stats"])
 
@@ -27,7 +32,10 @@ async def overview_stats(
     project_id: uuid.UUID | None = Query(None, description="Filter stats by project"),
 ) -> OverviewStats:
     user_id = None if current_user.role == Role.SUPERADMIN else str(current_user.id)
-    return await get_overview_stats(db, user_id, project_id)
+    return await cached_stats(
+        ("overview", user_id, project_id),
+        lambda: get_overview_stats(db, user_id, project_id),
+    )
 
 
 @router.get("/aggregated", response_model=ProjectStats)
@@ -38,7 +46,10 @@ async def aggregated_stats(
     db: AsyncSession = Depends(get_db),
 ) -> ProjectStats:
     user_id = None if current_user.role == Role.SUPERADMIN else str(current_user.id)
-    return await get_aggregated_project_stats(db, user_id)
+    return await cached_stats(
+        ("aggregated", user_id),
+        lambda: get_aggregated_project_stats(db, user_id),
+    )
 
 
 @router.get("/projects/{project_id}", response_model=ProjectStats)
@@ -59,4 +70,7 @@ async def project_stats(
         if project.id not in accessible_ids:
             raise ForbiddenException("Not the project owner")
 
-    return await get_project_stats(db, str(project.id))
+    return await cached_stats(
+        ("project", project.id),
+        lambda: get_project_stats(db, str(project.id)),
+    )
@@ -14,6 +14,7 @@ from app.models.personal_access_token import PersonalAccessToken
 from app.models.user import User
 from app.schemas.token import TokenCreateRequest, TokenCreateResponse, TokenResponse
 from app.services.auth_service import PAT_PREFIX, PAT_PREFIX_LEN
+from app.services.pat_usage_service import pat_usage_tracker
 
 MAX_PATS_PER_USER = 25
 
@@ -96,7 +97,7 @@ async def list_tokens(
             id=t.id,
             name=t.name,
             token_prefix=t.token_prefix + "...",
-            last_used_at=t.last_used_at,
+            last_used_at=pat_usage_tracker.pending_last_used(t.id) or t.last_used_at,
             expires_at=t.expires_at,
             created_at=t.created_at,
         )
@@ -6,31 +6,16 @@ from app.dependencies import validate_api_key
 from app.exceptions import BadRequestException
 from app.models.project import Project
 from app.rate_limiter import limiter
-from app.services.storage_service import MAX_FILE_SIZE_BYTES, upload_file
+from app.schemas.upload import DirectUploadRequest, DirectUploadResponse, UploadCompleteRequest
+from app.services.storage_service import (
+    create_direct_upload,
+    upload_stream,
+    validate_object_key,
+    verify_direct_upload,
+)
 
 router = APIRouter(prefix="/upload", tags=["upload"])
 
-UPLOAD_CHUNK_SIZE = 64 * 1024  # 64 KB
-
-
-async def _read_with_size_limit(file: UploadFile) -> bytes:
-    """Read file in chunks, aborting early if size exceeds the limit."""
-    chunks: list[bytes] = []
-    total_size = 0
-
-    while True:
-        chunk = await file.read(UPLOAD_CHUNK_SIZE)
-        if not chunk:
-            break
-        total_size += len(chunk)
-        if total_size > MAX_FILE_SIZE_BYTES:
-            raise BadRequestException(
-                f"File exceeds maximum size of {MAX_FILE_SIZE_BYTES // (1024 * 1024)}MB"
-            )
-        chunks.append(chunk)
-
-    return b"".join(chunks)
-
 
 @router.post("/screenshot")
 @limiter.limit("20/minute")
@@ -39,11 +24,47 @@ async def upload_screenshot(
     file: UploadFile,
     project: Project = Depends(validate_api_key),
 ) -> dict[str, str]:
-    file_content = await _read_with_size_limit(file)
-    object_key = await upload_file(
-        file_content=file_content,
+    # Starlette has already spooled the body, so it is streamed from there
+    object_key = await upload_stream(
+        file,
         content_type=file.content_type or "image/png",
         owner_id=str(project.owner_id),
         project_id=str(project.id),
     )
     return {"key": object_key}
+
+
+@router.post("/screenshot/presign", response_model=DirectUploadResponse)
+@limiter.limit("20/minute")
+async def presign_screenshot_upload(
+    request: Request,
+    body: DirectUploadRequest,
+    project: Project = Depends(validate_api_key),
+) -> DirectUploadResponse:
+    """Return a presigned PUT for uploading a screenshot straight to storage.
+
+    After the PUT succeeds, the client calls ``/screenshot/complete`` with the
+    key before using it in a report.
+    """
+    upload = await create_direct_upload(
+        content_type=body.content_type,
+        size=body.size,
+        owner_id=str(project.owner_id),
+        project_id=str(project.id),
+    )
+    return DirectUploadResponse(
+        key=upload.key, url=upload.url, headers=upload.headers, expires_in=upload.expires_in
+    )
+
+
+@router.post("/screenshot/complete")
+@limiter.limit("20/minute")
+async def complete_screenshot_upload(
+    request: Request,
+    body: UploadCompleteRequest,
+    project: Project = Depends(validate_api_key),
+) -> dict[str, str]:
+    if not validate_object_key(body.key) or not body.key.startswith(f"{project.owner_id}/{project.id}/"):
+        raise BadRequestException("Invalid object key")
+    await verify_direct_upload(body.key)
+    return {"key": body.key}
@@ -15,6 +15,7 @@ from app.models.enums import Plan
 from app.models.stripe_webhook_event import StripeWebhookEvent
 from app.models.subscription import Subscription
 from app.models.user import User
+from app.services import billing_client
 
 logger = logging.getLogger(__name__)
 
@@ -135,6 +136,7 @@ async def _dispatch_event(
     db: AsyncSession, event_type: str, data_object: dict
 ) -> None:
     """Route the event to the correct handler based on event type."""
+    billing_client.invalidate_for_event(event_type, data_object)
     if event_type == "customer.subscription.created":
         await _handle_subscription_created(db, data_object)
     elif event_type == "customer.subscription.updated":
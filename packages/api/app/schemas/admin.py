@@ -26,6 +26,8 @@ class AdminUserListResponse(CamelModel):
     total: int
     page: int
     page_size: int
+    next_cursor: str | None = None
+    total_is_estimate: bool = False
 
 
 class BetaUserResponse(CamelModel):
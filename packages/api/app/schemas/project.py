@@ -46,6 +46,19 @@ class WidgetConfigResponse(CamelModel):
     owner_plan: str = "free"
 
 
+class ConsoleLogQuotaResponse(BaseModel):
+    remaining: int
+    limit: int
+    allowed: bool
+
+
+class WidgetBootstrapResponse(CamelModel):
+    """Everything the widget needs on page load, in one round trip."""
+
+    config: WidgetConfigResponse
+    console_log_quota: ConsoleLogQuotaResponse
+
+
 class ProjectResponse(CamelModel):
     id: uuid.UUID
     name: str
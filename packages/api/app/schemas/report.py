@@ -12,6 +12,7 @@ from app.utils.sanitize import sanitize_text
 
 MAX_LOGS_JSON_SIZE = 512 * 1024  # 512 KB
 MAX_METADATA_JSON_SIZE = 64 * 1024  # 64 KB
+MAX_BATCH_REPORTS = 50
 
 
 def _validate_json_size(value: dict | list | None, max_size: int, field_name: str) -> dict | list | None:
@@ -72,6 +73,10 @@ class ReportCreate(BaseModel):
         return _validate_json_size(value, MAX_METADATA_JSON_SIZE, "metadata")
 
 
+class ReportBatchCreate(BaseModel):
+    reports: list[ReportCreate] = Field(min_length=1, max_length=MAX_BATCH_REPORTS)
+
+
 class ReportUpdate(BaseModel):
     title: str | None = Field(default=None, min_length=1, max_length=500)
     description: str | None = Field(default=None, max_length=10000)
@@ -100,6 +105,10 @@ class ReportResponse(CamelModel):
     assignee_id: uuid.UUID | None
     screenshot_url: str | None
     annotated_screenshot_url: str | None
+    # WebP renditions from the image pipeline; null until they have been
+    # stored, so clients fall back to screenshot_url
+    screenshot_thumbnail_url: str | None = None
+    screenshot_optimized_url: str | None = None
     console_logs: dict | list | None
     network_logs: dict | list | None
     user_actions: dict | list | None
@@ -121,6 +130,7 @@ class ReportListItemResponse(CamelModel):
     status: str
     assignee_id: uuid.UUID | None
     reporter_identifier: str | None
+    screenshot_thumbnail_url: str | None = None
     created_at: datetime
     updated_at: datetime
 
@@ -130,3 +140,25 @@ class ReportListResponse(CamelModel):
     total: int
     page: int
     page_size: int
+    next_cursor: str | None = None
+    total_is_estimate: bool = False
+
+
+class ReportFacetsResponse(CamelModel):
+    total: int
+    status: dict[str, int]
+    severity: dict[str, int]
+    category: dict[str, int]
+
+
+class ReportBatchItemResult(CamelModel):
+    index: int
+    status: Literal["created", "duplicate", "over_quota", "invalid"]
+    id: uuid.UUID | None = None
+    tracking_id: str | None = None
+    detail: str | None = None
+
+
+class ReportBatchResponse(CamelModel):
+    results: list[ReportBatchItemResult]
+    created: int
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from pydantic import Field
+
+from app.schemas import CamelModel
+
+
+class DirectUploadRequest(CamelModel):
+    content_type: str
+    size: int = Field(gt=0)
+
+
+class DirectUploadResponse(CamelModel):
+    key: str
+    url: str
+    headers: dict[str, str]
+    expires_in: int
+
+
+class UploadCompleteRequest(CamelModel):
+    key: str = Field(max_length=255)
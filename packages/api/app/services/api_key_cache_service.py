@@ -0,0 +1,144 @@
+"""In-process cache of widget API-key lookups.
+
+Entries are keyed by the SHA-256 of the raw key and hold column snapshots of
+the project and its owner. Keys that matched nothing go in a separate, smaller
+cache so a flood of random keys cannot push valid keys out. Commits that
+change a project, change an owner's plan/role or delete an owner evict the
+affected entries in this worker; other workers pick the change up when their
+entries expire.
+"""
+from __future__ import annotations
+
+import copy
+import uuid
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.models.project import Project
+from app.models.user import User
+from app.utils.ttl_cache import TTLCache
+
+API_KEY_CACHE_TTL_SECONDS = 60
+INVALID_API_KEY_CACHE_TTL_SECONDS = 30
+INVALID_API_KEY_CACHE_MAX_SIZE = 2_000
+
+# Owner columns that change what a widget request is allowed to do
+_OWNER_AUTH_FIELDS = ("plan", "role")
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class _ProjectSnapshot:
+    project: dict[str, Any]
+    owner: dict[str, Any] | None
+
+    def build(self) -> Project:
+        """A fresh transient Project (with owner) for the current request."""
+        project = Project(**copy.deepcopy(self.project))
+        if self.owner is not None:
+            project.owner = User(**copy.deepcopy(self.owner))
+        return project
+
+
+def _column_values(instance: Project | User) -> dict[str, Any]:
+    return {attr.key: getattr(instance, attr.key) for attr in inspect(type(instance)).column_attrs}
+
+
+_api_key_cache: TTLCache[str, _ProjectSnapshot] = TTLCache(
+    ttl_seconds=API_KEY_CACHE_TTL_SECONDS, max_size=10_000
+)
+_invalid_key_cache: TTLCache[str, bool] = TTLCache(
+    ttl_seconds=INVALID_API_KEY_CACHE_TTL_SECONDS, max_size=INVALID_API_KEY_CACHE_MAX_SIZE
+)
+
+
+def get_cached_project(key_hash: str) -> tuple[bool, Project | None]:
+    """Return ``(hit, project)``. A hit with ``None`` means the key is known to be invalid."""
+    snapshot = _api_key_cache.get(key_hash, _MISSING)
+    if snapshot is not _MISSING:
+        return True, snapshot.build()
+    return key_hash in _invalid_key_cache, None
+
+
+def cache_project(key_hash: str, project: Project) -> None:
+    owner = project.owner
+    _api_key_cache.set(
+        key_hash,
+        _ProjectSnapshot(
+            project=_column_values(project),
+            owner=_column_values(owner) if owner is not None else None,
+        ),
+    )
+
+
+def cache_invalid_key(key_hash: str) -> None:
+    _invalid_key_cache.set(key_hash, True)
+
+
+def invalidate_api_key(key_hash: str) -> None:
+    _api_key_cache.pop(key_hash)
+    _invalid_key_cache.pop(key_hash)
+
+
+def invalidate_owner(owner_id: uuid.UUID) -> int:
+    """Evict every cached project owned by ``owner_id``."""
+    return _api_key_cache.evict_where(lambda _key, snapshot: snapshot.project["owner_id"] == owner_id)
+
+
+def clear_api_key_cache() -> None:
+    _api_key_cache.clear()
+    _invalid_key_cache.clear()
+
+
+# ---------- Invalidation on commit ----------
+
+_PENDING_KEY = "api_key_cache_invalidations"
+
+
+def _attribute_values(instance: object, key: str) -> set:
+    history = inspect(instance).attrs[key].history
+    return {value for value in (*history.added, *history.unchanged, *history.deleted) if value is not None}
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_invalidations(session: Session, _flush_context, _instances) -> None:
+    key_hashes: set[str] = set()
+    owner_ids: set[uuid.UUID] = set()
+    for instance in (*session.dirty, *session.deleted):
+        if isinstance(instance, Project):
+            if instance in session.deleted or session.is_modified(instance):
+                # Old and new hash, so both stale positives and stale negatives go
+                key_hashes |= _attribute_values(instance, "api_key_hash")
+        elif isinstance(instance, User):
+            # Deleting a user removes their projects by FK cascade, which the
+            # session never sees, so their keys are evicted by owner
+            state = inspect(instance)
+            if instance in session.deleted or any(
+                state.attrs[field].history.has_changes() for field in _OWNER_AUTH_FIELDS
+            ):
+                owner_ids.add(instance.id)
+    if key_hashes or owner_ids:
+        pending = session.info.setdefault(_PENDING_KEY, (set(), set()))
+        pending[0].update(key_hashes)
+        pending[1].update(owner_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending is None:
+        return
+    key_hashes, owner_ids = pending
+    for key_hash in key_hashes:
+        invalidate_api_key(key_hash)
+    for owner_id in owner_ids:
+        invalidate_owner(owner_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
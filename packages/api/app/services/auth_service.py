@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import secrets
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
 import bcrypt
@@ -15,13 +17,61 @@ _JWT_ALGORITHM = "HS256"
 
 
 def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    rounds = get_settings().BCRYPT_ROUNDS
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=rounds)).decode("utf-8")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True when the hash was made with a different cost than ``BCRYPT_ROUNDS``."""
+    try:
+        rounds = int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return False
+    return rounds != get_settings().BCRYPT_ROUNDS
+
+
+# bcrypt releases the GIL, so a small dedicated pool keeps the event loop free
+# while capping how many CPUs a login burst can take from request handling.
+_password_executor: ThreadPoolExecutor | None = None
+
+
+def _get_password_executor() -> ThreadPoolExecutor:
+    global _password_executor
+    if _password_executor is None:
+        _password_executor = ThreadPoolExecutor(
+            max_workers=get_settings().PASSWORD_HASH_WORKERS,
+            thread_name_prefix="password-hash",
+        )
+    return _password_executor
+
+
+async def hash_password_async(password: str) -> str:
+    """``hash_password`` run in the password-hashing pool; use this from async code."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_password_executor(), hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """``verify_password`` run in the password-hashing pool; use this from async code."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_password_executor(), verify_password, plain_password, hashed_password
+    )
+
+
+async def rehash_password_if_needed(user, plain_password: str) -> None:
+    """After a successful login, re-hash at the configured cost if it changed.
+
+    Only sets ``user.hashed_password``; the caller's commit persists it.
+    """
+    if user.hashed_password and password_needs_rehash(user.hashed_password):
+        user.hashed_password = await hash_password_async(plain_password)
+
+
 def create_cli_pat(user_id, name: str = "BugSpark CLI", expires_days: int = 90):
     """Generate a PAT for CLI usage and return (raw_token, token_hash, token_prefix, expires_at)."""
     from app.models.personal_access_token import PersonalAccessToken
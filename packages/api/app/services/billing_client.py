@@ -0,0 +1,190 @@
+"""Stripe calls for the billing routes, kept off the event loop.
+
+The Stripe SDK is synchronous, so every call here runs on a small dedicated
+thread pool. Each HTTP attempt has a timeout and the whole call (retries
+included) has a deadline, so a slow Stripe response ties up a pool thread
+instead of the worker's event loop. Read-only lookups (subscription state,
+invoice lists) are cached briefly. Mutations made through this module evict
+them, and so do Stripe webhooks.
+
+Set ``STRIPE_API_BASE`` to point the SDK at a local fake such as stripe-mock.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from app.config import get_settings
+from app.exceptions import BadRequestException
+from app.utils.ttl_cache import TTLCache
+
+# Optional stripe import - allows tests to run without stripe installed
+try:
+    import stripe
+    from stripe import StripeError
+except ImportError:
+    stripe = None  # type: ignore[assignment]
+
+    class StripeError(Exception):  # noqa: N818
+        """Stub when stripe package is not installed."""
+
+        user_message: str = ""
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIPTION_CACHE_TTL_SECONDS = 30
+INVOICE_CACHE_TTL_SECONDS = 60
+
+_DEFAULT_API_BASE = stripe.api_base if stripe is not None else ""
+
+_executor: ThreadPoolExecutor | None = None
+_http_client_timeout: float | None = None
+
+_subscription_cache: TTLCache[str, Any] = TTLCache(ttl_seconds=SUBSCRIPTION_CACHE_TTL_SECONDS, max_size=2048)
+_invoice_cache: TTLCache[tuple[str, int], Any] = TTLCache(ttl_seconds=INVOICE_CACHE_TTL_SECONDS, max_size=2048)
+
+
+def _configure() -> None:
+    """Point the SDK at the configured key, API base and HTTP timeout."""
+    global _http_client_timeout
+    if stripe is None:
+        raise BadRequestException("Stripe is not installed. Please install the stripe package.")
+    settings = get_settings()
+    stripe.api_key = settings.STRIPE_SECRET_KEY
+    stripe.api_base = settings.STRIPE_API_BASE or _DEFAULT_API_BASE
+    if _http_client_timeout != settings.STRIPE_TIMEOUT_SECONDS:
+        stripe.default_http_client = stripe.new_default_http_client(timeout=settings.STRIPE_TIMEOUT_SECONDS)
+        _http_client_timeout = settings.STRIPE_TIMEOUT_SECONDS
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=get_settings().STRIPE_MAX_CONCURRENCY,
+            thread_name_prefix="stripe",
+        )
+    return _executor
+
+
+async def _call(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking Stripe SDK call in the pool, bounded by an overall deadline.
+
+    A timeout surfaces as ``stripe.APIConnectionError`` so callers handle it
+    like any other ``StripeError``.
+    """
+    _configure()
+    settings = get_settings()
+    deadline = settings.STRIPE_TIMEOUT_SECONDS * (stripe.max_network_retries + 1)
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(_get_executor(), functools.partial(fn, *args, **kwargs))
+    try:
+        return await asyncio.wait_for(future, timeout=deadline)
+    except asyncio.TimeoutError as exc:
+        logger.error("Stripe call %s timed out after %.0fs", getattr(fn, "__qualname__", fn), deadline)
+        raise stripe.APIConnectionError("Timed out waiting for Stripe") from exc
+
+
+# ---------- Reads (cached) ----------
+
+
+async def retrieve_subscription(subscription_id: str, *, fresh: bool = False) -> Any:
+    """Subscription state, served from the short-lived cache unless ``fresh``.
+
+    Read-modify-write paths pass ``fresh=True`` so they never act on state up
+    to ``SUBSCRIPTION_CACHE_TTL_SECONDS`` old; the result still refreshes the cache.
+    """
+    cached = None if fresh else _subscription_cache.get(subscription_id)
+    if cached is not None:
+        return cached
+    subscription = await _call(stripe.Subscription.retrieve, subscription_id)
+    _subscription_cache.set(subscription_id, subscription)
+    return subscription
+
+
+async def list_invoices(customer_id: str, limit: int = 24) -> Any:
+    key = (customer_id, limit)
+    cached = _invoice_cache.get(key)
+    if cached is not None:
+        return cached
+    invoices = await _call(stripe.Invoice.list, customer=customer_id, limit=limit)
+    _invoice_cache.set(key, invoices)
+    return invoices
+
+
+async def retrieve_subscription_schedule(schedule_id: str) -> Any:
+    return await _call(stripe.SubscriptionSchedule.retrieve, schedule_id)
+
+
+# ---------- Writes ----------
+
+
+async def create_customer(**params: Any) -> Any:
+    return await _call(stripe.Customer.create, **params)
+
+
+async def create_checkout_session(**params: Any) -> Any:
+    return await _call(stripe.checkout.Session.create, **params)
+
+
+async def modify_subscription(subscription_id: str, **params: Any) -> Any:
+    try:
+        subscription = await _call(stripe.Subscription.modify, subscription_id, **params)
+    finally:
+        invalidate_subscription(subscription_id)
+    # Prorations and cancellations can issue invoices
+    invalidate_invoices(getattr(subscription, "customer", None))
+    return subscription
+
+
+async def create_subscription_schedule(subscription_id: str) -> Any:
+    try:
+        return await _call(stripe.SubscriptionSchedule.create, from_subscription=subscription_id)
+    finally:
+        invalidate_subscription(subscription_id)
+
+
+async def modify_subscription_schedule(schedule_id: str, subscription_id: str, **params: Any) -> Any:
+    try:
+        return await _call(stripe.SubscriptionSchedule.modify, schedule_id, **params)
+    finally:
+        invalidate_subscription(subscription_id)
+
+
+async def release_subscription_schedule(schedule_id: str, subscription_id: str) -> Any:
+    try:
+        return await _call(stripe.SubscriptionSchedule.release, schedule_id)
+    finally:
+        invalidate_subscription(subscription_id)
+
+
+# ---------- Invalidation ----------
+
+
+def invalidate_subscription(subscription_id: str | None) -> None:
+    if subscription_id:
+        _subscription_cache.pop(subscription_id)
+
+
+def invalidate_invoices(customer_id: str | None) -> None:
+    if customer_id:
+        _invoice_cache.evict_where(lambda key, _invoices: key[0] == customer_id)
+
+
+def invalidate_for_event(event_type: str, data_object: dict) -> None:
+    """Drop cached state a Stripe webhook event may have changed."""
+    if event_type.startswith("customer.subscription."):
+        invalidate_subscription(data_object.get("id"))
+    elif event_type.startswith("subscription_schedule."):
+        invalidate_subscription(data_object.get("subscription"))
+    elif event_type.startswith("invoice."):
+        invalidate_subscription(data_object.get("subscription"))
+    invalidate_invoices(data_object.get("customer"))
+
+
+def clear_billing_cache() -> None:
+    _subscription_cache.clear()
+    _invoice_cache.clear()
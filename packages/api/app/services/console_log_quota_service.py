@@ -0,0 +1,120 @@
+"""Daily console-log quota: one counter row per project per UTC day."""
+from __future__ import annotations
+
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import delete, event, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.console_log_usage import ConsoleLogUsage
+from app.utils.ttl_cache import TTLCache
+
+CONSOLE_LOG_DAILY_LIMIT = 5
+CONSOLE_LOG_USAGE_RETENTION_DAYS = 7
+
+# The widget probes the quota on every page load. Other workers' reservations
+# show up once the entry expires; submits are always enforced by the database.
+_usage_cache: TTLCache[tuple[uuid.UUID, date], int] = TTLCache(ttl_seconds=30, max_size=10_000)
+
+
+def utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def remember_console_log_usage(project_id: uuid.UUID, day: date, used: int) -> None:
+    """Record a committed ``used`` value so the quota probe sees it."""
+    _usage_cache.set((project_id, day), used)
+
+
+def clear_console_log_usage_cache() -> None:
+    _usage_cache.clear()
+
+
+# Reservations made in a session are cached once it commits, so a rolled-back
+# reservation never shows up in the quota probe
+_PENDING_KEY = "console_log_usage_reservations"
+
+
+def _remember_on_commit(session: Session | AsyncSession, project_id: uuid.UUID, day: date, used: int) -> None:
+    session.info.setdefault(_PENDING_KEY, {})[(project_id, day)] = used
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_reservations(session: Session) -> None:
+    for (project_id, day), used in session.info.pop(_PENDING_KEY, {}).items():
+        remember_console_log_usage(project_id, day, used)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_reservations(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+async def reserve_console_log_slots(db: AsyncSession, project_id: uuid.UUID, wanted: int) -> int:
+    """Atomically take up to ``wanted`` of today's console-log slots. Does not commit.
+
+    One upsert grants ``LEAST(wanted, limit - used)`` under the row lock and
+    returns how many slots it granted (0 once the daily limit is used up).
+    The quota probe's cache picks up the new count when ``db`` commits.
+    """
+    if wanted <= 0:
+        return 0
+    day = utc_today()
+    dialect_name = db.bind.dialect.name if db.bind else ""
+    insert = pg_insert if dialect_name == "postgresql" else sqlite_insert
+    initial = min(wanted, CONSOLE_LOG_DAILY_LIMIT)
+    # SET expressions all see the row as it was before this statement
+    granted = func.min(wanted, CONSOLE_LOG_DAILY_LIMIT - ConsoleLogUsage.used)
+    if dialect_name == "postgresql":
+        granted = func.least(wanted, CONSOLE_LOG_DAILY_LIMIT - ConsoleLogUsage.used)
+    statement = (
+        insert(ConsoleLogUsage)
+        .values(project_id=project_id, day=day, used=initial, last_granted=initial)
+        .on_conflict_do_update(
+            index_elements=["project_id", "day"],
+            set_={"used": ConsoleLogUsage.used + granted, "last_granted": granted},
+            where=ConsoleLogUsage.used < CONSOLE_LOG_DAILY_LIMIT,
+        )
+        .returning(ConsoleLogUsage.used, ConsoleLogUsage.last_granted)
+    )
+    row = (await db.execute(statement)).one_or_none()
+    _remember_on_commit(db, project_id, day, CONSOLE_LOG_DAILY_LIMIT if row is None else row.used)
+    return 0 if row is None else row.last_granted
+
+
+async def reserve_console_log_slot(db: AsyncSession, project_id: uuid.UUID) -> bool:
+    """Take one of today's console-log slots. Does not commit.
+
+    Returns False when the project has already used its daily limit.
+    """
+    return await reserve_console_log_slots(db, project_id, 1) == 1
+
+
+async def get_console_log_usage(db: AsyncSession, project_id: uuid.UUID) -> int:
+    """Console-log reports used today, served from cache when possible."""
+    day = utc_today()
+    cached = _usage_cache.get((project_id, day))
+    if cached is not None:
+        return cached
+
+    result = await db.execute(
+        select(ConsoleLogUsage.used).where(
+            ConsoleLogUsage.project_id == project_id,
+            ConsoleLogUsage.day == day,
+        )
+    )
+    used = result.scalar() or 0
+    remember_console_log_usage(project_id, day, used)
+    return used
+
+
+async def cleanup_old_console_log_usage(db: AsyncSession) -> int:
+    """Delete counter rows older than CONSOLE_LOG_USAGE_RETENTION_DAYS. Returns count deleted."""
+    cutoff = utc_today() - timedelta(days=CONSOLE_LOG_USAGE_RETENTION_DAYS)
+    result = await db.execute(delete(ConsoleLogUsage).where(ConsoleLogUsage.day < cutoff))
+    await db.commit()
+    return result.rowcount
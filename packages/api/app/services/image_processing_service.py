@@ -0,0 +1,135 @@
+"""Derived WebP renditions of uploaded screenshots.
+
+Once a report referencing an uploaded screenshot is created,
+``process_screenshot`` fetches the original once and writes two renditions
+next to it: a small thumbnail for list views and a recompressed full-size
+image for detail views and exports, then stamps
+``reports.screenshot_renditions_at`` so the API only signs renditions that
+exist. Decoding and
+encoding run in a process pool so they use neither the event loop nor the
+GIL. Originals are never modified, so anything that can't be processed keeps
+working from the original.
+
+Requires Pillow; without it, or with ``IMAGE_PROCESSING_WORKERS=0``, the
+pipeline is disabled and responses carry no rendition URLs.
+"""
+from __future__ import annotations
+
+import asyncio
+import io
+import logging
+import uuid
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import func, update
+
+from app.config import get_settings
+from app.models.report import Report
+from app.services.s3_client import S3Error
+from app.services.storage_service import (
+    OPTIMIZED_VARIANT,
+    THUMBNAIL_VARIANT,
+    download_file,
+    store_variant,
+    validate_object_key,
+)
+
+# Optional Pillow import - the pipeline is skipped when it isn't installed
+try:
+    from PIL import Image
+except ImportError:
+    Image = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_MAX_SIZE = (480, 480)
+THUMBNAIL_QUALITY = 70
+OPTIMIZED_QUALITY = 85
+# Refuse to decode anything larger than an 8K display (decompression bombs).
+# Pillow only warns up to twice this size, so render_variants makes the
+# warning an error.
+MAX_IMAGE_PIXELS = 7680 * 4320
+if Image is not None:
+    Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+
+_executor: ProcessPoolExecutor | None = None
+
+
+def is_enabled() -> bool:
+    return Image is not None and get_settings().IMAGE_PROCESSING_WORKERS > 0
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=get_settings().IMAGE_PROCESSING_WORKERS)
+    return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+    _executor = None
+
+
+def render_variants(data: bytes) -> tuple[bytes, bytes]:
+    """Return (thumbnail, optimized) WebP encodings of an image. Runs in a worker process."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", Image.DecompressionBombWarning)
+        with Image.open(io.BytesIO(data)) as source:
+            source.load()
+            image = source.convert("RGBA" if source.mode in ("RGBA", "LA", "P") else "RGB")
+
+    optimized = io.BytesIO()
+    image.save(optimized, "WEBP", quality=OPTIMIZED_QUALITY, method=4)
+
+    image.thumbnail(THUMBNAIL_MAX_SIZE, Image.Resampling.LANCZOS)
+    thumbnail = io.BytesIO()
+    image.save(thumbnail, "WEBP", quality=THUMBNAIL_QUALITY, method=4)
+    return thumbnail.getvalue(), optimized.getvalue()
+
+
+async def mark_renditions_stored(report_id: uuid.UUID) -> None:
+    """Record that the report's screenshot renditions exist.
+
+    Keeps ``updated_at`` as it is: it feeds resolution times and is not a
+    user-visible change.
+    """
+    from app.database import async_session
+
+    async with async_session() as db:
+        await db.execute(
+            update(Report)
+            .where(Report.id == report_id)
+            .values(screenshot_renditions_at=func.now(), updated_at=Report.updated_at)
+        )
+        await db.commit()
+
+
+async def process_screenshot(report_id: uuid.UUID, key: str) -> None:
+    """Write the thumbnail and optimized renditions of a report's screenshot.
+
+    Meant to run as a background task after the report is created; failures
+    are logged, never raised, and leave the report pointing at the original.
+    """
+    if not is_enabled() or not validate_object_key(key):
+        return
+    try:
+        data = await download_file(key)
+        loop = asyncio.get_running_loop()
+        thumbnail, optimized = await loop.run_in_executor(_get_executor(), render_variants, data)
+        await asyncio.gather(
+            store_variant(key, THUMBNAIL_VARIANT, thumbnail),
+            store_variant(key, OPTIMIZED_VARIANT, optimized),
+        )
+        await mark_renditions_stored(report_id)
+        logger.info(
+            "Processed screenshot %s: %d -> %d bytes (thumbnail %d bytes)",
+            key, len(data), len(optimized), len(thumbnail),
+        )
+    except S3Error as e:
+        logger.error("Failed to process screenshot %s: %s - %s", key, e.code, e.message)
+    except Exception as e:
+        logger.exception("Unexpected error processing screenshot %s: %s", key, e)
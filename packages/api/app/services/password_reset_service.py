@@ -9,7 +9,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User
-from app.services.auth_service import hash_password
+from app.services.auth_service import hash_password_async
 from app.services.email_service import send_email
 
 logger = logging.getLogger(__name__)
@@ -84,7 +84,7 @@ async def reset_password(
     ):
         return False
 
-    user.hashed_password = hash_password(new_password)
+    user.hashed_password = await hash_password_async(new_password)
     user.password_reset_token = None
     user.password_reset_expires_at = None
     # Invalidate all existing sessions by clearing the refresh token JTI
@@ -0,0 +1,86 @@
+"""Write-coalesced ``last_used_at`` tracking for personal access tokens.
+
+Authenticating with a PAT only records the time in memory. The background
+task processor flushes recorded times in one batched UPDATE, writing each
+token at most once per ``PAT_LAST_USED_FLUSH_INTERVAL_SECONDS``; whatever is
+still pending is written on shutdown. ``last_used_at`` can therefore lag by
+up to about a minute, and a crash or failed flush loses at most that much.
+"""
+from __future__ import annotations
+
+import logging
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.personal_access_token import PersonalAccessToken
+
+logger = logging.getLogger(__name__)
+
+PAT_LAST_USED_FLUSH_INTERVAL_SECONDS = 60.0
+
+
+class PatUsageTracker:
+    def __init__(self, flush_interval_seconds: float = PAT_LAST_USED_FLUSH_INTERVAL_SECONDS) -> None:
+        self.flush_interval_seconds = flush_interval_seconds
+        self._pending: dict[uuid.UUID, datetime] = {}
+        # monotonic time each token was last written, to rate-limit writes
+        self._written_at: dict[uuid.UUID, float] = {}
+
+    def record(self, token_id: uuid.UUID, used_at: datetime) -> None:
+        current = self._pending.get(token_id)
+        if current is None or used_at > current:
+            self._pending[token_id] = used_at
+
+    def pending_last_used(self, token_id: uuid.UUID) -> datetime | None:
+        """A use recorded in this worker but not yet written, if any."""
+        return self._pending.get(token_id)
+
+    def clear(self) -> None:
+        self._pending.clear()
+        self._written_at.clear()
+
+    def _take_due(self, force: bool) -> dict[uuid.UUID, datetime]:
+        now = time.monotonic()
+        due = {
+            token_id: used_at
+            for token_id, used_at in self._pending.items()
+            if force or now - self._written_at.get(token_id, float("-inf")) >= self.flush_interval_seconds
+        }
+        for token_id in due:
+            del self._pending[token_id]
+            self._written_at[token_id] = now
+        # Tokens written long enough ago are due again anyway; forget them
+        for token_id, written_at in list(self._written_at.items()):
+            if now - written_at >= self.flush_interval_seconds and token_id not in self._pending:
+                del self._written_at[token_id]
+        return due
+
+    async def flush(self, db: AsyncSession, force: bool = False) -> int:
+        """Write due ``last_used_at`` values in one statement. Returns tokens written."""
+        due = self._take_due(force)
+        if not due:
+            return 0
+        try:
+            # Core UPDATE by id: tokens revoked since they were used just match
+            # no row, where the ORM bulk update would raise StaleDataError.
+            tokens = PersonalAccessToken.__table__
+            await db.execute(
+                update(tokens)
+                .where(tokens.c.id == bindparam("token_id"))
+                .values(last_used_at=bindparam("used_at")),
+                [{"token_id": token_id, "used_at": used_at} for token_id, used_at in due.items()],
+            )
+            await db.commit()
+        except Exception:
+            # Dropped, not re-queued: a batch that keeps failing must not
+            # block every later flush. The next use records the time again.
+            await db.rollback()
+            raise
+        return len(due)
+
+
+pat_usage_tracker = PatUsageTracker()
@@ -10,8 +10,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.exceptions import ForbiddenException
 from app.models.enums import Plan, Role
 from app.models.project import Project
-from app.models.report import Report
 from app.models.user import User
+from app.services.usage_counter_service import (
+    get_monthly_report_count,
+    get_project_report_count,
+    month_period,
+)
 
 
 @dataclass(frozen=True)
@@ -182,9 +186,8 @@ async def check_project_limit(db: AsyncSession, user: User) -> None:
         )
 
 
-async def check_report_limit(db: AsyncSession, project: Project) -> None:
-    """Raise ForbiddenException if the project or its owner has hit a report limit."""
-    # Ensure owner is loaded — prefer eager-loaded relation, fall back to explicit query
+async def load_project_owner(db: AsyncSession, project: Project) -> User:
+    """Return the project owner, preferring the eager-loaded relation."""
     owner: User | None = getattr(project, "owner", None)
     if owner is None:
         owner_result = await db.execute(
@@ -193,6 +196,30 @@ async def check_report_limit(db: AsyncSession, project: Project) -> None:
         owner = owner_result.scalar_one_or_none()
     if owner is None:
         raise ForbiddenException("Project owner not found")
+    return owner
+
+
+def project_report_limit_error(owner: User) -> ForbiddenException:
+    limits = PLAN_LIMITS[owner.plan]
+    return ForbiddenException(
+        f"Plan limit reached: {owner.plan.value} plan allows up to "
+        f"{int(limits.max_reports_per_project)} report(s) per project. "
+        "Please upgrade your plan."
+    )
+
+
+def monthly_report_limit_error(owner: User) -> ForbiddenException:
+    limits = PLAN_LIMITS[owner.plan]
+    return ForbiddenException(
+        f"Plan limit reached: {owner.plan.value} plan allows up to "
+        f"{int(limits.max_reports_per_month)} report(s) per month. "
+        "Please upgrade your plan."
+    )
+
+
+async def check_report_limit(db: AsyncSession, project: Project) -> None:
+    """Raise ForbiddenException if the project or its owner has hit a report limit."""
+    owner = await load_project_owner(db, project)
     if owner.role == Role.SUPERADMIN:
         return
 
@@ -200,53 +227,45 @@ async def check_report_limit(db: AsyncSession, project: Project) -> None:
 
     # --- per-project cap ---
     if math.isfinite(limits.max_reports_per_project):
-        count_result = await db.execute(
-            select(func.count())
-            .select_from(Report)
-            .where(Report.project_id == project.id)
-        )
-        project_count = count_result.scalar() or 0
+        project_count = await get_project_report_count(db, project.id)
         if project_count >= limits.max_reports_per_project:
-            raise ForbiddenException(
-                f"Plan limit reached: {owner.plan.value} plan allows up to "
-                f"{int(limits.max_reports_per_project)} report(s) per project. "
-                "Please upgrade your plan."
-            )
+            raise project_report_limit_error(owner)
 
     # --- monthly cap across all owner's projects ---
     if math.isfinite(limits.max_reports_per_month):
-        now = datetime.now(timezone.utc)
-        month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-
-        owner_project_ids = select(Project.id).where(Project.owner_id == owner.id)
-        monthly_result = await db.execute(
-            select(func.count())
-            .select_from(Report)
-            .where(
-                Report.project_id.in_(owner_project_ids),
-                Report.created_at >= month_start,
-            )
-        )
-        monthly_count = monthly_result.scalar() or 0
+        monthly_count = await get_monthly_report_count(db, owner.id, month_period())
         if monthly_count >= limits.max_reports_per_month:
-            raise ForbiddenException(
-                f"Plan limit reached: {owner.plan.value} plan allows up to "
-                f"{int(limits.max_reports_per_month)} report(s) per month. "
-                "Please upgrade your plan."
-            )
+            raise monthly_report_limit_error(owner)
+
+
+async def get_remaining_report_quota(db: AsyncSession, project: Project) -> int | float:
+    """Return how many more reports the project may accept right now.
+
+    Takes the tighter of the per-project and monthly caps. ``math.inf``
+    means unlimited. Used by batch ingest, which admits as many items as
+    fit instead of rejecting the whole request.
+    """
+    owner = await load_project_owner(db, project)
+    if owner.role == Role.SUPERADMIN:
+        return math.inf
+
+    limits = PLAN_LIMITS[owner.plan]
+    remaining: int | float = math.inf
+
+    if math.isfinite(limits.max_reports_per_project):
+        project_count = await get_project_report_count(db, project.id)
+        remaining = min(remaining, int(limits.max_reports_per_project) - project_count)
+
+    if math.isfinite(limits.max_reports_per_month):
+        monthly_count = await get_monthly_report_count(db, owner.id, month_period())
+        remaining = min(remaining, int(limits.max_reports_per_month) - monthly_count)
+
+    return max(0, remaining)
 
 
 async def check_team_member_limit(db: AsyncSession, project: Project) -> None:
     """Raise ForbiddenException if the project has reached its team member limit."""
-    # Ensure owner is loaded — prefer eager-loaded relation, fall back to explicit query
-    owner: User | None = getattr(project, "owner", None)
-    if owner is None:
-        owner_result = await db.execute(
-            select(User).where(User.id == project.owner_id)
-        )
-        owner = owner_result.scalar_one_or_none()
-    if owner is None:
-        raise ForbiddenException("Project owner not found")
+    owner = await load_project_owner(db, project)
     if owner.role == Role.SUPERADMIN:
         return
 
@@ -0,0 +1,64 @@
+"""Which projects a dashboard user may see: ones they own or joined.
+
+Point checks (``project_id in ids``) use a short-lived per-user cache of the
+accessible project IDs. List queries should use ``accessible_project_filter``
+instead, which keeps the membership lookup inside the SQL statement rather
+than sending a long ``IN (...)`` list.
+"""
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import ColumnElement, Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.project import Project
+from app.models.project_member import ProjectMember
+from app.utils.ttl_cache import TTLCache
+
+# Membership changes made through team_service evict immediately in this
+# worker; other workers can keep a removed member's access for up to this long.
+ACCESS_CACHE_TTL_SECONDS = 30
+
+_access_cache: TTLCache[uuid.UUID, frozenset[uuid.UUID]] = TTLCache(
+    ttl_seconds=ACCESS_CACHE_TTL_SECONDS, max_size=10_000
+)
+
+
+def accessible_project_ids_query(user_id: uuid.UUID) -> Select:
+    """Project IDs the user owns or is an accepted member of."""
+    owner_query = select(Project.id).where(Project.owner_id == user_id)
+    member_query = select(ProjectMember.project_id).where(
+        ProjectMember.user_id == user_id,
+        ProjectMember.invite_accepted_at.is_not(None),
+    )
+    return owner_query.union(member_query)
+
+
+def accessible_project_filter(user_id: uuid.UUID, project_id_column) -> ColumnElement[bool]:
+    """``project_id_column IN (<owned or joined projects>)`` as a semi-join subquery."""
+    return project_id_column.in_(accessible_project_ids_query(user_id))
+
+
+async def get_accessible_project_ids(user_id: uuid.UUID, db: AsyncSession) -> frozenset[uuid.UUID]:
+    cached = _access_cache.get(user_id)
+    if cached is not None:
+        return cached
+    result = await db.execute(accessible_project_ids_query(user_id))
+    project_ids = frozenset(row[0] for row in result.all())
+    _access_cache.set(user_id, project_ids)
+    return project_ids
+
+
+def invalidate_user_access(user_id: uuid.UUID | None) -> None:
+    if user_id is not None:
+        _access_cache.pop(user_id)
+
+
+def invalidate_project_access(project_id: uuid.UUID) -> int:
+    """Evict every cached user whose accessible set includes ``project_id``."""
+    return _access_cache.evict_where(lambda _user_id, project_ids: project_id in project_ids)
+
+
+def clear_project_access_cache() -> None:
+    _access_cache.clear()
@@ -0,0 +1,276 @@
+"""Persist widget-submitted reports with as few database round trips as possible."""
+from __future__ import annotations
+
+import math
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import Boolean, Date, DateTime, Integer, String, bindparam, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.exceptions import BadRequestException
+from app.models.enums import Role
+from app.models.project import Project
+from app.models.report import Category, Report, Severity, Status
+from app.schemas.report import ReportCreate
+from app.services.console_log_quota_service import (
+    CONSOLE_LOG_DAILY_LIMIT,
+    remember_console_log_usage,
+    reserve_console_log_slot,
+    utc_today,
+)
+from app.services.plan_limits_service import (
+    PLAN_LIMITS,
+    check_report_limit,
+    load_project_owner,
+    monthly_report_limit_error,
+    project_report_limit_error,
+)
+from app.services.spam_protection_service import (
+    DUPLICATE_WINDOW,
+    is_duplicate_report,
+    is_recent_duplicate,
+    remember_fingerprint,
+)
+from app.services.tracking_id_service import generate_tracking_id
+from app.services.usage_counter_service import month_period
+from app.services.usage_service import invalidate_project_usage_on_commit
+from app.utils.fingerprint import fingerprint_range, report_fingerprint
+
+
+def build_report_values(
+    project_id: uuid.UUID,
+    body: ReportCreate,
+    tracking_id: str,
+    console_logs_included: bool,
+) -> dict:
+    """Column values for a new report. Console logs are dropped unless included."""
+    return {
+        "project_id": project_id,
+        "tracking_id": tracking_id,
+        "title": body.title,
+        "description": body.description,
+        "fingerprint": report_fingerprint(body.title, body.description),
+        "severity": Severity(body.severity),
+        "category": Category(body.category),
+        "reporter_identifier": body.reporter_identifier,
+        "screenshot_url": body.screenshot_url,
+        "annotated_screenshot_url": body.annotated_screenshot_url,
+        "console_logs": body.console_logs if console_logs_included else None,
+        "network_logs": body.network_logs,
+        "user_actions": body.user_actions,
+        "metadata_": body.metadata,
+        "console_logs_included": console_logs_included,
+    }
+
+
+async def ingest_report(db: AsyncSession, project: Project, body: ReportCreate) -> Report:
+    """Dedupe, quota-check, number and insert a report, then commit.
+
+    On PostgreSQL this is a single CTE statement. Other databases (SQLite in
+    tests) run the equivalent checks one query at a time.
+
+    Raises BadRequestException for duplicates and ForbiddenException when a
+    plan limit is reached.
+    """
+    dialect_name = db.bind.dialect.name if db.bind else ""
+    if dialect_name == "postgresql":
+        return await _ingest_report_pg(db, project, body)
+    return await _ingest_report_fallback(db, project, body)
+
+
+_PG_INGEST_SQL = text(
+    """
+    WITH gate AS (
+        SELECT
+            (
+                SELECT max(created_at) FROM reports
+                WHERE project_id = :project_id
+                  AND fingerprint BETWEEN :fingerprint_low AND :fingerprint_high
+                  AND created_at >= :dedupe_cutoff
+            ) AS duplicate_created_at,
+            CASE WHEN :project_limit IS NULL THEN false ELSE coalesce((
+                SELECT sum(report_count) FROM usage_counters
+                WHERE project_id = :project_id AND period = 'total'
+            ), 0) >= :project_limit END AS project_limit_hit,
+            CASE WHEN :monthly_limit IS NULL THEN false ELSE coalesce((
+                SELECT sum(report_count) FROM usage_counters
+                WHERE owner_id = :owner_id AND period = :month_period
+            ), 0) >= :monthly_limit END AS monthly_limit_hit
+    ),
+    accepted AS (
+        SELECT 1 FROM gate
+        WHERE duplicate_created_at IS NULL AND NOT (project_limit_hit OR monthly_limit_hit)
+    ),
+    console_slot AS (
+        INSERT INTO console_log_usage (project_id, day, used)
+        SELECT :project_id, :day, 1 FROM accepted WHERE :has_console_logs
+        ON CONFLICT (project_id, day) DO UPDATE
+        SET used = console_log_usage.used + 1
+        WHERE console_log_usage.used < :console_log_limit
+        RETURNING used
+    ),
+    inserted AS (
+        INSERT INTO reports (
+            id, project_id, tracking_id, title, description, fingerprint, severity, category,
+            reporter_identifier, screenshot_url, annotated_screenshot_url,
+            console_logs, network_logs, user_actions, metadata, console_logs_included
+        )
+        SELECT
+            :report_id, :project_id, :tracking_id, :title, :description, :fingerprint,
+            CAST(:severity AS severity_enum), CAST(:category AS category_enum),
+            :reporter_identifier, :screenshot_url, :annotated_screenshot_url,
+            CASE WHEN EXISTS (SELECT 1 FROM console_slot) THEN :console_logs END,
+            :network_logs, :user_actions, :metadata, EXISTS (SELECT 1 FROM console_slot)
+        FROM accepted
+        RETURNING tracking_id, status, console_logs_included, created_at, updated_at
+    )
+    SELECT
+        gate.duplicate_created_at, gate.project_limit_hit, gate.monthly_limit_hit,
+        inserted.tracking_id, inserted.status, inserted.console_logs_included,
+        inserted.created_at, inserted.updated_at,
+        (SELECT used FROM console_slot) AS console_logs_used
+    FROM gate LEFT JOIN inserted ON true
+    """
+).bindparams(
+    bindparam("project_id", type_=UUID(as_uuid=True)),
+    bindparam("owner_id", type_=UUID(as_uuid=True)),
+    bindparam("report_id", type_=UUID(as_uuid=True)),
+    bindparam("tracking_id", type_=String),
+    bindparam("title", type_=String),
+    bindparam("description", type_=String),
+    bindparam("fingerprint", type_=String),
+    bindparam("fingerprint_low", type_=String),
+    bindparam("fingerprint_high", type_=String),
+    bindparam("dedupe_cutoff", type_=DateTime(timezone=True)),
+    bindparam("month_period", type_=String),
+    bindparam("day", type_=Date),
+    bindparam("project_limit", type_=Integer),
+    bindparam("monthly_limit", type_=Integer),
+    bindparam("console_log_limit", type_=Integer),
+    bindparam("has_console_logs", type_=Boolean),
+    bindparam("severity", type_=String),
+    bindparam("category", type_=String),
+    bindparam("reporter_identifier", type_=String),
+    bindparam("screenshot_url", type_=String),
+    bindparam("annotated_screenshot_url", type_=String),
+    bindparam("console_logs", type_=JSONB),
+    bindparam("network_logs", type_=JSONB),
+    bindparam("user_actions", type_=JSONB),
+    bindparam("metadata", type_=JSONB),
+)
+
+
+def _finite_limit(value: int | float) -> int | None:
+    return int(value) if math.isfinite(value) else None
+
+
+async def _ingest_report_pg(db: AsyncSession, project: Project, body: ReportCreate) -> Report:
+    """Run dedupe, both quota checks and the INSERT as one statement.
+
+    The tracking ID is taken up front from the worker's block allocator, so a
+    rejected report leaves a gap in the numbering. Quota checks read
+    ``usage_counters``; the triggers on ``reports`` bump them as part of the
+    same statement. A console-log slot is only reserved when the report is
+    actually inserted.
+    """
+    owner = await load_project_owner(db, project)
+    project_limit: int | None = None
+    monthly_limit: int | None = None
+    if owner.role != Role.SUPERADMIN:
+        limits = PLAN_LIMITS[owner.plan]
+        project_limit = _finite_limit(limits.max_reports_per_project)
+        monthly_limit = _finite_limit(limits.max_reports_per_month)
+
+    if is_recent_duplicate(project.id, body.title, body.description):
+        raise BadRequestException("Duplicate report detected")
+
+    # Taken from the worker's in-memory block; only a refill touches projects
+    tracking_id = await generate_tracking_id(db, project.id)
+
+    now = datetime.now(timezone.utc)
+    day = utc_today()
+    report_id = uuid.uuid4()
+    fingerprint = report_fingerprint(body.title, body.description)
+    fingerprint_low, fingerprint_high = fingerprint_range(body.title, body.description)
+    result = await db.execute(
+        _PG_INGEST_SQL,
+        {
+            "project_id": project.id,
+            "owner_id": owner.id,
+            "report_id": report_id,
+            "tracking_id": tracking_id,
+            "title": body.title,
+            "description": body.description,
+            "fingerprint": fingerprint,
+            "fingerprint_low": fingerprint_low,
+            "fingerprint_high": fingerprint_high,
+            "dedupe_cutoff": now - DUPLICATE_WINDOW,
+            "month_period": month_period(),
+            "day": day,
+            "project_limit": project_limit,
+            "monthly_limit": monthly_limit,
+            "console_log_limit": CONSOLE_LOG_DAILY_LIMIT,
+            "has_console_logs": bool(body.console_logs),
+            "severity": body.severity,
+            "category": body.category,
+            "reporter_identifier": body.reporter_identifier,
+            "screenshot_url": body.screenshot_url,
+            "annotated_screenshot_url": body.annotated_screenshot_url,
+            "console_logs": body.console_logs,
+            "network_logs": body.network_logs,
+            "user_actions": body.user_actions,
+            "metadata": body.metadata,
+        },
+    )
+    row = result.one()
+
+    if row.duplicate_created_at is not None:
+        await db.rollback()
+        remember_fingerprint(str(project.id), fingerprint, row.duplicate_created_at)
+        raise BadRequestException("Duplicate report detected")
+    if row.project_limit_hit:
+        await db.rollback()
+        raise project_report_limit_error(owner)
+    if row.monthly_limit_hit:
+        await db.rollback()
+        raise monthly_report_limit_error(owner)
+
+    # The raw INSERT never flushes, so the usage listener can't see it
+    invalidate_project_usage_on_commit(db, project.id)
+    await db.commit()
+    remember_fingerprint(str(project.id), fingerprint)
+    if body.console_logs:
+        used = row.console_logs_used
+        remember_console_log_usage(project.id, day, CONSOLE_LOG_DAILY_LIMIT if used is None else used)
+
+    # Build the ORM object from the RETURNING row instead of re-reading it
+    values = build_report_values(project.id, body, row.tracking_id, row.console_logs_included)
+    return Report(
+        id=report_id,
+        status=Status(row.status),
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+        **values,
+    )
+
+
+async def _ingest_report_fallback(db: AsyncSession, project: Project, body: ReportCreate) -> Report:
+    """Sequential equivalent of the PostgreSQL statement."""
+    if await is_duplicate_report(db, str(project.id), body.title, body.description):
+        raise BadRequestException("Duplicate report detected")
+
+    await check_report_limit(db, project)
+
+    tracking_id = await generate_tracking_id(db, str(project.id))
+
+    # Console logs are only kept while the project is under its daily limit
+    console_logs_included = bool(body.console_logs) and await reserve_console_log_slot(db, project.id)
+
+    report = Report(**build_report_values(project.id, body, tracking_id, console_logs_included))
+    db.add(report)
+    await db.commit()
+    await db.refresh(report)
+    remember_fingerprint(str(project.id), report.fingerprint)
+    return report
@@ -0,0 +1,177 @@
+"""Shared query pieces for report list endpoints."""
+from __future__ import annotations
+
+import asyncio
+import re
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import (
+    ColumnElement,
+    Float,
+    Row,
+    String,
+    cast,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+    union_all,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.report import Category, Report, Severity, Status
+from app.schemas.report import ReportFacetsResponse, ReportListItemResponse
+from app.services.storage_service import THUMBNAIL_VARIANT, generate_variant_url
+from app.utils.sql_helpers import escape_like
+
+# List views only show a preview of the description.
+LIST_DESCRIPTION_LENGTH = 300
+
+# Only what ReportListItemResponse needs: no JSONB logs/metadata and no
+# selectin-loaded analysis, which select(Report) would pull for every row.
+REPORT_LIST_COLUMNS = (
+    Report.id,
+    Report.project_id,
+    Report.tracking_id,
+    Report.title,
+    func.substr(Report.description, 1, LIST_DESCRIPTION_LENGTH).label("description"),
+    Report.severity,
+    Report.category,
+    Report.status,
+    Report.assignee_id,
+    Report.reporter_identifier,
+    Report.screenshot_url,  # key only; report_list_items signs the thumbnail URL
+    Report.screenshot_renditions_at,  # thumbnail is only signed once it exists
+    Report.created_at,
+    Report.updated_at,
+)
+
+
+def report_list_item(row: Row | Report) -> ReportListItemResponse:
+    """Build a list item from a REPORT_LIST_COLUMNS row (or a full Report)."""
+    return ReportListItemResponse(
+        id=row.id,
+        project_id=row.project_id,
+        tracking_id=row.tracking_id,
+        title=row.title,
+        description=row.description,
+        severity=row.severity.value if isinstance(row.severity, Severity) else row.severity,
+        category=row.category.value if isinstance(row.category, Category) else row.category,
+        status=row.status.value if isinstance(row.status, Status) else row.status,
+        assignee_id=row.assignee_id,
+        reporter_identifier=row.reporter_identifier,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+    )
+
+
+async def report_list_items(rows: Sequence[Row]) -> list[ReportListItemResponse]:
+    """List items for REPORT_LIST_COLUMNS rows, with their thumbnail URLs signed."""
+    thumbnail_urls = await asyncio.gather(
+        *(generate_variant_url(row.screenshot_url, THUMBNAIL_VARIANT, row.screenshot_renditions_at) for row in rows)
+    )
+    items = [report_list_item(row) for row in rows]
+    for item, thumbnail_url in zip(items, thumbnail_urls):
+        item.screenshot_thumbnail_url = thumbnail_url
+    return items
+
+
+# Generated tsvector over tracking_id, title and description, GIN indexed
+# (migration x5y6z7a8b9c0). Not mapped on the model so ORM writes and the
+# SQLite test schema never see it.
+_SEARCH_VECTOR = literal_column("reports.search_vector")
+SEARCH_CONFIG = "english"
+
+
+def search_prefix_query(search: str) -> str | None:
+    """``to_tsquery`` text matching every word of ``search`` as a prefix, or None if it has no words."""
+    words = re.findall(r"\w+", search)
+    if not words:
+        return None
+    return " & ".join(f"{word}:*" for word in words)
+
+
+def report_search_filter(
+    search: str, *, dialect: str, fallback_columns: tuple[Any, ...]
+) -> tuple[ColumnElement[bool], Any | None]:
+    """Condition matching reports for ``search`` plus an optional rank column.
+
+    On PostgreSQL this uses the full-text index and also returns a labelled
+    ``search_rank`` column for callers that order by relevance. Elsewhere (and
+    for searches with no words) it is a substring ILIKE over
+    ``fallback_columns`` and the rank is None.
+    """
+    ts_query_text = search_prefix_query(search) if dialect == "postgresql" else None
+    if ts_query_text is None:
+        pattern = f"%{escape_like(search)}%"
+        return or_(*(column.ilike(pattern) for column in fallback_columns)), None
+
+    ts_query = func.to_tsquery(SEARCH_CONFIG, ts_query_text)
+    rank = func.ts_rank_cd(_SEARCH_VECTOR, ts_query, type_=Float).label("search_rank")
+    return _SEARCH_VECTOR.op("@@")(ts_query), rank
+
+
+# ---------- Facets ----------
+
+_FACET_COLUMNS = {
+    "status": (Report.status, Status),
+    "severity": (Report.severity, Severity),
+    "category": (Report.category, Category),
+}
+
+
+async def count_report_facets(
+    db: AsyncSession, conditions: list[ColumnElement[bool]]
+) -> ReportFacetsResponse:
+    """Per-status, per-severity and per-category counts for reports matching ``conditions``.
+
+    PostgreSQL computes every facet and the total in a single GROUPING SETS
+    pass; other dialects run the equivalent UNION ALL of GROUP BYs.
+    """
+    dialect = db.bind.dialect.name if db.bind else ""
+    counts: dict[str, dict[str, int]] = {
+        name: {member.value: 0 for member in enum_cls} for name, (_, enum_cls) in _FACET_COLUMNS.items()
+    }
+    total = 0
+
+    if dialect == "postgresql":
+        columns = [column for column, _ in _FACET_COLUMNS.values()]
+        # GROUPING(a, b, c) sets a bit (a is the highest) for each column left
+        # out of the row's grouping set; the empty set (the total) is all ones.
+        all_bits = (1 << len(columns)) - 1
+        facet_by_grouping = {
+            all_bits & ~(1 << (len(columns) - 1 - i)): name for i, name in enumerate(_FACET_COLUMNS)
+        }
+        result = await db.execute(
+            select(*columns, func.grouping(*columns).label("grouping_id"), func.count().label("count"))
+            .where(*conditions)
+            .group_by(func.grouping_sets(*columns, tuple_()))
+        )
+        for row in result.all():
+            name = facet_by_grouping.get(row.grouping_id)
+            if name is None:
+                total = row.count
+            else:
+                counts[name][getattr(row, name).value] = row.count
+    else:
+        parts = [
+            select(literal(name).label("facet"), cast(column, String).label("value"), func.count().label("count"))
+            .where(*conditions)
+            .group_by(column)
+            for name, (column, _) in _FACET_COLUMNS.items()
+        ]
+        parts.append(
+            select(literal("total").label("facet"), literal(None, String).label("value"), func.count().label("count"))
+            .where(*conditions)
+        )
+        result = await db.execute(union_all(*parts))
+        for row in result.all():
+            if row.facet == "total":
+                total = row.count
+            else:
+                counts[row.facet][row.value] = row.count
+
+    return ReportFacetsResponse(total=total, **counts)
@@ -0,0 +1,243 @@
+"""Native-async client for S3-compatible object storage (R2, S3, MinIO).
+
+Requests go over a pooled ``httpx.AsyncClient`` and are signed in-process with
+SigV4 (``app.utils.sigv4``), so storage calls never occupy executor threads.
+Connection errors, throttling and 5xx responses are retried with jittered
+exponential backoff up to ``S3_MAX_ATTEMPTS``. Objects are addressed
+path-style (``{endpoint}/{bucket}/{key}``), which R2, S3 and MinIO all accept.
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import logging
+import random
+import xml.etree.ElementTree as ET
+from collections.abc import AsyncIterator, Callable
+from xml.sax.saxutils import escape
+
+import httpx
+
+from app.config import get_settings
+from app.utils.sigv4 import UNSIGNED_PAYLOAD, canonical_query, presign_url, sign_headers, uri_encode
+
+logger = logging.getLogger(__name__)
+
+_RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+_BACKOFF_BASE_SECONDS = 0.1
+_BACKOFF_MAX_SECONDS = 2.0
+
+
+class S3Error(Exception):
+    """A storage request failed. ``status_code`` is 0 when no response arrived."""
+
+    def __init__(self, status_code: int, code: str, message: str) -> None:
+        super().__init__(f"{code}: {message}")
+        self.status_code = status_code
+        self.code = code
+        self.message = message
+
+    @classmethod
+    def from_response(cls, response: httpx.Response) -> S3Error:
+        code, message = "Unknown", response.reason_phrase
+        try:
+            root = ET.fromstring(response.content)
+            code = root.findtext("Code") or code
+            message = root.findtext("Message") or message
+        except ET.ParseError:
+            pass
+        return cls(response.status_code, code, message)
+
+
+def _region_for(endpoint_url: str) -> str:
+    # Cloudflare R2 is S3-compatible but doesn't use regions
+    return "auto" if "r2.cloudflarestorage.com" in endpoint_url else "us-east-1"
+
+
+class S3Client:
+    def __init__(
+        self,
+        *,
+        endpoint_url: str,
+        bucket: str,
+        access_key: str,
+        secret_key: str,
+        region: str = "",
+        max_connections: int = 50,
+        timeout_seconds: float = 30.0,
+        connect_timeout_seconds: float = 5.0,
+        max_attempts: int = 3,
+    ) -> None:
+        self.endpoint_url = endpoint_url.rstrip("/")
+        self.bucket = bucket
+        self.region = region or _region_for(endpoint_url)
+        self.max_attempts = max(1, max_attempts)
+        self._access_key = access_key
+        self._secret_key = secret_key
+        self._http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=httpx.Timeout(timeout_seconds, connect=connect_timeout_seconds),
+        )
+
+    @classmethod
+    def from_settings(cls) -> S3Client:
+        settings = get_settings()
+        return cls(
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            bucket=settings.S3_BUCKET_NAME,
+            access_key=settings.S3_ACCESS_KEY,
+            secret_key=settings.S3_SECRET_KEY,
+            region=settings.S3_REGION,
+            max_connections=settings.S3_MAX_CONNECTIONS,
+            timeout_seconds=settings.S3_TIMEOUT_SECONDS,
+            connect_timeout_seconds=settings.S3_CONNECT_TIMEOUT_SECONDS,
+            max_attempts=settings.S3_MAX_ATTEMPTS,
+        )
+
+    def object_url(self, key: str = "") -> str:
+        bucket_url = f"{self.endpoint_url}/{uri_encode(self.bucket)}"
+        return f"{bucket_url}/{uri_encode(key, keep_slash=True)}" if key else bucket_url
+
+    def presign_get(self, key: str, expires_in: int) -> str:
+        """Presigned GET URL for ``key``; signed locally, no request is made."""
+        return presign_url(
+            "GET",
+            self.object_url(key),
+            access_key=self._access_key,
+            secret_key=self._secret_key,
+            region=self.region,
+            expires_in=expires_in,
+        )
+
+    def presign_put(self, key: str, expires_in: int, headers: dict[str, str]) -> str:
+        """Presigned PUT URL for ``key``; the upload must send ``headers`` unchanged."""
+        return presign_url(
+            "PUT",
+            self.object_url(key),
+            access_key=self._access_key,
+            secret_key=self._secret_key,
+            region=self.region,
+            expires_in=expires_in,
+            headers=headers,
+        )
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    async def _request(
+        self,
+        method: str,
+        key: str = "",
+        *,
+        params: dict[str, str] | None = None,
+        content: bytes | Callable[[], AsyncIterator[bytes]] = b"",
+        headers: dict[str, str] | None = None,
+    ) -> httpx.Response:
+        """Send a signed request, retrying transient failures.
+
+        A streamed ``content`` is passed as a callable and opened afresh for
+        every attempt, so a retry re-reads the body from the start.
+        """
+        url = self.object_url(key)
+        if params:
+            url = f"{url}?{canonical_query(params)}"
+
+        attempt = 0
+        while True:
+            attempt += 1
+            # Re-signed per attempt so a retry never carries a stale X-Amz-Date
+            signed = sign_headers(
+                method,
+                url,
+                headers or {},
+                access_key=self._access_key,
+                secret_key=self._secret_key,
+                region=self.region,
+                payload_hash=UNSIGNED_PAYLOAD,
+            )
+            try:
+                body = content() if callable(content) else content
+                response = await self._http.request(method, url, content=body, headers=signed)
+            except httpx.TransportError as exc:
+                if attempt == self.max_attempts:
+                    raise S3Error(0, type(exc).__name__, str(exc) or "connection failed") from exc
+                logger.warning("Storage %s %s failed (%s); retrying", method, key, type(exc).__name__)
+            else:
+                if response.status_code < 300:
+                    return response
+                if response.status_code not in _RETRYABLE_STATUS or attempt == self.max_attempts:
+                    raise S3Error.from_response(response)
+                logger.warning("Storage %s %s returned %d; retrying", method, key, response.status_code)
+
+            backoff = min(_BACKOFF_MAX_SECONDS, _BACKOFF_BASE_SECONDS * 2 ** (attempt - 1))
+            await asyncio.sleep(random.uniform(0, backoff))
+
+    async def put_object(self, key: str, body: bytes, content_type: str) -> None:
+        await self._request("PUT", key, content=body, headers={"content-type": content_type})
+
+    async def put_object_stream(
+        self, key: str, open_body: Callable[[], AsyncIterator[bytes]], size: int, content_type: str
+    ) -> None:
+        """PUT ``size`` bytes streamed from ``open_body()`` as a single request.
+
+        The explicit Content-Length avoids chunked encoding, which S3 rejects.
+        """
+        await self._request(
+            "PUT",
+            key,
+            content=open_body,
+            headers={"content-type": content_type, "content-length": str(size)},
+        )
+
+    async def head_object(self, key: str) -> httpx.Headers | None:
+        """Response headers for ``key``, or None if the object doesn't exist."""
+        try:
+            response = await self._request("HEAD", key)
+        except S3Error as e:
+            if e.status_code == 404:
+                return None
+            raise
+        return response.headers
+
+    async def get_object(self, key: str) -> bytes:
+        response = await self._request("GET", key)
+        return response.content
+
+    async def get_object_range(self, key: str, start: int, end: int) -> bytes:
+        """Bytes ``start``..``end`` (inclusive) of ``key``."""
+        response = await self._request("GET", key, headers={"range": f"bytes={start}-{end}"})
+        return response.content
+
+    async def delete_object(self, key: str) -> None:
+        await self._request("DELETE", key)
+
+    async def delete_objects(self, keys: list[str]) -> list[str]:
+        """Batch delete (up to 1000 keys). Returns the keys the bucket failed to delete."""
+        body = (
+            "<Delete><Quiet>true</Quiet>"
+            + "".join(f"<Object><Key>{escape(key)}</Key></Object>" for key in keys)
+            + "</Delete>"
+        ).encode()
+        response = await self._request(
+            "POST",
+            params={"delete": ""},
+            content=body,
+            headers={
+                "content-type": "application/xml",
+                # DeleteObjects requires a body checksum
+                "content-md5": base64.b64encode(hashlib.md5(body, usedforsecurity=False).digest()).decode(),
+            },
+        )
+        failed: list[str] = []
+        if response.content:
+            root = ET.fromstring(response.content)
+            for error in root.iter():
+                if error.tag.endswith("Error"):
+                    failed.extend(
+                        child.text or "" for child in error if child.tag.endswith("Key")
+                    )
+        return failed
@@ -11,6 +11,16 @@ from app.utils.sql_helpers import escape_like
 
 _pg_trgm_cache: bool | None = None
 
+# Columns SimilarReportItem needs; candidate rows never load the JSONB payloads.
+_CANDIDATE_COLUMNS = (
+    Report.id,
+    Report.tracking_id,
+    Report.title,
+    Report.severity,
+    Report.status,
+    Report.created_at,
+)
+
 
 async def _has_pg_trgm(db: AsyncSession) -> bool:
     """Check whether the pg_trgm extension is available (cached after first check)."""
@@ -39,7 +49,8 @@ async def find_similar_reports(
     Uses pg_trgm similarity() on PostgreSQL for trigram-based matching.
     Falls back to LIKE-based search on databases without pg_trgm (e.g. SQLite in tests).
 
-    Returns a list of dicts with keys: report, similarity_score.
+    Returns a list of dicts with keys: report (a row with id, tracking_id, title,
+    severity, status and created_at), similarity_score.
     """
     source_result = await db.execute(select(Report).where(Report.id == report_id))
     source_report = source_result.scalar_one_or_none()
@@ -70,7 +81,7 @@ async def _find_similar_pg_trgm(
     )
 
     query = (
-        select(Report, combined_score)
+        select(*_CANDIDATE_COLUMNS, combined_score)
         .where(
             Report.project_id == project_id,
             Report.id != source.id,
@@ -85,7 +96,7 @@ async def _find_similar_pg_trgm(
     rows = result.all()
 
     return [
-        {"report": row[0], "similarity_score": round(float(row[1]), 3)}
+        {"report": row, "similarity_score": round(float(row.score), 3)}
         for row in rows
     ]
 
@@ -112,7 +123,7 @@ async def _find_similar_fallback(
     from sqlalchemy import or_
 
     query = (
-        select(Report)
+        select(*_CANDIDATE_COLUMNS)
         .where(
             Report.project_id == project_id,
             Report.id != source.id,
@@ -123,9 +134,8 @@ async def _find_similar_fallback(
     )
 
     result = await db.execute(query)
-    reports = result.scalars().all()
 
     return [
-        {"report": report, "similarity_score": 0.5}
-        for report in reports
+        {"report": row, "similarity_score": 0.5}
+        for row in result.all()
     ]
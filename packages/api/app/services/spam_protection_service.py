@@ -1,14 +1,27 @@
 from __future__ import annotations
 
+import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Protocol
 from urllib.parse import urlparse
 
-from sqlalchemy import select
+from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.requests import Request
 
+from app.config import get_settings
 from app.models.report import Report
+from app.utils.fingerprint import fingerprint_range, report_fingerprint, title_digest
+from app.utils.ttl_cache import TTLCache
+
+
+DUPLICATE_WINDOW = timedelta(minutes=5)
+
+# Fingerprints (and title digests) of recent reports, keyed by project. A hit
+# rejects a flood repeat without a query; entries live as long as the window.
+_recent_fingerprints: TTLCache[tuple[str, str], bool] = TTLCache(
+    ttl_seconds=DUPLICATE_WINDOW.total_seconds(), max_size=20_000
+)
 
 
 class _HasDomain(Protocol):
@@ -20,27 +33,122 @@ def check_honeypot(hp_value: str | None) -> bool:
     return bool(hp_value)
 
 
+def _cache_enabled() -> bool:
+    return get_settings().DEDUPE_CACHE_ENABLED
+
+
+def is_recent_duplicate(project_id: str | uuid.UUID, title: str, description: str | None) -> bool:
+    """True if the cache already holds a matching fingerprint for this project."""
+    if not _cache_enabled():
+        return False
+    low, _ = fingerprint_range(title, description)
+    key = low if description else title_digest(low)
+    return (str(project_id), key) in _recent_fingerprints
+
+
+def remember_fingerprint(
+    project_id: str | uuid.UUID, fingerprint: str, created_at: datetime | None = None
+) -> None:
+    """Record an accepted or rejected report so repeats skip the database.
+
+    ``created_at`` is the matching report's creation time when a repeat was
+    rejected; the entry then expires when that report leaves the window
+    instead of a full window from now.
+    """
+    if not _cache_enabled():
+        return
+    ttl = DUPLICATE_WINDOW.total_seconds()
+    if created_at is not None:
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        ttl -= (datetime.now(timezone.utc) - created_at).total_seconds()
+        if ttl <= 0:
+            return
+    _recent_fingerprints.set((str(project_id), fingerprint), True, ttl)
+    _recent_fingerprints.set((str(project_id), title_digest(fingerprint)), True, ttl)
+
+
+def clear_fingerprint_cache() -> None:
+    _recent_fingerprints.clear()
+
+
 async def is_duplicate_report(
     db: AsyncSession,
     project_id: str,
     title: str,
     description: str | None = None,
 ) -> bool:
-    """Returns True if a report with the same title (and description, if provided) exists in the last 5 minutes."""
-    cutoff = datetime.now(timezone.utc) - timedelta(minutes=5)
-    conditions = [
-        Report.project_id == project_id,
-        Report.title == title,
-        Report.created_at >= cutoff,
-    ]
-    if description:
-        conditions.append(Report.description == description)
+    """Returns True if a report with the same title (and description, if provided) exists in the last 5 minutes.
+
+    Checks the in-process cache first, then probes the fingerprint index.
+    """
+    if is_recent_duplicate(project_id, title, description):
+        return True
+
+    cutoff = datetime.now(timezone.utc) - DUPLICATE_WINDOW
+    low, high = fingerprint_range(title, description)
     result = await db.execute(
-        select(Report.id)
-        .where(*conditions)
+        select(Report.fingerprint, Report.created_at)
+        .where(
+            Report.project_id == project_id,
+            Report.fingerprint.between(low, high),
+            Report.created_at >= cutoff,
+        )
+        .order_by(Report.created_at.desc())
         .limit(1)
     )
-    return result.scalar_one_or_none() is not None
+    match = result.one_or_none()
+    if match is None:
+        return False
+    remember_fingerprint(project_id, match.fingerprint, match.created_at)
+    return True
+
+
+async def find_duplicate_reports(
+    db: AsyncSession,
+    project_id: str,
+    candidates: list[tuple[str, str | None]],
+) -> list[bool]:
+    """Batch form of :func:`is_duplicate_report` for a list of (title, description) pairs.
+
+    Runs one fingerprint-index query for all candidates that the cache did not
+    already reject. Repeats within ``candidates`` are also flagged, so only the
+    first of several identical items is treated as new.
+    """
+    if not candidates:
+        return []
+
+    ranges = [fingerprint_range(title, description) for title, description in candidates]
+    cached = [is_recent_duplicate(project_id, title, description) for title, description in candidates]
+
+    seen: set[str] = set()
+    to_probe = [bounds for bounds, hit in zip(ranges, cached) if not hit]
+    if to_probe:
+        cutoff = datetime.now(timezone.utc) - DUPLICATE_WINDOW
+        result = await db.execute(
+            select(Report.fingerprint).where(
+                Report.project_id == project_id,
+                or_(*(Report.fingerprint.between(low, high) for low, high in to_probe)),
+                Report.created_at >= cutoff,
+            )
+        )
+        seen = {fingerprint for fingerprint in result.scalars().all()}
+    seen_titles = {title_digest(fingerprint) for fingerprint in seen}
+
+    flags: list[bool] = []
+    for (title, description), (low, _), hit in zip(candidates, ranges, cached):
+        if hit:
+            is_duplicate = True
+        elif description:
+            is_duplicate = low in seen
+        else:
+            is_duplicate = title_digest(low) in seen_titles
+        flags.append(is_duplicate)
+        if not is_duplicate:
+            fingerprint = report_fingerprint(title, description)
+            seen.add(fingerprint)
+            seen_titles.add(title_digest(fingerprint))
+    return flags
 
 
 def validate_origin(request: Request, project: _HasDomain) -> bool:
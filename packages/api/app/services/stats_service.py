@@ -1,14 +1,41 @@
+"""Dashboard report statistics, read from the ``report_daily_stats`` rollup.
+
+Only "resolved today" still touches ``reports``; it is bounded by today's
+resolutions through ``ix_reports_status_updated``. Routers wrap these calls
+in ``cached_stats`` so parallel dashboard requests share one computation.
+"""
 from __future__ import annotations
 
+import logging
 import uuid
 from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Hashable, TypeVar
 
-from sqlalchemy import case, cast, func, literal, select, Date
+from sqlalchemy import ColumnElement, String, cast, delete, func, insert, literal, select, text, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.project import Project
 from app.models.report import Report, Status
+from app.models.report_daily_stat import ReportDailyStat
 from app.schemas.stats import BugTrend, OverviewStats, ProjectStats
+from app.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+STATS_CACHE_TTL_SECONDS = 10
+
+_stats_cache: TTLCache[Hashable, object] = TTLCache(ttl_seconds=STATS_CACHE_TTL_SECONDS, max_size=1024)
+
+OPEN_STATUSES = (Status.NEW, Status.TRIAGING, Status.IN_PROGRESS)
+DONE_STATUSES = (Status.RESOLVED, Status.CLOSED)
+
+
+def _project_filter(column, user_id: str | None) -> ColumnElement[bool]:
+    if user_id is None:
+        return literal(True)
+    return column.in_(select(Project.id).where(Project.owner_id == user_id))
 
 
 async def get_overview_stats(
@@ -16,139 +43,149 @@ async def get_overview_stats(
     user_id: str | None,
     project_id: uuid.UUID | None = None,
 ) -> OverviewStats:
-    if user_id is not None:
-        project_filter = Report.project_id.in_(
-            select(Project.id).where(Project.owner_id == user_id)
-        )
-    else:
-        project_filter = literal(True)
-
+    stats_filter = _project_filter(ReportDailyStat.project_id, user_id)
+    reports_filter = _project_filter(Report.project_id, user_id)
     if project_id is not None:
-        project_filter = project_filter & (Report.project_id == project_id)
+        stats_filter = stats_filter & (ReportDailyStat.project_id == project_id)
+        reports_filter = reports_filter & (Report.project_id == project_id)
 
     today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
-
+    resolved_today = (
+        select(func.count(Report.id))
+        .where(reports_filter, Report.status == Status.RESOLVED, Report.updated_at >= today_start)
+        .scalar_subquery()
+    )
+    done = ReportDailyStat.status.in_(DONE_STATUSES)
     result = await db.execute(
         select(
-            func.count(Report.id),
-            func.count(Report.id).filter(
-                Report.status.in_([Status.NEW, Status.TRIAGING, Status.IN_PROGRESS])
-            ),
-            func.count(Report.id).filter(
-                Report.status == Status.RESOLVED,
-                Report.updated_at >= today_start,
-            ),
-            func.avg(
-                case(
-                    (
-                        Report.status.in_([Status.RESOLVED, Status.CLOSED]),
-                        (func.extract("epoch", Report.updated_at) - func.extract("epoch", Report.created_at)) / 3600,
-                    ),
-                )
-            ),
-        ).where(project_filter)
+            func.sum(ReportDailyStat.report_count),
+            func.sum(ReportDailyStat.report_count).filter(ReportDailyStat.status.in_(OPEN_STATUSES)),
+            func.sum(ReportDailyStat.resolution_seconds).filter(done),
+            func.sum(ReportDailyStat.report_count).filter(done),
+            resolved_today,
+        ).where(stats_filter)
     )
-    row = result.one()
+    total, open_count, done_seconds, done_count, resolved_today_count = result.one()
+
+    avg_resolution_hours = (done_seconds or 0) / done_count / 3600 if done_count else 0
 
     return OverviewStats(
-        total_bugs=row[0] or 0,
-        open_bugs=row[1] or 0,
-        resolved_today=row[2] or 0,
-        avg_resolution_hours=round(row[3] or 0, 1),
+        total_bugs=total or 0,
+        open_bugs=open_count or 0,
+        resolved_today=resolved_today_count or 0,
+        avg_resolution_hours=round(avg_resolution_hours, 1),
     )
 
 
-async def get_project_stats(db: AsyncSession, project_id: str) -> ProjectStats:
-    severity_result = await db.execute(
-        select(Report.severity, func.count(Report.id))
-        .where(Report.project_id == project_id)
-        .group_by(Report.severity)
-    )
-    bugs_by_severity = {row[0].value: row[1] for row in severity_result.all()}
-
-    status_result = await db.execute(
-        select(Report.status, func.count(Report.id))
-        .where(Report.project_id == project_id)
-        .group_by(Report.status)
-    )
-    bugs_by_status = {row[0].value: row[1] for row in status_result.all()}
+async def _project_stats(
+    db: AsyncSession, stats_filter: ColumnElement[bool], days: int = 30
+) -> ProjectStats:
+    """Severity and status breakdowns plus the daily trend, in one statement."""
+    start_day = (datetime.now(timezone.utc) - timedelta(days=days)).date()
+    count = func.sum(ReportDailyStat.report_count).label("count")
+    parts = [
+        select(literal(facet).label("facet"), cast(column, String).label("value"), count)
+        .where(stats_filter, *extra)
+        .group_by(column)
+        .having(func.sum(ReportDailyStat.report_count) > 0)
+        for facet, column, extra in (
+            ("severity", ReportDailyStat.severity, ()),
+            ("status", ReportDailyStat.status, ()),
+            ("day", ReportDailyStat.day, (ReportDailyStat.day >= start_day,)),
+        )
+    ]
+    result = await db.execute(union_all(*parts))
 
-    bugs_by_day = await get_bug_trends(db, project_id, days=30)
+    facets: dict[str, dict[str, int]] = {"severity": {}, "status": {}, "day": {}}
+    for row in result.all():
+        facets[row.facet][row.value] = row.count
 
     return ProjectStats(
-        bugs_by_severity=bugs_by_severity,
-        bugs_by_status=bugs_by_status,
-        bugs_by_day=bugs_by_day,
+        bugs_by_severity=facets["severity"],
+        bugs_by_status=facets["status"],
+        bugs_by_day=[BugTrend(date=day, count=n) for day, n in sorted(facets["day"].items())],
     )
 
 
+async def get_project_stats(db: AsyncSession, project_id: str) -> ProjectStats:
+    return await _project_stats(db, ReportDailyStat.project_id == uuid.UUID(str(project_id)))
+
+
 async def get_aggregated_project_stats(
     db: AsyncSession, user_id: str | None
 ) -> ProjectStats:
-    if user_id is not None:
-        project_filter = Report.project_id.in_(
-            select(Project.id).where(Project.owner_id == user_id)
-        )
-    else:
-        project_filter = literal(True)
-
-    severity_result = await db.execute(
-        select(Report.severity, func.count(Report.id))
-        .where(project_filter)
-        .group_by(Report.severity)
-    )
-    bugs_by_severity = {row[0].value: row[1] for row in severity_result.all()}
-
-    status_result = await db.execute(
-        select(Report.status, func.count(Report.id))
-        .where(project_filter)
-        .group_by(Report.status)
-    )
-    bugs_by_status = {row[0].value: row[1] for row in status_result.all()}
-
-    bugs_by_day = await get_bug_trends_all(db, user_id, days=30)
-
-    return ProjectStats(
-        bugs_by_severity=bugs_by_severity,
-        bugs_by_status=bugs_by_status,
-        bugs_by_day=bugs_by_day,
-    )
+    return await _project_stats(db, _project_filter(ReportDailyStat.project_id, user_id))
 
 
 async def get_bug_trends(
     db: AsyncSession, project_id: str, days: int = 30
 ) -> list[BugTrend]:
-    start_date = datetime.now(timezone.utc) - timedelta(days=days)
-    date_col = cast(Report.created_at, Date)
-
-    result = await db.execute(
-        select(date_col, func.count(Report.id))
-        .where(Report.project_id == project_id, Report.created_at >= start_date)
-        .group_by(date_col)
-        .order_by(date_col)
-    )
-
-    return [BugTrend(date=str(row[0]), count=row[1]) for row in result.all()]
+    stats = await _project_stats(db, ReportDailyStat.project_id == uuid.UUID(str(project_id)), days)
+    return stats.bugs_by_day
 
 
 async def get_bug_trends_all(
     db: AsyncSession, user_id: str | None, days: int = 30
 ) -> list[BugTrend]:
-    start_date = datetime.now(timezone.utc) - timedelta(days=days)
-    date_col = cast(Report.created_at, Date)
+    stats = await _project_stats(db, _project_filter(ReportDailyStat.project_id, user_id), days)
+    return stats.bugs_by_day
 
-    if user_id is not None:
-        project_filter = Report.project_id.in_(
-            select(Project.id).where(Project.owner_id == user_id)
-        )
+
+async def cached_stats(key: Hashable, load: Callable[[], Awaitable[T]]) -> T:
+    """Serve ``load()`` from a short-lived cache, sharing one computation
+    between concurrent identical requests (the dashboard fires these per tab)."""
+    return await _stats_cache.get_or_load(key, load)
+
+
+def clear_stats_cache() -> None:
+    _stats_cache.clear()
+
+
+async def rebuild_report_daily_stats(db: AsyncSession, project_id: uuid.UUID | None = None) -> int:
+    """Recompute ``report_daily_stats`` from ``reports`` (all projects, or one).
+
+    On PostgreSQL, report writes are blocked until the rebuild commits so that
+    no trigger delta lands between the delete and the re-insert. Returns the
+    number of rollup rows written.
+    """
+    dialect_name = db.bind.dialect.name if db.bind else ""
+    if dialect_name == "postgresql":
+        await db.execute(text("LOCK TABLE reports IN SHARE MODE"))
+        day = func.date(func.timezone("UTC", Report.created_at))
+        seconds = func.extract("epoch", Report.updated_at - Report.created_at)
     else:
-        project_filter = literal(True)
+        day = func.date(Report.created_at)
+        seconds = (func.julianday(Report.updated_at) - func.julianday(Report.created_at)) * 86400
+
+    clear = delete(ReportDailyStat)
+    source = select(
+        Report.project_id,
+        day,
+        Report.severity,
+        Report.status,
+        Report.category,
+        func.count(),
+        func.sum(seconds),
+    ).group_by(Report.project_id, day, Report.severity, Report.status, Report.category)
+    if project_id is not None:
+        clear = clear.where(ReportDailyStat.project_id == project_id)
+        source = source.where(Report.project_id == project_id)
 
+    await db.execute(clear)
     result = await db.execute(
-        select(date_col, func.count(Report.id))
-        .where(project_filter, Report.created_at >= start_date)
-        .group_by(date_col)
-        .order_by(date_col)
+        insert(ReportDailyStat).from_select(
+            [
+                ReportDailyStat.project_id,
+                ReportDailyStat.day,
+                ReportDailyStat.severity,
+                ReportDailyStat.status,
+                ReportDailyStat.category,
+                ReportDailyStat.report_count,
+                ReportDailyStat.resolution_seconds,
+            ],
+            source,
+        )
     )
-
-    return [BugTrend(date=str(row[0]), count=row[1]) for row in result.all()]
+    await db.commit()
+    logger.info("Rebuilt %d report_daily_stats row(s)", result.rowcount)
+    return result.rowcount
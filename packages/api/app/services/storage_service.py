@@ -3,15 +3,14 @@ from __future__ import annotations
 import asyncio
 import logging
 import re
-import threading
 import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, Protocol
 
-import boto3
-from botocore.config import Config as BotoConfig
-from botocore.exceptions import ClientError
-
-from app.config import get_settings
 from app.exceptions import BadRequestException
+from app.services.s3_client import S3Client, S3Error
+from app.utils.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +25,8 @@ _CONTENT_TYPE_TO_EXT: dict[str, str] = {
     "image/webp": "webp",
 }
 
+_EXT_TO_CONTENT_TYPE = {ext: content_type for content_type, ext in _CONTENT_TYPE_TO_EXT.items()}
+
 # Magic-byte signatures for validating actual file content vs declared content-type
 _MAGIC_SIGNATURES: list[tuple[bytes, str]] = [
     (b"\x89PNG", "image/png"),
@@ -35,8 +36,43 @@ _MAGIC_SIGNATURES: list[tuple[bytes, str]] = [
 _WEBP_RIFF = b"RIFF"
 _WEBP_MARKER = b"WEBP"
 
-_s3_client = None
-_s3_client_lock = threading.Lock()
+# Streamed uploads are read from the spooled file this much at a time
+STREAM_CHUNK_SIZE_BYTES = 64 * 1024
+
+# WebP renditions the image pipeline writes next to each upload
+# (app.services.image_processing_service)
+THUMBNAIL_VARIANT = "thumb"
+OPTIMIZED_VARIANT = "opt"
+
+# How long a widget has to PUT a screenshot after asking for an upload URL
+DIRECT_UPLOAD_EXPIRES_SECONDS = 300
+
+# S3 and R2 accept at most this many keys per DeleteObjects request
+DELETE_BATCH_SIZE = 1000
+
+_s3_client: S3Client | None = None
+_s3_client_loop: asyncio.AbstractEventLoop | None = None
+
+# Presigned URLs are reused until this long before they expire, so a client
+# that receives a cached URL still has at least this much time to fetch it.
+PRESIGN_REFRESH_MARGIN_SECONDS = 120
+_presigned_url_cache: TTLCache[tuple[str, int], str] = TTLCache(ttl_seconds=0, max_size=10_000)
+
+
+def _validate_content_type(content_type: str) -> None:
+    if content_type not in ALLOWED_CONTENT_TYPES:
+        raise BadRequestException(
+            f"Invalid file type '{content_type}'. Allowed: {', '.join(ALLOWED_CONTENT_TYPES)}"
+        )
+
+
+def _file_too_large() -> BadRequestException:
+    return BadRequestException(f"File exceeds maximum size of {MAX_FILE_SIZE_BYTES // (1024 * 1024)}MB")
+
+
+def _new_object_key(content_type: str, owner_id: str, project_id: str) -> str:
+    extension = _CONTENT_TYPE_TO_EXT.get(content_type, "png")
+    return f"{owner_id}/{project_id}/{uuid.uuid4()}.{extension}"
 
 
 def _validate_magic_bytes(file_content: bytes, declared_content_type: str) -> None:
@@ -60,29 +96,26 @@ def _validate_magic_bytes(file_content: bytes, declared_content_type: str) -> No
             )
 
 
-def _get_s3_client():
-    global _s3_client
-    if _s3_client is not None:
-        return _s3_client
-    with _s3_client_lock:
-        if _s3_client is not None:
-            return _s3_client
-        settings = get_settings()
-        # Cloudflare R2 is S3-compatible but doesn't use regions
-        # Set region_name to 'auto' or 'us-east-1' for R2 compatibility
-        region_name = "auto" if "r2.cloudflarestorage.com" in settings.S3_ENDPOINT_URL else None
-        _s3_client = boto3.client(
-            "s3",
-            endpoint_url=settings.S3_ENDPOINT_URL,
-            aws_access_key_id=settings.S3_ACCESS_KEY,
-            aws_secret_access_key=settings.S3_SECRET_KEY,
-            region_name=region_name,
-            config=BotoConfig(signature_version="s3v4"),
-        )
+def _get_s3_client() -> S3Client:
+    """The pooled async storage client for the running event loop."""
+    global _s3_client, _s3_client_loop
+    loop = asyncio.get_running_loop()
+    if _s3_client is None or _s3_client_loop is not loop:
+        # Pooled connections belong to the loop that opened them
+        _s3_client = S3Client.from_settings()
+        _s3_client_loop = loop
         logger.info("Initialized S3/R2 client")
     return _s3_client
 
 
+async def close_s3_client() -> None:
+    global _s3_client, _s3_client_loop
+    if _s3_client is not None:
+        await _s3_client.aclose()
+    _s3_client = None
+    _s3_client_loop = None
+
+
 async def upload_file(
     file_content: bytes,
     content_type: str,
@@ -93,34 +126,19 @@ async def upload_file(
 
     Storage path follows: {owner_id}/{project_id}/{uuid}.{ext}
     """
-    if content_type not in ALLOWED_CONTENT_TYPES:
-        raise BadRequestException(
-            f"Invalid file type '{content_type}'. Allowed: {', '.join(ALLOWED_CONTENT_TYPES)}"
-        )
-
+    _validate_content_type(content_type)
     _validate_magic_bytes(file_content, content_type)
 
     if len(file_content) > MAX_FILE_SIZE_BYTES:
-        raise BadRequestException(f"File exceeds maximum size of {MAX_FILE_SIZE_BYTES // (1024 * 1024)}MB")
+        raise _file_too_large()
 
-    settings = get_settings()
-    extension = _CONTENT_TYPE_TO_EXT.get(content_type, "png")
-    object_key = f"{owner_id}/{project_id}/{uuid.uuid4()}.{extension}"
+    object_key = _new_object_key(content_type, owner_id, project_id)
 
-    client = _get_s3_client()
     try:
-        await asyncio.to_thread(
-            client.put_object,
-            Bucket=settings.S3_BUCKET_NAME,
-            Key=object_key,
-            Body=file_content,
-            ContentType=content_type,
-        )
+        await _get_s3_client().put_object(object_key, file_content, content_type)
         logger.info("Successfully uploaded file: %s", object_key)
-    except ClientError as e:
-        error_code = e.response.get("Error", {}).get("Code", "Unknown")
-        error_message = e.response.get("Error", {}).get("Message", str(e))
-        logger.error("Failed to upload file to S3/R2: %s - %s", error_code, error_message)
+    except S3Error as e:
+        logger.error("Failed to upload file to S3/R2: %s - %s", e.code, e.message)
         raise BadRequestException("Failed to upload file to storage")
     except Exception as e:
         logger.exception("Unexpected error uploading file to S3/R2: %s", e)
@@ -129,6 +147,138 @@ async def upload_file(
     return object_key
 
 
+class _SpooledFile(Protocol):
+    """A request body already held locally, such as Starlette's ``UploadFile``."""
+
+    size: int | None
+
+    async def read(self, size: int = -1) -> bytes: ...
+
+    async def seek(self, offset: int) -> None: ...
+
+
+async def _spooled_size(file: _SpooledFile) -> int:
+    if file.size is not None:
+        return file.size
+    await file.seek(0)
+    size = 0
+    while chunk := await file.read(STREAM_CHUNK_SIZE_BYTES):
+        size += len(chunk)
+    return size
+
+
+async def upload_stream(
+    file: _SpooledFile,
+    content_type: str,
+    owner_id: str,
+    project_id: str,
+) -> str:
+    """Stream an already-spooled upload to S3 and return the object key.
+
+    Like ``upload_file``, but the body goes up as one PUT read from ``file``
+    in chunks with an explicit Content-Length, so it is never held in memory.
+    Size and magic bytes are checked before anything is sent; a retried PUT
+    rewinds the file and reads it again.
+    """
+    _validate_content_type(content_type)
+    size = await _spooled_size(file)
+    if size > MAX_FILE_SIZE_BYTES:
+        raise _file_too_large()
+    await file.seek(0)
+    _validate_magic_bytes(await file.read(12), content_type)
+    object_key = _new_object_key(content_type, owner_id, project_id)
+
+    async def _open_body() -> AsyncIterator[bytes]:
+        await file.seek(0)
+        while chunk := await file.read(STREAM_CHUNK_SIZE_BYTES):
+            yield chunk
+
+    try:
+        await _get_s3_client().put_object_stream(object_key, _open_body, size, content_type)
+        logger.info("Successfully uploaded file: %s (%d bytes)", object_key, size)
+    except S3Error as e:
+        logger.error("Failed to upload file to S3/R2: %s - %s", e.code, e.message)
+        raise BadRequestException("Failed to upload file to storage")
+    except Exception as e:
+        logger.exception("Unexpected error uploading file to S3/R2: %s", e)
+        raise BadRequestException("Failed to upload file to storage")
+
+    return object_key
+
+
+@dataclass(frozen=True)
+class DirectUpload:
+    key: str
+    url: str
+    headers: dict[str, str]  # must be sent unchanged with the PUT
+    expires_in: int
+
+
+async def create_direct_upload(
+    content_type: str,
+    size: int,
+    owner_id: str,
+    project_id: str,
+) -> DirectUpload:
+    """Presign a PUT so the client uploads straight to the bucket.
+
+    Content-Type and Content-Length are part of the signature, so the bucket
+    rejects an upload of any other type or size. Browsers set Content-Length
+    from the body themselves, so only Content-Type is returned to send.
+    """
+    _validate_content_type(content_type)
+    if size < 12:
+        raise BadRequestException("File is too small to be a valid image")
+    if size > MAX_FILE_SIZE_BYTES:
+        raise _file_too_large()
+
+    object_key = _new_object_key(content_type, owner_id, project_id)
+    try:
+        url = _get_s3_client().presign_put(
+            object_key,
+            DIRECT_UPLOAD_EXPIRES_SECONDS,
+            {"content-type": content_type, "content-length": str(size)},
+        )
+    except Exception as e:
+        logger.exception("Unexpected error generating upload URL: %s", e)
+        raise BadRequestException("Failed to generate upload URL")
+
+    return DirectUpload(
+        key=object_key,
+        url=url,
+        headers={"Content-Type": content_type},
+        expires_in=DIRECT_UPLOAD_EXPIRES_SECONDS,
+    )
+
+
+async def verify_direct_upload(key: str) -> None:
+    """Check a directly uploaded object exists and is the image its key claims.
+
+    Only a HEAD and the first 12 bytes are fetched. Objects that fail the
+    check are deleted.
+    """
+    content_type = _EXT_TO_CONTENT_TYPE.get(key.rsplit(".", 1)[-1], "")
+    client = _get_s3_client()
+    try:
+        headers = await client.head_object(key)
+        if headers is None:
+            raise BadRequestException("Uploaded file not found")
+        size = int(headers.get("content-length", 0))
+        head = await client.get_object_range(key, 0, 11) if size >= 12 else b""
+    except S3Error as e:
+        logger.error("Failed to verify upload in S3/R2: %s - %s. Key: %s", e.code, e.message, key)
+        raise BadRequestException("Failed to verify uploaded file")
+
+    try:
+        _validate_content_type(content_type)
+        if size > MAX_FILE_SIZE_BYTES:
+            raise _file_too_large()
+        _validate_magic_bytes(head, content_type)
+    except BadRequestException:
+        await delete_file(key)
+        raise
+
+
 # Matches both new ({owner}/{project}/{uuid}.ext) and legacy (screenshots/{uuid}.ext) paths
 _VALID_KEY_PATTERN = re.compile(
     r"^(?:[0-9a-f-]{36}/[0-9a-f-]{36}/|screenshots/)[0-9a-f-]{36}\.\w{1,5}$"
@@ -140,6 +290,30 @@ def validate_object_key(key: str) -> bool:
     return bool(_VALID_KEY_PATTERN.match(key))
 
 
+def variant_key(key: str, variant: str) -> str:
+    """Key of a derived rendition: ``a/b/<uuid>.png`` -> ``a/b/<uuid>.thumb.webp``."""
+    return f"{key.rsplit('.', 1)[0]}.{variant}.webp"
+
+
+def with_variant_keys(keys: list[str]) -> list[str]:
+    """``keys`` plus the derived renditions of every upload-generated key among them."""
+    expanded = list(keys)
+    for key in keys:
+        if validate_object_key(key):
+            expanded.extend(variant_key(key, variant) for variant in (THUMBNAIL_VARIANT, OPTIMIZED_VARIANT))
+    return expanded
+
+
+async def download_file(key: str) -> bytes:
+    """Fetch a whole object. Raises ``S3Error``; for background work, not requests."""
+    return await _get_s3_client().get_object(key)
+
+
+async def store_variant(key: str, variant: str, data: bytes) -> None:
+    """Write a WebP rendition of ``key``. Raises ``S3Error``."""
+    await _get_s3_client().put_object(variant_key(key, variant), data, "image/webp")
+
+
 def _is_object_key(value: str) -> bool:
     """Check if a value is an S3 object key (not a full URL)."""
     return bool(value) and not value.startswith("http://") and not value.startswith("https://")
@@ -150,19 +324,11 @@ async def delete_file(key: str) -> None:
     if not _is_object_key(key):
         return
 
-    settings = get_settings()
-    client = _get_s3_client()
     try:
-        await asyncio.to_thread(
-            client.delete_object,
-            Bucket=settings.S3_BUCKET_NAME,
-            Key=key,
-        )
+        await _get_s3_client().delete_object(key)
         logger.info("Deleted file from R2: %s", key)
-    except ClientError as e:
-        error_code = e.response.get("Error", {}).get("Code", "Unknown")
-        error_message = e.response.get("Error", {}).get("Message", str(e))
-        logger.error("Failed to delete file from R2: %s - %s. Key: %s", error_code, error_message, key)
+    except S3Error as e:
+        logger.error("Failed to delete file from R2: %s - %s. Key: %s", e.code, e.message, key)
     except Exception as e:
         logger.exception("Unexpected error deleting file from R2: %s", e)
 
@@ -170,51 +336,54 @@ async def delete_file(key: str) -> None:
 async def delete_files(keys: list[str]) -> None:
     """Delete multiple files from S3/R2. Skips empty keys and full URLs."""
     valid_keys = [k for k in keys if _is_object_key(k)]
-    if not valid_keys:
-        return
+    for start in range(0, len(valid_keys), DELETE_BATCH_SIZE):
+        await _delete_batch(valid_keys[start : start + DELETE_BATCH_SIZE])
 
-    settings = get_settings()
-    client = _get_s3_client()
 
-    # R2 supports batch delete (up to 1000 objects per request)
-    objects = [{"Key": k} for k in valid_keys]
+async def _delete_batch(keys: list[str]) -> None:
     try:
-        await asyncio.to_thread(
-            client.delete_objects,
-            Bucket=settings.S3_BUCKET_NAME,
-            Delete={"Objects": objects, "Quiet": True},
-        )
-        logger.info("Batch deleted %d files from R2", len(valid_keys))
-    except ClientError as e:
-        error_code = e.response.get("Error", {}).get("Code", "Unknown")
-        error_message = e.response.get("Error", {}).get("Message", str(e))
-        logger.error("Failed to batch delete from R2: %s - %s", error_code, error_message)
+        failed = await _get_s3_client().delete_objects(keys)
+        if failed:
+            logger.error("Batch delete left %d file(s) in R2: %s", len(failed), failed)
+        logger.info("Batch deleted %d files from R2", len(keys) - len(failed))
+    except S3Error as e:
+        logger.error("Failed to batch delete from R2: %s - %s", e.code, e.message)
         # Fall back to individual deletes
-        for key in valid_keys:
+        for key in keys:
             await delete_file(key)
     except Exception as e:
         logger.exception("Unexpected error batch deleting from R2: %s", e)
-        for key in valid_keys:
+        for key in keys:
             await delete_file(key)
 
 
 async def generate_presigned_url(key: str, expires_in: int = 900) -> str:
-    """Generate a presigned URL for an S3 object key."""
-    settings = get_settings()
-    client = _get_s3_client()
-    try:
-        url = await asyncio.to_thread(
-            client.generate_presigned_url,
-            "get_object",
-            Params={"Bucket": settings.S3_BUCKET_NAME, "Key": key},
-            ExpiresIn=expires_in,
-        )
+    """Generate a presigned URL for an S3 object key.
+
+    Signed in-process (no network or thread hop) and cached until shortly
+    before expiry, so repeated renders of the same report reuse one URL.
+    """
+    cache_key = (key, expires_in)
+    url = _presigned_url_cache.get(cache_key)
+    if url is not None:
         return url
-    except ClientError as e:
-        error_code = e.response.get("Error", {}).get("Code", "Unknown")
-        error_message = e.response.get("Error", {}).get("Message", str(e))
-        logger.error("Failed to generate presigned URL: %s - %s", error_code, error_message)
-        raise BadRequestException("Failed to generate file URL")
+    try:
+        url = _get_s3_client().presign_get(key, expires_in)
     except Exception as e:
         logger.exception("Unexpected error generating presigned URL: %s", e)
         raise BadRequestException("Failed to generate file URL")
+    reuse_for = expires_in - PRESIGN_REFRESH_MARGIN_SECONDS
+    if reuse_for > 0:
+        _presigned_url_cache.set(cache_key, url, ttl_seconds=reuse_for)
+    return url
+
+
+async def generate_variant_url(key: str | None, variant: str, renditions_at: datetime | None) -> str | None:
+    """Presigned URL of an image-pipeline rendition, once the pipeline has stored it."""
+    if not key or renditions_at is None or not validate_object_key(key):
+        return None
+    return await generate_presigned_url(variant_key(key, variant))
+
+
+def clear_presigned_url_cache() -> None:
+    _presigned_url_cache.clear()
@@ -18,6 +18,7 @@ POLL_INTERVAL_SECONDS = 10
 BASE_RETRY_DELAY_SECONDS = 30
 TASK_TTL_DAYS = 7
 STUCK_TASK_TIMEOUT_SECONDS = 300
+USAGE_RECONCILE_INTERVAL_ITERATIONS = 360  # ~1 hour at 10s intervals
 
 TaskHandler = Callable[[dict], Coroutine[None, None, None]]
 
@@ -184,16 +185,46 @@ async def cleanup_expired_device_sessions() -> int:
         return deleted_count
 
 
+async def cleanup_console_log_usage() -> int:
+    """Delete per-day console-log counters that no quota check reads anymore."""
+    from app.services.console_log_quota_service import cleanup_old_console_log_usage
+
+    async with async_session() as db:
+        return await cleanup_old_console_log_usage(db)
+
+
+async def reconcile_usage() -> int:
+    """Repair drift between ``usage_counters`` and the ``reports`` table."""
+    from app.services.usage_counter_service import reconcile_usage_counters
+
+    async with async_session() as db:
+        return await reconcile_usage_counters(db)
+
+
+async def flush_pat_usage(force: bool = False) -> int:
+    """Write coalesced personal-access-token ``last_used_at`` times."""
+    from app.services.pat_usage_service import pat_usage_tracker
+
+    async with async_session() as db:
+        return await pat_usage_tracker.flush(db, force=force)
+
+
 async def start_task_processor() -> None:
     """Infinite polling loop that processes pending background tasks."""
     logger.info("Background task processor started (polling every %ds)", POLL_INTERVAL_SECONDS)
     cleanup_counter = 0
+    reconcile_counter = 0
     while True:
         try:
             count = await process_pending_tasks()
             if count > 0:
                 logger.info("Processed %d background tasks", count)
 
+            try:
+                await flush_pat_usage()
+            except Exception as exc:
+                logger.error("PAT last-used flush failed: %s", exc)
+
             # Run cleanup every ~100 iterations (~17 minutes at 10s intervals)
             cleanup_counter += 1
             if cleanup_counter >= 100:
@@ -206,6 +237,19 @@ async def start_task_processor() -> None:
                     await cleanup_expired_device_sessions()
                 except Exception as exc:
                     logger.error("Device session cleanup failed: %s", exc)
+
+                try:
+                    await cleanup_console_log_usage()
+                except Exception as exc:
+                    logger.error("Console log usage cleanup failed: %s", exc)
+
+            reconcile_counter += 1
+            if reconcile_counter >= USAGE_RECONCILE_INTERVAL_ITERATIONS:
+                reconcile_counter = 0
+                try:
+                    await reconcile_usage()
+                except Exception as exc:
+                    logger.error("Usage counter reconcile failed: %s", exc)
         except Exception as exc:
             logger.error("Task processor error: %s", exc)
         await asyncio.sleep(POLL_INTERVAL_SECONDS)
@@ -14,6 +14,7 @@ from app.models.project import Project
 from app.models.project_member import ProjectMember
 from app.models.user import User
 from app.services.email_service import send_email
+from app.services.project_access_service import invalidate_user_access
 
 logger = logging.getLogger(__name__)
 
@@ -73,6 +74,7 @@ async def invite_member(
     )
     db.add(member)
     await db.commit()
+    invalidate_user_access(member.user_id)
     await db.refresh(member)
 
     # Send invitation email
@@ -131,6 +133,7 @@ async def accept_invite(
     member.invite_token = None
     member.invite_accepted_at = datetime.now(timezone.utc)
     await db.commit()
+    invalidate_user_access(user.id)
     await db.refresh(member)
 
     logger.info("User %s accepted invite to project %s", user.id, member.project_id)
@@ -182,8 +185,10 @@ async def remove_member(
     if member is None:
         raise NotFoundException(translate("team.member_not_found", locale))
 
+    removed_user_id = member.user_id
     await db.delete(member)
     await db.commit()
+    invalidate_user_access(removed_user_id)
 
 
 async def is_project_admin(
@@ -1,18 +1,125 @@
 from __future__ import annotations
 
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession
-
-
-async def generate_tracking_id(db: AsyncSession, project_id: str) -> str:
-    result = await db.execute(
-        text(
-            "UPDATE projects "
-            "SET report_counter = report_counter + 1 "
-            "WHERE id = :project_id "
-            "RETURNING report_counter"
-        ),
-        {"project_id": project_id},
-    )
-    next_number = result.scalar_one()
-    return f"BUG-{next_number:04d}"
+import time
+import uuid
+from dataclasses import dataclass
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.models.project import Project
+from app.utils.ttl_cache import TTLCache
+
+# Block sizes grow while a project keeps exhausting its block quickly, so quiet
+# projects number contiguously and busy ones rarely touch the projects row.
+MIN_BLOCK_SIZE = 1
+MAX_BLOCK_SIZE = 64
+BLOCK_GROWTH_WINDOW_SECONDS = 60.0
+
+
+def format_tracking_id(number: int) -> str:
+    return f"BUG-{number:04d}"
+
+
+@dataclass
+class _Block:
+    next_number: int
+    last_number: int
+    size: int
+    reserved_at: float
+
+
+class TrackingIdAllocator:
+    """Hi/lo allocator handing out per-project tracking numbers from memory.
+
+    Each worker reserves a block by bumping ``projects.report_counter`` in its
+    own short transaction, then serves numbers from that block without touching
+    the database. Numbers are unique and increase within a worker, but workers
+    hold different blocks, so across workers they follow block order rather
+    than creation order. Numbers left in a block when the worker exits, or
+    taken by a rejected report, are skipped, so gaps are expected.
+    """
+
+    def __init__(self, min_block_size: int = MIN_BLOCK_SIZE, max_block_size: int = MAX_BLOCK_SIZE) -> None:
+        self.min_block_size = min_block_size
+        self.max_block_size = max_block_size
+        self._blocks: TTLCache[uuid.UUID, _Block] = TTLCache(ttl_seconds=3600, max_size=10_000)
+
+    def clear(self) -> None:
+        self._blocks.clear()
+
+    def _take(self, project_id: uuid.UUID, count: int) -> list[int]:
+        block = self._blocks.get(project_id)
+        if block is None:
+            return []
+        end = min(block.next_number + count, block.last_number + 1)
+        numbers = list(range(block.next_number, end))
+        block.next_number = end
+        return numbers
+
+    def _next_size(self, project_id: uuid.UUID, needed: int) -> int:
+        previous = self._blocks.get(project_id)
+        size = self.min_block_size
+        if previous is not None and time.monotonic() - previous.reserved_at < BLOCK_GROWTH_WINDOW_SECONDS:
+            size = min(previous.size * 2, self.max_block_size)
+        return max(size, needed)
+
+    async def _reserve_block(self, bind: AsyncEngine, project_id: uuid.UUID, size: int) -> int:
+        """Bump the project's counter by ``size`` and return the block's last number.
+
+        Runs and commits in a session of its own, so the caller's transaction
+        never holds the projects row lock.
+        """
+        async with AsyncSession(bind) as session:
+            result = await session.execute(
+                update(Project)
+                .where(Project.id == project_id)
+                .values(report_counter=Project.report_counter + size)
+                .returning(Project.report_counter)
+            )
+            last_number = result.scalar_one()
+            await session.commit()
+        return last_number
+
+    async def allocate(self, db: AsyncSession, project_id: uuid.UUID, count: int = 1) -> list[int]:
+        """Return ``count`` increasing tracking numbers for the project.
+
+        ``db`` only supplies the engine; a block refill commits separately and
+        leaves the caller's transaction untouched.
+        """
+        numbers = self._take(project_id, count)
+        missing = count - len(numbers)
+        if missing <= 0:
+            return numbers
+
+        size = self._next_size(project_id, missing)
+        last_number = await self._reserve_block(db.bind, project_id, size)
+
+        first_number = last_number - size + 1
+        numbers.extend(range(first_number, first_number + missing))
+
+        # A concurrent refill may already have stored a later block; keep that one
+        current = self._blocks.get(project_id)
+        if current is None or last_number > current.last_number:
+            self._blocks.set(
+                project_id,
+                _Block(first_number + missing, last_number, size, time.monotonic()),
+            )
+        return numbers
+
+
+tracking_id_allocator = TrackingIdAllocator()
+
+
+async def generate_tracking_id(db: AsyncSession, project_id: str | uuid.UUID) -> str:
+    """Next tracking ID for the project (see TrackingIdAllocator for ordering and gaps)."""
+    (number,) = await tracking_id_allocator.allocate(db, uuid.UUID(str(project_id)))
+    return format_tracking_id(number)
+
+
+async def generate_tracking_ids(db: AsyncSession, project_id: str | uuid.UUID, count: int) -> list[str]:
+    """``count`` increasing tracking IDs for the project."""
+    if count <= 0:
+        return []
+    numbers = await tracking_id_allocator.allocate(db, uuid.UUID(str(project_id)), count)
+    return [format_tracking_id(n) for n in numbers]
@@ -0,0 +1,146 @@
+"""Read and reconcile the trigger-maintained ``usage_counters`` table.
+
+Every counter is spread over shard rows, so reads sum ``report_count`` per
+(owner, project, period).
+"""
+from __future__ import annotations
+
+import logging
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.project import Project
+from app.models.report import Report
+from app.models.usage_counter import TOTAL_PERIOD, UsageCounter
+
+logger = logging.getLogger(__name__)
+
+# Advisory lock held by whichever worker is reconciling; the others skip the run
+_RECONCILE_LOCK_KEY = 0x75736167
+
+
+def month_period(moment: datetime | None = None) -> str:
+    """Counter period key ("YYYY-MM") for a UTC timestamp, defaulting to now."""
+    moment = moment or datetime.now(timezone.utc)
+    return moment.strftime("%Y-%m")
+
+
+async def get_project_report_count(db: AsyncSession, project_id: uuid.UUID) -> int:
+    """Lifetime report count for one project."""
+    result = await db.execute(
+        select(func.sum(UsageCounter.report_count)).where(
+            UsageCounter.project_id == project_id,
+            UsageCounter.period == TOTAL_PERIOD,
+        )
+    )
+    return int(result.scalar() or 0)
+
+
+async def get_monthly_report_count(db: AsyncSession, owner_id: uuid.UUID, period: str) -> int:
+    """Reports created in ``period`` across every project the owner has."""
+    result = await db.execute(
+        select(func.coalesce(func.sum(UsageCounter.report_count), 0)).where(
+            UsageCounter.owner_id == owner_id,
+            UsageCounter.period == period,
+        )
+    )
+    return int(result.scalar() or 0)
+
+
+async def get_max_project_report_count(db: AsyncSession, owner_id: uuid.UUID) -> int:
+    """Largest lifetime report count among the owner's projects."""
+    per_project = (
+        select(func.sum(UsageCounter.report_count).label("report_count"))
+        .where(UsageCounter.owner_id == owner_id, UsageCounter.period == TOTAL_PERIOD)
+        .group_by(UsageCounter.project_id)
+        .subquery()
+    )
+    result = await db.execute(select(func.max(per_project.c.report_count)))
+    return int(result.scalar() or 0)
+
+
+def _upsert(db: AsyncSession):
+    dialect_name = db.bind.dialect.name if db.bind else ""
+    return pg_insert if dialect_name == "postgresql" else sqlite_insert
+
+
+async def reconcile_usage_counters(db: AsyncSession, now: datetime | None = None) -> int:
+    """Recount the lifetime and current-month rows from ``reports`` and fix any drift.
+
+    Only the periods that quota checks read are recounted. On PostgreSQL one
+    worker at a time reconciles, and report writes are blocked until it
+    commits so the recount and the stored sums match the same set of reports.
+    Each drifted counter gets the difference added to shard 0, which keeps
+    any increment that lands before the write. Returns the number of counters
+    that were corrected.
+    """
+    dialect_name = db.bind.dialect.name if db.bind else ""
+    if dialect_name == "postgresql":
+        acquired = await db.scalar(
+            text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": _RECONCILE_LOCK_KEY}
+        )
+        if not acquired:
+            return 0
+        await db.execute(text("LOCK TABLE reports IN SHARE MODE"))
+
+    now = now or datetime.now(timezone.utc)
+    current_period = month_period(now)
+    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+    actual: dict[tuple[uuid.UUID, uuid.UUID, str], int] = {}
+    total_result = await db.execute(
+        select(Project.owner_id, Report.project_id, func.count())
+        .join(Project, Project.id == Report.project_id)
+        .group_by(Project.owner_id, Report.project_id)
+    )
+    for owner_id, project_id, count in total_result.all():
+        actual[(owner_id, project_id, TOTAL_PERIOD)] = count
+
+    monthly_result = await db.execute(
+        select(Project.owner_id, Report.project_id, func.count())
+        .join(Project, Project.id == Report.project_id)
+        .where(Report.created_at >= month_start)
+        .group_by(Project.owner_id, Report.project_id)
+    )
+    for owner_id, project_id, count in monthly_result.all():
+        actual[(owner_id, project_id, current_period)] = count
+
+    stored_result = await db.execute(
+        select(
+            UsageCounter.owner_id,
+            UsageCounter.project_id,
+            UsageCounter.period,
+            func.sum(UsageCounter.report_count),
+        )
+        .where(UsageCounter.period.in_([TOTAL_PERIOD, current_period]))
+        .group_by(UsageCounter.owner_id, UsageCounter.project_id, UsageCounter.period)
+    )
+    stored = {(row[0], row[1], row[2]): row[3] for row in stored_result.all()}
+
+    drifted = {
+        key: actual.get(key, 0) - stored.get(key, 0)
+        for key in actual.keys() | stored.keys()
+        if actual.get(key, 0) != stored.get(key, 0)
+    }
+    if not drifted:
+        return 0
+
+    insert = _upsert(db)
+    for (owner_id, project_id, period), delta in drifted.items():
+        statement = insert(UsageCounter).values(
+            owner_id=owner_id, project_id=project_id, period=period, shard=0, report_count=delta
+        )
+        await db.execute(
+            statement.on_conflict_do_update(
+                index_elements=["owner_id", "project_id", "period", "shard"],
+                set_={"report_count": UsageCounter.report_count + delta, "updated_at": func.now()},
+            )
+        )
+    await db.commit()
+    logger.warning("Reconciled %d drifted usage counter(s)", len(drifted))
+    return len(drifted)
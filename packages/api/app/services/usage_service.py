@@ -1,118 +1,195 @@
-"""Service for calculating user usage and quota information."""
+"""Service for calculating user usage and quota information.
+
+Counts come from a per-owner ``UsageSnapshot`` built with two grouped queries
+(projects with member counts, and usage counters) and cached briefly. Limits
+are applied at read time from the user's current plan, so plan changes need
+no invalidation. Committed report, project and team-member changes evict the
+affected snapshots in this worker; other workers catch up when entries expire.
+ORM flushes are tracked automatically. Core and raw-SQL report inserts bypass
+the flush, so their callers register the project with
+``invalidate_project_usage_on_commit``.
+"""
 from __future__ import annotations
 
 import math
-from datetime import datetime, timezone
+import uuid
+from dataclasses import dataclass
 
-from sqlalchemy import func, select
+from sqlalchemy import event, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
-from app.models.enums import Plan
 from app.models.project import Project
 from app.models.project_member import ProjectMember
 from app.models.report import Report
+from app.models.usage_counter import TOTAL_PERIOD, UsageCounter
 from app.models.user import User
 from app.schemas.usage import ProjectMemberUsage, UsageQuota
 from app.services.plan_limits_service import PLAN_LIMITS
+from app.services.usage_counter_service import month_period
+from app.utils.ttl_cache import TTLCache
 
+USAGE_CACHE_TTL_SECONDS = 60
 
-async def get_user_usage(db: AsyncSession, user: User) -> UsageQuota:
-    """Calculate the current usage and quota for a user.
 
-    Returns a UsageQuota object with counts and limits for:
-    - Projects
-    - Monthly reports
-    - Reports per project
-    - Team members per project
-    """
-    limits = PLAN_LIMITS[user.plan]
+@dataclass(frozen=True)
+class ProjectUsage:
+    project_id: uuid.UUID
+    project_name: str
+    member_count: int  # ProjectMember rows, owner not included
+
+
+@dataclass(frozen=True)
+class UsageSnapshot:
+    """Plan-independent usage counts for one owner."""
+
+    project_ids: frozenset[uuid.UUID]  # every owned project, active or not
+    active_projects: tuple[ProjectUsage, ...]
+    monthly_reports_count: int
+    max_project_reports_count: int
+
+
+_usage_cache: TTLCache[tuple[uuid.UUID, str], UsageSnapshot] = TTLCache(
+    ttl_seconds=USAGE_CACHE_TTL_SECONDS, max_size=10_000
+)
+
 
-    # Count projects
+async def _load_usage_snapshot(db: AsyncSession, owner_id: uuid.UUID, period: str) -> UsageSnapshot:
     projects_result = await db.execute(
-        select(func.count())
-        .select_from(Project)
-        .where(Project.owner_id == user.id, Project.is_active.is_(True))
+        select(Project.id, Project.name, Project.is_active, func.count(ProjectMember.project_id))
+        .outerjoin(ProjectMember, ProjectMember.project_id == Project.id)
+        .where(Project.owner_id == owner_id)
+        .group_by(Project.id, Project.name, Project.is_active, Project.created_at)
+        .order_by(Project.created_at)
     )
-    projects_count = projects_result.scalar() or 0
-
-    # Count monthly reports
-    now = datetime.now(timezone.utc)
-    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    user_project_ids = select(Project.id).where(Project.owner_id == user.id)
-
-    monthly_reports_result = await db.execute(
-        select(func.count())
-        .select_from(Report)
-        .where(
-            Report.project_id.in_(user_project_ids),
-            Report.created_at >= month_start,
+    project_rows = projects_result.all()
+
+    # Report counts come from the trigger-maintained usage counters; each
+    # project's counters are summed over their shard rows first
+    per_project = (
+        select(
+            func.sum(UsageCounter.report_count).filter(UsageCounter.period == period).label("monthly"),
+            func.sum(UsageCounter.report_count).filter(UsageCounter.period == TOTAL_PERIOD).label("total"),
         )
-    )
-    monthly_reports_count = monthly_reports_result.scalar() or 0
-
-    # For reports per project, get the highest count using a subquery
-    from sqlalchemy import func as sa_func
-    subquery = (
-        select(sa_func.count(Report.id).label("count"))
-        .where(Report.project_id.in_(user_project_ids))
-        .group_by(Report.project_id)
+        .where(UsageCounter.owner_id == owner_id)
+        .group_by(UsageCounter.project_id)
         .subquery()
     )
-    reports_per_project_result = await db.execute(
-        select(sa_func.max(subquery.c.count))
+    counters_result = await db.execute(
+        select(
+            func.coalesce(func.sum(per_project.c.monthly), 0),
+            func.coalesce(func.max(per_project.c.total), 0),
+        )
+    )
+    monthly_reports_count, max_project_reports_count = counters_result.one()
+
+    return UsageSnapshot(
+        project_ids=frozenset(row[0] for row in project_rows),
+        active_projects=tuple(
+            ProjectUsage(project_id=row[0], project_name=row[1], member_count=row[3])
+            for row in project_rows
+            if row[2]
+        ),
+        monthly_reports_count=int(monthly_reports_count),
+        max_project_reports_count=int(max_project_reports_count),
     )
-    reports_per_project_count = reports_per_project_result.scalar() or 0
 
-    # Get team members per project
-    team_members_per_project: list[ProjectMemberUsage] = []
 
-    projects_query = await db.execute(
-        select(Project).where(
-            Project.owner_id == user.id,
-            Project.is_active.is_(True),
-        ).order_by(Project.created_at)
+async def get_usage_snapshot(db: AsyncSession, owner_id: uuid.UUID) -> UsageSnapshot:
+    period = month_period()
+    return await _usage_cache.get_or_load(
+        (owner_id, period), lambda: _load_usage_snapshot(db, owner_id, period)
     )
-    projects = projects_query.scalars().all()
 
-    for project in projects:
-        members_result = await db.execute(
-            select(func.count())
-            .select_from(ProjectMember)
-            .where(ProjectMember.project_id == project.id)
-        )
-        member_count = (members_result.scalar() or 0) + 1  # +1 for owner
 
-        member_limit = (
-            int(limits.max_team_members_per_project)
-            if math.isfinite(limits.max_team_members_per_project)
-            else None
-        )
+def _limit(value: float) -> int | None:
+    return int(value) if math.isfinite(value) else None
+
 
-        team_members_per_project.append(
+async def get_user_usage(db: AsyncSession, user: User) -> UsageQuota:
+    """Calculate the current usage and quota for a user.
+
+    Returns a UsageQuota object with counts and limits for:
+    - Projects
+    - Monthly reports
+    - Reports per project
+    - Team members per project
+    """
+    limits = PLAN_LIMITS[user.plan]
+    snapshot = await get_usage_snapshot(db, user.id)
+    member_limit = _limit(limits.max_team_members_per_project)
+
+    return UsageQuota(
+        projects_count=len(snapshot.active_projects),
+        projects_limit=_limit(limits.max_projects),
+        monthly_reports_count=snapshot.monthly_reports_count,
+        monthly_reports_limit=_limit(limits.max_reports_per_month),
+        reports_per_project_count=snapshot.max_project_reports_count,
+        reports_per_project_limit=_limit(limits.max_reports_per_project),
+        team_members_per_project=[
             ProjectMemberUsage(
-                project_id=project.id,
-                project_name=project.name,
-                member_count=member_count,
+                project_id=project.project_id,
+                project_name=project.project_name,
+                member_count=project.member_count + 1,  # +1 for owner
                 member_limit=member_limit,
             )
-        )
-
-    return UsageQuota(
-        projects_count=projects_count,
-        projects_limit=(
-            int(limits.max_projects) if math.isfinite(limits.max_projects) else None
-        ),
-        monthly_reports_count=monthly_reports_count,
-        monthly_reports_limit=(
-            int(limits.max_reports_per_month)
-            if math.isfinite(limits.max_reports_per_month)
-            else None
-        ),
-        reports_per_project_count=reports_per_project_count,
-        reports_per_project_limit=(
-            int(limits.max_reports_per_project)
-            if math.isfinite(limits.max_reports_per_project)
-            else None
-        ),
-        team_members_per_project=team_members_per_project,
+            for project in snapshot.active_projects
+        ],
     )
+
+
+def invalidate_usage(owner_id: uuid.UUID) -> int:
+    return _usage_cache.evict_where(lambda key, _snapshot: key[0] == owner_id)
+
+
+def invalidate_project_usage(project_id: uuid.UUID) -> int:
+    return _usage_cache.evict_where(lambda _key, snapshot: project_id in snapshot.project_ids)
+
+
+def clear_usage_cache() -> None:
+    _usage_cache.clear()
+
+
+# ---------- Invalidation on commit ----------
+
+_PENDING_KEY = "usage_cache_invalidations"
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_invalidations(session: Session, _flush_context, _instances) -> None:
+    owner_ids: set[uuid.UUID] = set()
+    project_ids: set[uuid.UUID] = set()
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, Project):
+            if instance in session.dirty and not session.is_modified(instance):
+                continue
+            owner_ids.add(instance.owner_id)
+        elif isinstance(instance, ProjectMember):
+            project_ids.add(instance.project_id)
+        elif isinstance(instance, Report) and instance not in session.dirty:
+            # Only inserts and deletes change report counts
+            project_ids.add(instance.project_id)
+    if owner_ids or project_ids:
+        pending = session.info.setdefault(_PENDING_KEY, (set(), set()))
+        pending[0].update(owner_ids)
+        pending[1].update(project_ids)
+
+
+def invalidate_project_usage_on_commit(session: Session | AsyncSession, project_id: uuid.UUID) -> None:
+    """Evict ``project_id``'s snapshots when ``session`` commits (dropped on rollback)."""
+    pending = session.info.setdefault(_PENDING_KEY, (set(), set()))
+    pending[1].add(project_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session: Session) -> None:
+    owner_ids, project_ids = session.info.pop(_PENDING_KEY, ((), ()))
+    for owner_id in owner_ids:
+        invalidate_usage(owner_id)
+    for project_id in project_ids:
+        invalidate_project_usage(project_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
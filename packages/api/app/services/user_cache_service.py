@@ -0,0 +1,83 @@
+"""In-process cache of the user row behind a dashboard access token.
+
+Entries are keyed by user ID and a digest of the token, and hold column
+snapshots only. A hit is turned back into a ``User`` attached to the request
+session without a SELECT, so routes can still modify and commit it. Any
+committed change to a user row (role, plan, deactivation, beta status, profile)
+evicts that user's entries in this worker; other workers catch up when their
+entries expire.
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import uuid
+from typing import Any
+
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.models.user import User
+from app.utils.ttl_cache import TTLCache
+
+USER_CACHE_TTL_SECONDS = 30
+
+_user_cache: TTLCache[tuple[uuid.UUID, str], dict[str, Any]] = TTLCache(
+    ttl_seconds=USER_CACHE_TTL_SECONDS, max_size=10_000
+)
+
+
+def _cache_key(user_id: uuid.UUID, token: str) -> tuple[uuid.UUID, str]:
+    return user_id, hashlib.sha256(token.encode()).hexdigest()
+
+
+def get_cached_user(user_id: uuid.UUID, token: str, db: AsyncSession) -> User | None:
+    """The cached user attached to ``db`` as a persistent instance, or None on a miss."""
+    values = _user_cache.get(_cache_key(user_id, token))
+    if values is None:
+        return None
+    user = User(**copy.deepcopy(values))
+    make_transient_to_detached(user)
+    db.add(user)
+    return user
+
+
+def cache_user(token: str, user: User) -> None:
+    values = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+    _user_cache.set(_cache_key(user.id, token), values)
+
+
+def invalidate_user(user_id: uuid.UUID) -> int:
+    return _user_cache.evict_where(lambda key, _values: key[0] == user_id)
+
+
+def clear_user_cache() -> None:
+    _user_cache.clear()
+
+
+# ---------- Invalidation on commit ----------
+
+_PENDING_KEY = "user_cache_invalidations"
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_invalidations(session: Session, _flush_context, _instances) -> None:
+    user_ids = {
+        instance.id
+        for instance in (*session.dirty, *session.deleted)
+        if isinstance(instance, User) and (instance in session.deleted or session.is_modified(instance))
+    }
+    if user_ids:
+        session.info.setdefault(_PENDING_KEY, set()).update(user_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session: Session) -> None:
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -179,6 +179,16 @@ async def _enqueue_webhook(
     )
 
 
+async def _active_webhooks(db: AsyncSession, project_id: str) -> list[Webhook]:
+    result = await db.execute(
+        select(Webhook).where(
+            Webhook.project_id == project_id,
+            Webhook.is_active.is_(True),
+        )
+    )
+    return list(result.scalars().all())
+
+
 async def dispatch_webhooks(
     db: AsyncSession,
     background_tasks: BackgroundTasks,
@@ -187,16 +197,28 @@ async def dispatch_webhooks(
     payload: dict,
     use_task_queue: bool = False,
 ) -> None:
-    result = await db.execute(
-        select(Webhook).where(
-            Webhook.project_id == project_id,
-            Webhook.is_active.is_(True),
-        )
+    await dispatch_webhooks_many(
+        db, background_tasks, project_id, event, [payload], use_task_queue=use_task_queue
     )
-    webhooks = result.scalars().all()
+
+
+async def dispatch_webhooks_many(
+    db: AsyncSession,
+    background_tasks: BackgroundTasks,
+    project_id: str,
+    event: str,
+    payloads: list[dict],
+    use_task_queue: bool = False,
+) -> None:
+    """Dispatch one event per payload, looking up the project's webhooks once."""
+    if not payloads:
+        return
+    webhooks = await _active_webhooks(db, project_id)
 
     for webhook in webhooks:
-        if event in webhook.events:
+        if event not in webhook.events:
+            continue
+        for payload in payloads:
             if use_task_queue:
                 await _enqueue_webhook(db, webhook, event, payload)
             else:
@@ -0,0 +1,42 @@
+"""Content fingerprints for duplicate report detection."""
+from __future__ import annotations
+
+import hashlib
+
+# Each half is a truncated SHA-256 hex digest; together they fit String(64).
+_HALF_LENGTH = 32
+
+
+def _normalize(text: str | None) -> str:
+    """Case-fold and collapse whitespace so trivial edits don't defeat dedupe."""
+    return " ".join((text or "").split()).casefold()
+
+
+def _digest(text: str | None) -> str:
+    return hashlib.sha256(_normalize(text).encode()).hexdigest()[:_HALF_LENGTH]
+
+
+def report_fingerprint(title: str, description: str | None) -> str:
+    """Title digest followed by description digest.
+
+    Keeping the title digest as a prefix lets a title-only lookup be a range
+    scan on the same index as an exact lookup.
+    """
+    return _digest(title) + _digest(description)
+
+
+def fingerprint_range(title: str, description: str | None) -> tuple[str, str]:
+    """Inclusive bounds matching the duplicate rule for a new report.
+
+    With a description, only the exact fingerprint matches. Without one, any
+    report with the same title matches, whatever its description.
+    """
+    if description:
+        fingerprint = report_fingerprint(title, description)
+        return fingerprint, fingerprint
+    prefix = _digest(title)
+    return prefix + "0" * _HALF_LENGTH, prefix + "f" * _HALF_LENGTH
+
+
+def title_digest(fingerprint: str) -> str:
+    return fingerprint[:_HALF_LENGTH]
@@ -0,0 +1,23 @@
+"""ETag helpers for conditional GET responses."""
+from __future__ import annotations
+
+import hashlib
+
+from starlette.requests import Request
+
+
+def weak_etag(*parts: str) -> str:
+    """Weak validator over the given representation parts."""
+    digest = hashlib.sha256("\x1f".join(parts).encode()).hexdigest()[:32]
+    return f'W/"{digest}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match already names ``etag`` (weak comparison)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
@@ -0,0 +1,138 @@
+"""Keyset pagination and row counts for newest-first list endpoints."""
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Select, func, literal, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.elements import ClauseElement
+
+from app.exceptions import BadRequestException
+
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID, rank: float | None = None) -> str:
+    """Opaque cursor pointing just past the row with this ``(rank, created_at, id)``."""
+    key: list[Any] = [created_at.isoformat(), str(row_id)]
+    if rank is not None:
+        key.append(rank)
+    payload = json.dumps(key, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID, float | None]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id, *rank = json.loads(base64.urlsafe_b64decode(padded))
+        if len(rank) > 1 or (rank and not isinstance(rank[0], (int, float))):
+            raise ValueError("bad rank")
+        return datetime.fromisoformat(created_at), uuid.UUID(row_id), float(rank[0]) if rank else None
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise BadRequestException("Invalid cursor") from exc
+
+
+@dataclass
+class Page:
+    rows: list[Any]
+    next_cursor: str | None
+    total: int
+    total_is_estimate: bool
+
+
+async def count_rows(db: AsyncSession, query: Select, *, exact: bool) -> tuple[int, bool]:
+    """Row count of ``query`` as ``(count, is_estimate)``.
+
+    On PostgreSQL the planner's row estimate is returned unless ``exact`` is
+    set; other dialects always run a real ``COUNT(*)``.
+    """
+    dialect = db.bind.dialect.name if db.bind else ""
+    if not exact and dialect == "postgresql":
+        return await _planner_row_estimate(db, query), True
+    result = await db.execute(select(func.count()).select_from(query.order_by(None).subquery()))
+    return result.scalar() or 0, False
+
+
+class _ExplainJson(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON) <query>``, with the query's parameters still bound."""
+
+    inherit_cache = False
+
+    def __init__(self, query: Select) -> None:
+        self.query = query
+
+
+@compiles(_ExplainJson)
+def _compile_explain_json(element: _ExplainJson, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.query, **kw)
+
+
+async def _planner_row_estimate(db: AsyncSession, query: Select) -> int:
+    result = await db.execute(_ExplainJson(query))
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def fetch_page(
+    db: AsyncSession,
+    query: Select,
+    created_at_column: Any,
+    id_column: Any,
+    *,
+    cursor: str | None,
+    page: int,
+    page_size: int,
+    exact_total: bool = False,
+    scalars: bool = False,
+    rank_column: Any | None = None,
+) -> Page:
+    """Fetch one newest-first page of ``query``.
+
+    With a ``cursor`` the page starts after the cursor row using a
+    ``(created_at, id) < (...)`` predicate, so deep pages cost the same as the
+    first one; without it ``page`` falls back to OFFSET for older clients.
+    One extra row is read to decide whether there is a ``next_cursor``.
+
+    ``rank_column`` is a labelled column already selected by ``query``; when
+    given, rows are ordered by it (highest first) before recency.
+    """
+    sort_columns = [created_at_column, id_column]
+    if rank_column is not None:
+        sort_columns.insert(0, rank_column)
+    paged = query.order_by(*(column.desc() for column in sort_columns))
+
+    if cursor is not None:
+        created_at, row_id, rank = decode_cursor(cursor)
+        if (rank is None) != (rank_column is None):
+            raise BadRequestException("Invalid cursor")
+        values = [literal(created_at, created_at_column.type), literal(row_id, id_column.type)]
+        if rank_column is not None:
+            values.insert(0, literal(rank, rank_column.type))
+        paged = paged.where(tuple_(*sort_columns) < tuple_(*values))
+    else:
+        paged = paged.offset((page - 1) * page_size)
+
+    result = await db.execute(paged.limit(page_size + 1))
+    rows = list(result.scalars().all() if scalars else result.all())
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        rank = getattr(last, rank_column.name) if rank_column is not None else None
+        next_cursor = encode_cursor(last.created_at, last.id, rank)
+
+    if cursor is None and not has_more and (rows or page == 1):
+        # Last page reached by offset: the total is known without counting
+        return Page(rows, next_cursor, (page - 1) * page_size + len(rows), False)
+
+    total, is_estimate = await count_rows(db, query, exact=exact_total)
+    return Page(rows, next_cursor, total, is_estimate)
@@ -0,0 +1,115 @@
+"""Small in-process cache with per-entry expiry and an LRU size bound."""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class TTLCache(Generic[K, V]):
+    """Per-process cache for short-lived lookups.
+
+    Entries expire ``ttl_seconds`` after they are set; once ``max_size`` is
+    reached the least recently used entry is evicted. Not thread-safe: it is
+    meant to be used from the event loop only. Each worker process has its
+    own copy, so a value can be up to one TTL stale relative to other workers.
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int = 1024) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._inflight: dict[K, asyncio.Future[V]] = {}
+        # Bumped on every eviction so an in-flight load never stores a value
+        # computed before the invalidation that should have discarded it.
+        self._generation = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: K) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def get(self, key: K, default=None):
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return default
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V, ttl_seconds: float | None = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def get_or_load(
+        self, key: K, load: Callable[[], Awaitable[V]], ttl_seconds: float | None = None
+    ) -> V:
+        """Return the cached value, or await ``load()`` once for all concurrent callers.
+
+        Callers that miss while a load for the same key is running wait for its
+        result instead of starting their own (single-flight). If the loading
+        caller is cancelled, one of the waiters takes over.
+        """
+        while True:
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            pending = self._inflight.get(key)
+            if pending is None:
+                break
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                current = asyncio.current_task()
+                if not pending.cancelled() or (current is not None and current.cancelling()):
+                    raise
+
+        future: asyncio.Future[V] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self._generation
+        try:
+            value = await load()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # waiters re-raise it; silence "never retrieved"
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+        if generation == self._generation:
+            self.set(key, value, ttl_seconds)
+        future.set_result(value)
+        return value
+
+    def pop(self, key: K) -> None:
+        self._generation += 1
+        self._entries.pop(key, None)
+
+    def evict_where(self, predicate: Callable[[K, V], bool]) -> int:
+        """Drop every entry for which ``predicate(key, value)`` is true. Returns count dropped."""
+        self._generation += 1
+        matching = [key for key, (_, value) in self._entries.items() if predicate(key, value)]
+        for key in matching:
+            del self._entries[key]
+        return len(matching)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
@@ -0,0 +1,33 @@
+"""add reports.screenshot_renditions_at
+
+Revision ID: a8b9c0d1e2f3
+Revises: y6z7a8b9c0d1
+Create Date: 2026-10-17
+
+Set by the image pipeline once a report's screenshot renditions exist, so the
+API only signs rendition URLs that resolve. Existing reports start as NULL;
+scripts/backfill_screenshot_renditions.py fills them in.
+
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "a8b9c0d1e2f3"
+down_revision: Union[str, None] = "y6z7a8b9c0d1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "reports", sa.Column("screenshot_renditions_at", sa.DateTime(timezone=True), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("reports", "screenshot_renditions_at")
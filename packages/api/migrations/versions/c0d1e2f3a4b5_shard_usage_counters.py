@@ -0,0 +1,144 @@
+"""shard usage_counters rows by backend PID
+
+Revision ID: c0d1e2f3a4b5
+Revises: b9c0d1e2f3a4
+Create Date: 2026-10-17
+
+The report triggers used to upsert one usage_counters row per project and
+period, so every ingest held that row lock until commit and concurrent
+ingests for a project queued behind each other. Each counter is now spread
+over 16 ``shard`` rows picked by ``pg_backend_pid()``; readers sum them, and
+deletes add negative deltas instead of updating a shared row.
+
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "c0d1e2f3a4b5"
+down_revision: Union[str, None] = "b9c0d1e2f3a4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_PK = ["owner_id", "project_id", "period"]
+
+_SHARDED_FUNCTIONS = [
+    """
+    CREATE OR REPLACE FUNCTION usage_counters_after_report_insert() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO usage_counters (owner_id, project_id, period, shard, report_count)
+        SELECT p.owner_id, n.project_id, n.period, mod(pg_backend_pid(), 16), n.cnt
+        FROM (
+            SELECT project_id, 'total' AS period, count(*) AS cnt
+            FROM new_reports GROUP BY project_id
+            UNION ALL
+            SELECT project_id, to_char(created_at AT TIME ZONE 'UTC', 'YYYY-MM'), count(*)
+            FROM new_reports GROUP BY 1, 2
+        ) AS n
+        JOIN projects p ON p.id = n.project_id
+        ON CONFLICT (owner_id, project_id, period, shard) DO UPDATE
+        SET report_count = usage_counters.report_count + EXCLUDED.report_count,
+            updated_at = now();
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION usage_counters_after_report_delete() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO usage_counters (owner_id, project_id, period, shard, report_count)
+        SELECT p.owner_id, o.project_id, o.period, mod(pg_backend_pid(), 16), -o.cnt
+        FROM (
+            SELECT project_id, 'total' AS period, count(*) AS cnt
+            FROM old_reports GROUP BY project_id
+            UNION ALL
+            SELECT project_id, to_char(created_at AT TIME ZONE 'UTC', 'YYYY-MM'), count(*)
+            FROM old_reports GROUP BY 1, 2
+        ) AS o
+        JOIN projects p ON p.id = o.project_id
+        ON CONFLICT (owner_id, project_id, period, shard) DO UPDATE
+        SET report_count = usage_counters.report_count + EXCLUDED.report_count,
+            updated_at = now();
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+]
+
+# Trigger functions as installed by u2v3w4x5y6z7
+_UNSHARDED_FUNCTIONS = [
+    """
+    CREATE OR REPLACE FUNCTION usage_counters_after_report_insert() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO usage_counters (owner_id, project_id, period, report_count)
+        SELECT p.owner_id, n.project_id, n.period, n.cnt
+        FROM (
+            SELECT project_id, 'total' AS period, count(*) AS cnt
+            FROM new_reports GROUP BY project_id
+            UNION ALL
+            SELECT project_id, to_char(created_at AT TIME ZONE 'UTC', 'YYYY-MM'), count(*)
+            FROM new_reports GROUP BY 1, 2
+        ) AS n
+        JOIN projects p ON p.id = n.project_id
+        ON CONFLICT (owner_id, project_id, period) DO UPDATE
+        SET report_count = usage_counters.report_count + EXCLUDED.report_count,
+            updated_at = now();
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION usage_counters_after_report_delete() RETURNS trigger AS $$
+    BEGIN
+        UPDATE usage_counters uc
+        SET report_count = GREATEST(uc.report_count - o.cnt, 0),
+            updated_at = now()
+        FROM (
+            SELECT project_id, 'total' AS period, count(*) AS cnt
+            FROM old_reports GROUP BY project_id
+            UNION ALL
+            SELECT project_id, to_char(created_at AT TIME ZONE 'UTC', 'YYYY-MM'), count(*)
+            FROM old_reports GROUP BY 1, 2
+        ) AS o
+        WHERE uc.project_id = o.project_id AND uc.period = o.period;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+]
+
+
+def upgrade() -> None:
+    op.add_column("usage_counters", sa.Column("shard", sa.SmallInteger(), nullable=False, server_default="0"))
+    op.drop_constraint("usage_counters_pkey", "usage_counters", type_="primary")
+    op.create_primary_key("usage_counters_pkey", "usage_counters", [*_PK, "shard"])
+    for statement in _SHARDED_FUNCTIONS:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for statement in _UNSHARDED_FUNCTIONS:
+        op.execute(statement)
+
+    # Fold every shard back into shard 0 before the shard column goes away
+    op.execute(
+        """
+        WITH moved AS (
+            DELETE FROM usage_counters WHERE shard <> 0
+            RETURNING owner_id, project_id, period, report_count
+        )
+        INSERT INTO usage_counters (owner_id, project_id, period, shard, report_count)
+        SELECT owner_id, project_id, period, 0, sum(report_count) FROM moved
+        GROUP BY 1, 2, 3
+        ON CONFLICT (owner_id, project_id, period, shard) DO UPDATE
+        SET report_count = GREATEST(usage_counters.report_count + EXCLUDED.report_count, 0)
+        """
+    )
+
+    op.drop_constraint("usage_counters_pkey", "usage_counters", type_="primary")
+    op.drop_column("usage_counters", "shard")
+    op.create_primary_key("usage_counters_pkey", "usage_counters", _PK)
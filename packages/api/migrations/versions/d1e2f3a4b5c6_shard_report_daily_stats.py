@@ -0,0 +1,185 @@
+"""shard report_daily_stats rows by backend PID
+
+Revision ID: d1e2f3a4b5c6
+Revises: c0d1e2f3a4b5
+Create Date: 2026-10-17
+
+The report triggers used to upsert one report_daily_stats row per project,
+day and bucket, so concurrent ingests for a project queued on that row lock
+until commit. Each bucket is now spread over 16 ``shard`` rows picked by
+``pg_backend_pid()``; readers already sum rows, and deletes add negative
+deltas instead of updating a shared row.
+
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "d1e2f3a4b5c6"
+down_revision: Union[str, None] = "c0d1e2f3a4b5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_PK = ["project_id", "day", "severity", "status", "category"]
+
+_SHARDED_FUNCTIONS = [
+    """
+    CREATE OR REPLACE FUNCTION report_daily_stats_after_report_insert() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO report_daily_stats
+            (project_id, day, severity, status, category, shard, report_count, resolution_seconds)
+        SELECT project_id, (created_at AT TIME ZONE 'UTC')::date, severity, status, category,
+               mod(pg_backend_pid(), 16), count(*),
+               sum(extract(epoch FROM updated_at - created_at))
+        FROM new_reports
+        GROUP BY 1, 2, 3, 4, 5
+        ON CONFLICT (project_id, day, severity, status, category, shard) DO UPDATE
+        SET report_count = report_daily_stats.report_count + EXCLUDED.report_count,
+            resolution_seconds = report_daily_stats.resolution_seconds + EXCLUDED.resolution_seconds;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION report_daily_stats_after_report_update() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO report_daily_stats
+            (project_id, day, severity, status, category, shard, report_count, resolution_seconds)
+        SELECT project_id, day, severity, status, category,
+               mod(pg_backend_pid(), 16), sum(cnt), sum(secs)
+        FROM (
+            SELECT project_id, (created_at AT TIME ZONE 'UTC')::date AS day, severity, status,
+                   category, 1 AS cnt, extract(epoch FROM updated_at - created_at) AS secs
+            FROM new_reports
+            UNION ALL
+            SELECT project_id, (created_at AT TIME ZONE 'UTC')::date, severity, status,
+                   category, -1, -extract(epoch FROM updated_at - created_at)
+            FROM old_reports
+        ) AS d
+        GROUP BY 1, 2, 3, 4, 5
+        ON CONFLICT (project_id, day, severity, status, category, shard) DO UPDATE
+        SET report_count = report_daily_stats.report_count + EXCLUDED.report_count,
+            resolution_seconds = report_daily_stats.resolution_seconds + EXCLUDED.resolution_seconds;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION report_daily_stats_after_report_delete() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO report_daily_stats
+            (project_id, day, severity, status, category, shard, report_count, resolution_seconds)
+        SELECT project_id, (created_at AT TIME ZONE 'UTC')::date, severity, status, category,
+               mod(pg_backend_pid(), 16), -count(*),
+               -sum(extract(epoch FROM updated_at - created_at))
+        FROM old_reports
+        WHERE EXISTS (SELECT 1 FROM projects p WHERE p.id = old_reports.project_id)
+        GROUP BY 1, 2, 3, 4, 5
+        ON CONFLICT (project_id, day, severity, status, category, shard) DO UPDATE
+        SET report_count = report_daily_stats.report_count + EXCLUDED.report_count,
+            resolution_seconds = report_daily_stats.resolution_seconds + EXCLUDED.resolution_seconds;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+]
+
+# Trigger functions as installed by y6z7a8b9c0d1
+_UNSHARDED_FUNCTIONS = [
+    """
+    CREATE OR REPLACE FUNCTION report_daily_stats_after_report_insert() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO report_daily_stats
+            (project_id, day, severity, status, category, report_count, resolution_seconds)
+        SELECT project_id, (created_at AT TIME ZONE 'UTC')::date, severity, status, category,
+               count(*), sum(extract(epoch FROM updated_at - created_at))
+        FROM new_reports
+        GROUP BY 1, 2, 3, 4, 5
+        ON CONFLICT (project_id, day, severity, status, category) DO UPDATE
+        SET report_count = report_daily_stats.report_count + EXCLUDED.report_count,
+            resolution_seconds = report_daily_stats.resolution_seconds + EXCLUDED.resolution_seconds;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION report_daily_stats_after_report_update() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO report_daily_stats
+            (project_id, day, severity, status, category, report_count, resolution_seconds)
+        SELECT project_id, day, severity, status, category, sum(cnt), sum(secs)
+        FROM (
+            SELECT project_id, (created_at AT TIME ZONE 'UTC')::date AS day, severity, status,
+                   category, 1 AS cnt, extract(epoch FROM updated_at - created_at) AS secs
+            FROM new_reports
+            UNION ALL
+            SELECT project_id, (created_at AT TIME ZONE 'UTC')::date, severity, status,
+                   category, -1, -extract(epoch FROM updated_at - created_at)
+            FROM old_reports
+        ) AS d
+        GROUP BY 1, 2, 3, 4, 5
+        ON CONFLICT (project_id, day, severity, status, category) DO UPDATE
+        SET report_count = report_daily_stats.report_count + EXCLUDED.report_count,
+            resolution_seconds = report_daily_stats.resolution_seconds + EXCLUDED.resolution_seconds;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION report_daily_stats_after_report_delete() RETURNS trigger AS $$
+    BEGIN
+        UPDATE report_daily_stats s
+        SET report_count = s.report_count - o.cnt,
+            resolution_seconds = s.resolution_seconds - o.secs
+        FROM (
+            SELECT project_id, (created_at AT TIME ZONE 'UTC')::date AS day, severity, status,
+                   category, count(*) AS cnt, sum(extract(epoch FROM updated_at - created_at)) AS secs
+            FROM old_reports
+            GROUP BY 1, 2, 3, 4, 5
+        ) AS o
+        WHERE s.project_id = o.project_id AND s.day = o.day AND s.severity = o.severity
+          AND s.status = o.status AND s.category = o.category;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+]
+
+
+def upgrade() -> None:
+    op.add_column("report_daily_stats", sa.Column("shard", sa.SmallInteger(), nullable=False, server_default="0"))
+    op.drop_constraint("report_daily_stats_pkey", "report_daily_stats", type_="primary")
+    op.create_primary_key("report_daily_stats_pkey", "report_daily_stats", [*_PK, "shard"])
+    for statement in _SHARDED_FUNCTIONS:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for statement in _UNSHARDED_FUNCTIONS:
+        op.execute(statement)
+
+    # Fold every shard back into shard 0 before the shard column goes away
+    op.execute(
+        """
+        WITH moved AS (
+            DELETE FROM report_daily_stats WHERE shard <> 0
+            RETURNING project_id, day, severity, status, category, report_count, resolution_seconds
+        )
+        INSERT INTO report_daily_stats
+            (project_id, day, severity, status, category, shard, report_count, resolution_seconds)
+        SELECT project_id, day, severity, status, category, 0, sum(report_count), sum(resolution_seconds)
+        FROM moved
+        GROUP BY 1, 2, 3, 4, 5
+        ON CONFLICT (project_id, day, severity, status, category, shard) DO UPDATE
+        SET report_count = report_daily_stats.report_count + EXCLUDED.report_count,
+            resolution_seconds = report_daily_stats.resolution_seconds + EXCLUDED.resolution_seconds
+        """
+    )
+
+    op.drop_constraint("report_daily_stats_pkey", "report_daily_stats", type_="primary")
+    op.drop_column("report_daily_stats", "shard")
+    op.create_primary_key("report_daily_stats_pkey", "report_daily_stats", _PK)
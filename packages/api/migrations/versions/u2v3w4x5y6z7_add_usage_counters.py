@@ -0,0 +1,115 @@
+"""add usage_counters table maintained by report triggers
+
+Revision ID: u2v3w4x5y6z7
+Revises: t1u2v3w4x5y6
+Create Date: 2026-10-16
+
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "u2v3w4x5y6z7"
+down_revision: Union[str, None] = "t1u2v3w4x5y6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "usage_counters",
+        sa.Column("owner_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("period", sa.String(7), nullable=False),
+        sa.Column("report_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["owner_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("owner_id", "project_id", "period"),
+    )
+    op.create_index(
+        "ix_usage_counters_owner_period", "usage_counters", ["owner_id", "period"], unique=False
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION usage_counters_after_report_insert() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO usage_counters (owner_id, project_id, period, report_count)
+            SELECT p.owner_id, n.project_id, n.period, n.cnt
+            FROM (
+                SELECT project_id, 'total' AS period, count(*) AS cnt
+                FROM new_reports GROUP BY project_id
+                UNION ALL
+                SELECT project_id, to_char(created_at AT TIME ZONE 'UTC', 'YYYY-MM'), count(*)
+                FROM new_reports GROUP BY 1, 2
+            ) AS n
+            JOIN projects p ON p.id = n.project_id
+            ON CONFLICT (owner_id, project_id, period) DO UPDATE
+            SET report_count = usage_counters.report_count + EXCLUDED.report_count,
+                updated_at = now();
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION usage_counters_after_report_delete() RETURNS trigger AS $$
+        BEGIN
+            UPDATE usage_counters uc
+            SET report_count = GREATEST(uc.report_count - o.cnt, 0),
+                updated_at = now()
+            FROM (
+                SELECT project_id, 'total' AS period, count(*) AS cnt
+                FROM old_reports GROUP BY project_id
+                UNION ALL
+                SELECT project_id, to_char(created_at AT TIME ZONE 'UTC', 'YYYY-MM'), count(*)
+                FROM old_reports GROUP BY 1, 2
+            ) AS o
+            WHERE uc.project_id = o.project_id AND uc.period = o.period;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER trg_reports_usage_counters_insert "
+        "AFTER INSERT ON reports REFERENCING NEW TABLE AS new_reports "
+        "FOR EACH STATEMENT EXECUTE FUNCTION usage_counters_after_report_insert()"
+    )
+    op.execute(
+        "CREATE TRIGGER trg_reports_usage_counters_delete "
+        "AFTER DELETE ON reports REFERENCING OLD TABLE AS old_reports "
+        "FOR EACH STATEMENT EXECUTE FUNCTION usage_counters_after_report_delete()"
+    )
+
+    # Backfill from existing reports (triggers are in place, so nothing is missed)
+    op.execute(
+        """
+        INSERT INTO usage_counters (owner_id, project_id, period, report_count)
+        SELECT p.owner_id, r.project_id, 'total', count(*)
+        FROM reports r JOIN projects p ON p.id = r.project_id
+        GROUP BY p.owner_id, r.project_id
+        UNION ALL
+        SELECT p.owner_id, r.project_id, to_char(r.created_at AT TIME ZONE 'UTC', 'YYYY-MM'), count(*)
+        FROM reports r JOIN projects p ON p.id = r.project_id
+        GROUP BY 1, 2, 3
+        ON CONFLICT (owner_id, project_id, period) DO UPDATE
+        SET report_count = EXCLUDED.report_count
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_reports_usage_counters_delete ON reports")
+    op.execute("DROP TRIGGER IF EXISTS trg_reports_usage_counters_insert ON reports")
+    op.execute("DROP FUNCTION IF EXISTS usage_counters_after_report_delete()")
+    op.execute("DROP FUNCTION IF EXISTS usage_counters_after_report_insert()")
+    op.drop_index("ix_usage_counters_owner_period", table_name="usage_counters")
+    op.drop_table("usage_counters")
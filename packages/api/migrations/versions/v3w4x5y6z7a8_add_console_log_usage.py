@@ -0,0 +1,47 @@
+"""add console_log_usage daily counter table
+
+Revision ID: v3w4x5y6z7a8
+Revises: u2v3w4x5y6z7
+Create Date: 2026-10-16
+
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "v3w4x5y6z7a8"
+down_revision: Union[str, None] = "u2v3w4x5y6z7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "console_log_usage",
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("used", sa.Integer(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("project_id", "day"),
+    )
+
+    # Seed today's usage so the limit carries over the deploy
+    op.execute(
+        """
+        INSERT INTO console_log_usage (project_id, day, used)
+        SELECT project_id, (now() AT TIME ZONE 'UTC')::date, count(*)
+        FROM reports
+        WHERE console_logs_included
+          AND created_at >= date_trunc('day', now() AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'
+        GROUP BY project_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("console_log_usage")
@@ -0,0 +1,34 @@
+"""add reports.fingerprint for index-backed duplicate detection
+
+Revision ID: w4x5y6z7a8b9
+Revises: v3w4x5y6z7a8
+Create Date: 2026-10-16
+
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "w4x5y6z7a8b9"
+down_revision: Union[str, None] = "v3w4x5y6z7a8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # No backfill: duplicate checks only look at the last few minutes of reports.
+    op.add_column("reports", sa.Column("fingerprint", sa.String(64), nullable=True))
+    op.create_index(
+        "ix_reports_project_fingerprint_created",
+        "reports",
+        ["project_id", "fingerprint", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_reports_project_fingerprint_created", table_name="reports")
+    op.drop_column("reports", "fingerprint")
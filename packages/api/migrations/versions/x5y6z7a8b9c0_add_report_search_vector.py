@@ -0,0 +1,39 @@
+"""add reports.search_vector full-text index
+
+Revision ID: x5y6z7a8b9c0
+Revises: w4x5y6z7a8b9
+Create Date: 2026-10-17
+
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "x5y6z7a8b9c0"
+down_revision: Union[str, None] = "w4x5y6z7a8b9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Stored generated column: kept in sync by PostgreSQL on every insert and
+    # update. Tracking IDs use the 'simple' config so "BUG-0042" is not stemmed.
+    op.execute(
+        """
+        ALTER TABLE reports ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(tracking_id, '')), 'A')
+            || setweight(to_tsvector('english', coalesce(title, '')), 'A')
+            || setweight(to_tsvector('english', coalesce(description, '')), 'B')
+        ) STORED
+        """
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_reports_search_vector ON reports USING gin (search_vector)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_reports_search_vector")
+    op.execute("ALTER TABLE reports DROP COLUMN IF EXISTS search_vector")
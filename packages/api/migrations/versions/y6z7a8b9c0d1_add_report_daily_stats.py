@@ -0,0 +1,144 @@
+"""add report_daily_stats rollup maintained by report triggers
+
+Revision ID: y6z7a8b9c0d1
+Revises: x5y6z7a8b9c0
+Create Date: 2026-10-17
+
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "y6z7a8b9c0d1"
+down_revision: Union[str, None] = "x5y6z7a8b9c0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "report_daily_stats",
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("severity", postgresql.ENUM(name="severity_enum", create_type=False), nullable=False),
+        sa.Column("status", postgresql.ENUM(name="status_enum", create_type=False), nullable=False),
+        sa.Column("category", postgresql.ENUM(name="category_enum", create_type=False), nullable=False),
+        sa.Column("report_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("resolution_seconds", sa.Float(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("project_id", "day", "severity", "status", "category"),
+    )
+    op.create_index("ix_report_daily_stats_day", "report_daily_stats", ["day"], unique=False)
+    # "Resolved today" is still counted from reports; keep it to today's rows
+    op.create_index(
+        "ix_reports_status_updated", "reports", ["status", "updated_at"], unique=False
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION report_daily_stats_after_report_insert() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO report_daily_stats
+                (project_id, day, severity, status, category, report_count, resolution_seconds)
+            SELECT project_id, (created_at AT TIME ZONE 'UTC')::date, severity, status, category,
+                   count(*), sum(extract(epoch FROM updated_at - created_at))
+            FROM new_reports
+            GROUP BY 1, 2, 3, 4, 5
+            ON CONFLICT (project_id, day, severity, status, category) DO UPDATE
+            SET report_count = report_daily_stats.report_count + EXCLUDED.report_count,
+                resolution_seconds = report_daily_stats.resolution_seconds + EXCLUDED.resolution_seconds;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION report_daily_stats_after_report_update() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO report_daily_stats
+                (project_id, day, severity, status, category, report_count, resolution_seconds)
+            SELECT project_id, day, severity, status, category, sum(cnt), sum(secs)
+            FROM (
+                SELECT project_id, (created_at AT TIME ZONE 'UTC')::date AS day, severity, status,
+                       category, 1 AS cnt, extract(epoch FROM updated_at - created_at) AS secs
+                FROM new_reports
+                UNION ALL
+                SELECT project_id, (created_at AT TIME ZONE 'UTC')::date, severity, status,
+                       category, -1, -extract(epoch FROM updated_at - created_at)
+                FROM old_reports
+            ) AS d
+            GROUP BY 1, 2, 3, 4, 5
+            ON CONFLICT (project_id, day, severity, status, category) DO UPDATE
+            SET report_count = report_daily_stats.report_count + EXCLUDED.report_count,
+                resolution_seconds = report_daily_stats.resolution_seconds + EXCLUDED.resolution_seconds;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION report_daily_stats_after_report_delete() RETURNS trigger AS $$
+        BEGIN
+            UPDATE report_daily_stats s
+            SET report_count = s.report_count - o.cnt,
+                resolution_seconds = s.resolution_seconds - o.secs
+            FROM (
+                SELECT project_id, (created_at AT TIME ZONE 'UTC')::date AS day, severity, status,
+                       category, count(*) AS cnt, sum(extract(epoch FROM updated_at - created_at)) AS secs
+                FROM old_reports
+                GROUP BY 1, 2, 3, 4, 5
+            ) AS o
+            WHERE s.project_id = o.project_id AND s.day = o.day AND s.severity = o.severity
+              AND s.status = o.status AND s.category = o.category;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER trg_reports_daily_stats_insert "
+        "AFTER INSERT ON reports REFERENCING NEW TABLE AS new_reports "
+        "FOR EACH STATEMENT EXECUTE FUNCTION report_daily_stats_after_report_insert()"
+    )
+    op.execute(
+        "CREATE TRIGGER trg_reports_daily_stats_update "
+        "AFTER UPDATE ON reports REFERENCING OLD TABLE AS old_reports NEW TABLE AS new_reports "
+        "FOR EACH STATEMENT EXECUTE FUNCTION report_daily_stats_after_report_update()"
+    )
+    op.execute(
+        "CREATE TRIGGER trg_reports_daily_stats_delete "
+        "AFTER DELETE ON reports REFERENCING OLD TABLE AS old_reports "
+        "FOR EACH STATEMENT EXECUTE FUNCTION report_daily_stats_after_report_delete()"
+    )
+
+    # Backfill from existing reports. CREATE TRIGGER blocks report writes until
+    # this migration commits, so no row is both counted here and by a trigger.
+    op.execute(
+        """
+        INSERT INTO report_daily_stats
+            (project_id, day, severity, status, category, report_count, resolution_seconds)
+        SELECT project_id, (created_at AT TIME ZONE 'UTC')::date, severity, status, category,
+               count(*), sum(extract(epoch FROM updated_at - created_at))
+        FROM reports
+        GROUP BY 1, 2, 3, 4, 5
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_reports_daily_stats_delete ON reports")
+    op.execute("DROP TRIGGER IF EXISTS trg_reports_daily_stats_update ON reports")
+    op.execute("DROP TRIGGER IF EXISTS trg_reports_daily_stats_insert ON reports")
+    op.execute("DROP FUNCTION IF EXISTS report_daily_stats_after_report_delete()")
+    op.execute("DROP FUNCTION IF EXISTS report_daily_stats_after_report_update()")
+    op.execute("DROP FUNCTION IF EXISTS report_daily_stats_after_report_insert()")
+    op.drop_index("ix_reports_status_updated", table_name="reports")
+    op.drop_index("ix_report_daily_stats_day", table_name="report_daily_stats")
+    op.drop_table("report_daily_stats")
@@ -0,0 +1,32 @@
+"""Rebuild the report_daily_stats rollup from the reports table.
+
+Triggers keep the rollup current; run this after restoring data, after
+bulk edits made with triggers disabled, or to repair drift. Pass a project
+UUID to rebuild just that project. Safe to run repeatedly (idempotent).
+
+Run with: python scripts/backfill_report_stats.py [project_id]
+Must be executed from the packages/api/ directory.
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.database import async_session
+from app.services.stats_service import rebuild_report_daily_stats
+
+
+async def backfill(project_id: uuid.UUID | None) -> None:
+    async with async_session() as db:
+        rows = await rebuild_report_daily_stats(db, project_id)
+    scope = f"project {project_id}" if project_id else "all projects"
+    print(f"Rebuilt {rows} report_daily_stats row(s) for {scope}.")
+
+
+if __name__ == "__main__":
+    target = uuid.UUID(sys.argv[1]) if len(sys.argv) > 1 else None
+    asyncio.run(backfill(target))
@@ -0,0 +1,75 @@
+"""Render WebP renditions for report screenshots that don't have them yet.
+
+Reports created before the image pipeline, or whose processing failed, have
+no ``screenshot_renditions_at`` and are served from the original screenshot.
+This renders and stores their renditions and stamps the column. Pass a
+project UUID to limit it to that project. Safe to run repeatedly; reports
+that are already done are skipped.
+
+Run with: python scripts/backfill_screenshot_renditions.py [project_id]
+Must be executed from the packages/api/ directory.
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import func, select
+
+from app.config import get_settings
+from app.database import async_session
+from app.models.report import Report
+from app.services.image_processing_service import is_enabled, process_screenshot, shutdown_executor
+from app.services.storage_service import close_s3_client, validate_object_key
+
+BATCH_SIZE = 500
+
+
+async def backfill(project_id: uuid.UUID | None) -> None:
+    if not is_enabled():
+        print("Image processing is disabled (Pillow missing or IMAGE_PROCESSING_WORKERS=0).")
+        return
+
+    pending = [Report.screenshot_url.is_not(None), Report.screenshot_renditions_at.is_(None)]
+    if project_id is not None:
+        pending.append(Report.project_id == project_id)
+    query = select(Report.id, Report.screenshot_url).where(*pending).order_by(Report.id).limit(BATCH_SIZE)
+
+    # One in-flight screenshot per worker process keeps the pool busy without
+    # holding every original in memory at once
+    limit = asyncio.Semaphore(get_settings().IMAGE_PROCESSING_WORKERS)
+
+    async def _process(report_id: uuid.UUID, key: str) -> None:
+        async with limit:
+            await process_screenshot(report_id, key)
+
+    attempted = 0
+    last_id: uuid.UUID | None = None
+    try:
+        while True:
+            page = query if last_id is None else query.where(Report.id > last_id)
+            async with async_session() as db:
+                rows = (await db.execute(page)).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            batch = [(row.id, row.screenshot_url) for row in rows if validate_object_key(row.screenshot_url)]
+            await asyncio.gather(*(_process(report_id, key) for report_id, key in batch))
+            attempted += len(batch)
+    finally:
+        shutdown_executor()
+        await close_s3_client()
+
+    async with async_session() as db:
+        remaining = (await db.execute(select(func.count()).select_from(Report).where(*pending))).scalar_one()
+    scope = f"project {project_id}" if project_id else "all projects"
+    print(f"Processed {attempted} screenshot(s) for {scope}; {remaining} still without renditions.")
+
+
+if __name__ == "__main__":
+    target = uuid.UUID(sys.argv[1]) if len(sys.argv) > 1 else None
+    asyncio.run(backfill(target))
@@ -116,6 +116,29 @@ def _reset_rate_limiter():
     yield
 
 
+@pytest.fixture(autouse=True)
+def _clear_lookup_caches():
+    """Each test builds its own database, so cached lookups must not leak across tests."""
+    from app.services.api_key_cache_service import clear_api_key_cache
+    from app.services.billing_client import clear_billing_cache
+    from app.services.pat_usage_service import pat_usage_tracker
+    from app.services.project_access_service import clear_project_access_cache
+    from app.services.stats_service import clear_stats_cache
+    from app.services.storage_service import clear_presigned_url_cache
+    from app.services.usage_service import clear_usage_cache
+    from app.services.user_cache_service import clear_user_cache
+
+    clear_api_key_cache()
+    clear_billing_cache()
+    clear_project_access_cache()
+    clear_stats_cache()
+    clear_presigned_url_cache()
+    clear_usage_cache()
+    clear_user_cache()
+    pat_usage_tracker.clear()
+    yield
+
+
 @pytest.fixture()
 async def db_engine():
     engine = create_async_engine(
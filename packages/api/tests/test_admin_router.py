@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.project import Project
+from app.models.report import Category, Report, Severity
 from app.models.user import User
 
 
@@ -244,6 +246,36 @@ async def test_platform_stats(
     assert data["totalUsers"] >= 2
 
 
+@pytest.mark.asyncio
+async def test_platform_stats_values(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    superadmin_cookies: dict[str, str],
+    test_project: tuple[Project, str],
+) -> None:
+    project, _ = test_project
+    db_session.add(
+        Report(
+            project_id=project.id,
+            tracking_id="BUG-0001",
+            title="Counted",
+            description="Counted by the rollup",
+            severity=Severity.LOW,
+            category=Category.BUG,
+        )
+    )
+    await db_session.commit()
+
+    resp = await client.get("/api/v1/admin/stats", cookies=superadmin_cookies)
+
+    data = resp.json()
+    assert data["totalUsers"] == 2
+    assert data["totalProjects"] == 1
+    assert data["totalReports"] == 1
+    assert data["usersByPlan"] == {"free": 1, "enterprise": 1}
+    assert data["usersByRole"] == {"user": 1, "superadmin": 1}
+
+
 @pytest.mark.asyncio
 async def test_platform_stats_forbidden_for_regular_user(
     client: AsyncClient,
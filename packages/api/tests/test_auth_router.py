@@ -56,6 +56,23 @@ async def test_login_success(client: AsyncClient, test_user: User):
     assert "bugspark_csrf_token" in response.cookies
 
 
+async def test_login_rehashes_when_cost_changes(
+    client: AsyncClient, db_session: AsyncSession, test_user: User, monkeypatch
+):
+    from app.config import get_settings
+
+    monkeypatch.setenv("BCRYPT_ROUNDS", "4")
+    get_settings.cache_clear()
+    response = await client.post(
+        f"{BASE}/login",
+        json={"email": test_user.email, "password": "TestPassword123!"},
+    )
+    assert response.status_code == 200
+
+    await db_session.refresh(test_user)
+    assert test_user.hashed_password.startswith("$2b$04$")
+
+
 async def test_login_wrong_password(client: AsyncClient, test_user: User):
     response = await client.post(
         f"{BASE}/login",
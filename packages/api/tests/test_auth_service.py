@@ -11,7 +11,10 @@ from app.services.auth_service import (
     create_refresh_token,
     generate_jti,
     hash_password,
+    hash_password_async,
+    password_needs_rehash,
     verify_password,
+    verify_password_async,
     verify_token,
 )
 
@@ -40,6 +43,37 @@ def test_verify_password_incorrect():
     assert verify_password("wrongpassword", hashed) is False
 
 
+async def test_password_hashing_runs_off_the_event_loop():
+    import threading
+
+    import bcrypt
+
+    threads: list[str] = []
+    real_hashpw = bcrypt.hashpw
+
+    def recording_hashpw(*args):
+        threads.append(threading.current_thread().name)
+        return real_hashpw(*args)
+
+    with patch("app.services.auth_service.bcrypt.hashpw", side_effect=recording_hashpw):
+        hashed = await hash_password_async("offloop")
+    assert threads and threads[0].startswith("password-hash")
+    assert await verify_password_async("offloop", hashed) is True
+    assert await verify_password_async("wrong", hashed) is False
+
+
+def test_password_needs_rehash_when_cost_changes(monkeypatch):
+    hashed = hash_password("costly")
+    assert password_needs_rehash(hashed) is False
+
+    monkeypatch.setenv("BCRYPT_ROUNDS", "4")
+    from app.config import get_settings
+    get_settings.cache_clear()
+    assert password_needs_rehash(hashed) is True
+    assert password_needs_rehash(hash_password("cheap")) is False
+    assert password_needs_rehash("ACCOUNT_DELETED") is False
+
+
 def test_create_access_token_contains_claims():
     token = create_access_token("user-id-123", "user@example.com")
     payload = jwt.decode(token, "test-secret-key-that-is-at-least-32-bytes-long", algorithms=["HS256"])
@@ -0,0 +1,128 @@
+"""Tests for the async Stripe client layer, run against a local fake Stripe server."""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.services import billing_client
+from app.services.billing_client import StripeError
+
+
+class _FakeStripe(BaseHTTPRequestHandler):
+    requests: list[tuple[str, str]] = []
+    delay_seconds: float = 0.0
+
+    def _respond(self) -> None:
+        type(self).requests.append((self.command, self.path))
+        if self.delay_seconds:
+            time.sleep(self.delay_seconds)
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+
+        if self.path.startswith("/v1/invoices"):
+            body = {
+                "object": "list",
+                "url": "/v1/invoices",
+                "has_more": False,
+                "data": [{"id": "in_1", "object": "invoice", "created": 1700000000, "amount_paid": 900, "status": "paid"}],
+            }
+        elif self.path.startswith("/v1/subscriptions/"):
+            body = {"id": self.path.rsplit("/", 1)[-1], "object": "subscription", "customer": "cus_1", "status": "active"}
+        else:
+            body = {"id": "cus_1", "object": "customer"}
+
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = _respond
+    do_POST = _respond
+
+    def log_message(self, *args) -> None:  # silence test output
+        pass
+
+
+class _QuietServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address) -> None:
+        # Timed-out clients hang up before the delayed response is written
+        pass
+
+
+@pytest.fixture()
+def fake_stripe(monkeypatch):
+    _FakeStripe.requests = []
+    _FakeStripe.delay_seconds = 0.0
+    server = _QuietServer(("127.0.0.1", 0), _FakeStripe)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("STRIPE_API_BASE", f"http://127.0.0.1:{server.server_address[1]}")
+    monkeypatch.setenv("STRIPE_SECRET_KEY", "sk_test_fake")
+    billing_client.get_settings.cache_clear()
+    yield _FakeStripe
+    server.shutdown()
+    server.server_close()
+
+
+async def test_list_invoices_is_cached(fake_stripe):
+    first = await billing_client.list_invoices("cus_1")
+    second = await billing_client.list_invoices("cus_1")
+
+    assert first.data[0].id == "in_1"
+    assert second is first
+    assert [path for _, path in fake_stripe.requests if path.startswith("/v1/invoices")] == [
+        "/v1/invoices?customer=cus_1&limit=24"
+    ]
+
+
+async def test_modify_subscription_evicts_cached_state(fake_stripe):
+    await billing_client.list_invoices("cus_1")
+    await billing_client.retrieve_subscription("sub_1")
+    await billing_client.retrieve_subscription("sub_1")
+
+    await billing_client.modify_subscription("sub_1", cancel_at_period_end=True)
+    await billing_client.retrieve_subscription("sub_1")
+    await billing_client.list_invoices("cus_1")
+
+    methods = [(method, path.split("?")[0]) for method, path in fake_stripe.requests]
+    assert methods == [
+        ("GET", "/v1/invoices"),
+        ("GET", "/v1/subscriptions/sub_1"),
+        ("POST", "/v1/subscriptions/sub_1"),
+        ("GET", "/v1/subscriptions/sub_1"),
+        ("GET", "/v1/invoices"),
+    ]
+
+
+async def test_fresh_subscription_read_bypasses_cache(fake_stripe):
+    await billing_client.retrieve_subscription("sub_1")
+    await billing_client.retrieve_subscription("sub_1", fresh=True)
+    await billing_client.retrieve_subscription("sub_1")
+
+    assert [path for _, path in fake_stripe.requests] == ["/v1/subscriptions/sub_1"] * 2
+
+
+async def test_webhook_event_evicts_cached_state(fake_stripe):
+    await billing_client.retrieve_subscription("sub_1")
+    billing_client.invalidate_for_event("customer.subscription.updated", {"id": "sub_1", "customer": "cus_1"})
+    await billing_client.retrieve_subscription("sub_1")
+
+    assert len(fake_stripe.requests) == 2
+
+
+async def test_slow_stripe_raises_stripe_error(fake_stripe, monkeypatch):
+    fake_stripe.delay_seconds = 1.0
+    monkeypatch.setenv("STRIPE_TIMEOUT_SECONDS", "0.1")
+    billing_client.get_settings.cache_clear()
+
+    started = time.monotonic()
+    with pytest.raises(StripeError):
+        await billing_client.create_customer(email="slow@example.com")
+    assert time.monotonic() - started < 1.0
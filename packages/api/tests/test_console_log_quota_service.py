@@ -0,0 +1,96 @@
+"""Tests for the per-day console-log quota counter."""
+from __future__ import annotations
+
+from datetime import timedelta
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.console_log_usage import ConsoleLogUsage
+from app.models.project import Project
+from app.services.console_log_quota_service import (
+    CONSOLE_LOG_DAILY_LIMIT,
+    cleanup_old_console_log_usage,
+    clear_console_log_usage_cache,
+    get_console_log_usage,
+    reserve_console_log_slot,
+    reserve_console_log_slots,
+    utc_today,
+)
+
+
+async def test_reserve_stops_at_daily_limit(
+    db_session: AsyncSession, test_project: tuple[Project, str]
+):
+    project, _ = test_project
+    for _ in range(CONSOLE_LOG_DAILY_LIMIT):
+        assert await reserve_console_log_slot(db_session, project.id) is True
+    assert await reserve_console_log_slot(db_session, project.id) is False
+    await db_session.commit()
+
+    result = await db_session.execute(
+        select(ConsoleLogUsage.used).where(ConsoleLogUsage.project_id == project.id)
+    )
+    assert result.scalar_one() == CONSOLE_LOG_DAILY_LIMIT
+
+
+async def test_reserve_slots_grants_only_what_is_left(
+    db_session: AsyncSession, test_project: tuple[Project, str]
+):
+    project, _ = test_project
+    assert await reserve_console_log_slots(db_session, project.id, 3) == 3
+    assert await reserve_console_log_slots(db_session, project.id, 3) == CONSOLE_LOG_DAILY_LIMIT - 3
+    assert await reserve_console_log_slots(db_session, project.id, 3) == 0
+    assert await get_console_log_usage(db_session, project.id) == CONSOLE_LOG_DAILY_LIMIT
+
+
+async def test_reserve_slots_caps_a_first_grant_at_the_limit(
+    db_session: AsyncSession, test_project: tuple[Project, str]
+):
+    project, _ = test_project
+    assert await reserve_console_log_slots(db_session, project.id, CONSOLE_LOG_DAILY_LIMIT + 4) == (
+        CONSOLE_LOG_DAILY_LIMIT
+    )
+    assert await reserve_console_log_slot(db_session, project.id) is False
+
+
+async def test_usage_is_read_from_counter_then_cached(
+    db_session: AsyncSession, test_project: tuple[Project, str]
+):
+    project, _ = test_project
+    clear_console_log_usage_cache()
+    assert await get_console_log_usage(db_session, project.id) == 0
+
+    db_session.add(ConsoleLogUsage(project_id=project.id, day=utc_today(), used=2))
+    await db_session.commit()
+    # Cached zero is served until it expires or a committed reservation refreshes it
+    assert await get_console_log_usage(db_session, project.id) == 0
+
+    await reserve_console_log_slot(db_session, project.id)
+    assert await get_console_log_usage(db_session, project.id) == 0
+    await db_session.commit()
+    assert await get_console_log_usage(db_session, project.id) == 3
+
+
+async def test_rolled_back_reservation_is_not_cached(
+    db_session: AsyncSession, test_project: tuple[Project, str]
+):
+    project_id = test_project[0].id
+    clear_console_log_usage_cache()
+    assert await reserve_console_log_slots(db_session, project_id, 3) == 3
+    await db_session.rollback()
+
+    assert await get_console_log_usage(db_session, project_id) == 0
+
+
+async def test_cleanup_removes_old_days(
+    db_session: AsyncSession, test_project: tuple[Project, str]
+):
+    project, _ = test_project
+    db_session.add_all([
+        ConsoleLogUsage(project_id=project.id, day=utc_today() - timedelta(days=30), used=5),
+        ConsoleLogUsage(project_id=project.id, day=utc_today(), used=1),
+    ])
+    await db_session.commit()
+
+    assert await cleanup_old_console_log_usage(db_session) == 1
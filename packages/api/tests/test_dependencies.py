@@ -5,6 +5,7 @@ from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.dependencies import get_current_user, validate_api_key
@@ -43,6 +44,48 @@ async def test_get_current_user_valid_token(
     assert user.email == test_user.email
 
 
+async def test_get_current_user_served_from_cache(
+    db_session: AsyncSession, test_user: User
+):
+    token = create_access_token(str(test_user.id), test_user.email)
+    request = _mock_request(cookies={"bugspark_access_token": token})
+    await get_current_user(request=request, db=db_session)
+
+    mock_db = MagicMock()
+    mock_db.execute = AsyncMock()
+    cached = await get_current_user(request=request, db=mock_db)
+
+    mock_db.execute.assert_not_awaited()
+    mock_db.add.assert_called_once_with(cached)
+    assert cached.id == test_user.id
+    assert cached.plan == test_user.plan
+
+
+async def test_cached_user_changes_persist_and_admin_changes_evict(
+    client: AsyncClient,
+    auth_cookies: dict[str, str],
+    superadmin_cookies: dict[str, str],
+    csrf_headers: dict[str, str],
+    test_user: User,
+):
+    assert (await client.get("/api/v1/reports", cookies=auth_cookies)).status_code == 200
+
+    response = await client.patch(
+        "/api/v1/auth/me", json={"name": "Renamed"}, cookies=auth_cookies, headers=csrf_headers
+    )
+    assert response.json()["name"] == "Renamed"
+    assert (await client.get("/api/v1/auth/me", cookies=auth_cookies)).json()["name"] == "Renamed"
+
+    response = await client.patch(
+        f"/api/v1/admin/users/{test_user.id}",
+        json={"is_active": False},
+        cookies=superadmin_cookies,
+        headers=csrf_headers,
+    )
+    assert response.status_code == 200
+    assert (await client.get("/api/v1/reports", cookies=auth_cookies)).status_code == 401
+
+
 async def test_get_current_user_invalid_token(db_session: AsyncSession):
     request = _mock_request(cookies={"bugspark_access_token": "invalid-token-here"})
 
@@ -78,3 +121,84 @@ async def test_validate_api_key_invalid(db_session: AsyncSession):
             x_api_key="bsk_pub_invalid_key_that_does_not_exist",
             db=db_session,
         )
+
+
+async def test_validate_api_key_served_from_cache(
+    db_session: AsyncSession, test_project: tuple[Project, str]
+):
+    project, raw_key = test_project
+    await validate_api_key(request=_mock_request(), x_api_key=raw_key, db=db_session)
+
+    mock_db = AsyncMock()
+    cached = await validate_api_key(request=_mock_request(), x_api_key=raw_key, db=mock_db)
+
+    mock_db.execute.assert_not_awaited()
+    assert cached.id == project.id
+    assert cached.owner.plan == project.owner.plan
+
+
+async def test_validate_api_key_caches_invalid_keys(db_session: AsyncSession):
+    bad_key = "bsk_pub_cached_invalid_key"
+    with pytest.raises(UnauthorizedException):
+        await validate_api_key(request=_mock_request(), x_api_key=bad_key, db=db_session)
+
+    mock_db = AsyncMock()
+    with pytest.raises(UnauthorizedException):
+        await validate_api_key(request=_mock_request(), x_api_key=bad_key, db=mock_db)
+    mock_db.execute.assert_not_awaited()
+
+
+async def test_validate_api_key_cache_evicted_on_changes(
+    db_session: AsyncSession, test_project: tuple[Project, str], test_user: User
+):
+    from app.models.enums import Plan
+
+    project, raw_key = test_project
+    await validate_api_key(request=_mock_request(), x_api_key=raw_key, db=db_session)
+
+    test_user.plan = Plan.TEAM
+    await db_session.commit()
+    validated = await validate_api_key(request=_mock_request(), x_api_key=raw_key, db=db_session)
+    assert validated.owner.plan == Plan.TEAM
+
+    project.is_active = False
+    await db_session.commit()
+    with pytest.raises(UnauthorizedException):
+        await validate_api_key(request=_mock_request(), x_api_key=raw_key, db=db_session)
+
+    # The deactivated key is now negatively cached; reactivating must clear it
+    project.is_active = True
+    await db_session.commit()
+    validated = await validate_api_key(request=_mock_request(), x_api_key=raw_key, db=db_session)
+    assert validated.id == project.id
+
+
+async def test_validate_api_key_cache_evicted_when_owner_deleted(
+    db_session: AsyncSession, test_project: tuple[Project, str], test_user: User
+):
+    _, raw_key = test_project
+    await validate_api_key(request=_mock_request(), x_api_key=raw_key, db=db_session)
+
+    # Projects go with the user by FK cascade, outside the session
+    await db_session.delete(test_user)
+    await db_session.commit()
+
+    with pytest.raises(UnauthorizedException):
+        await validate_api_key(request=_mock_request(), x_api_key=raw_key, db=db_session)
+
+
+async def test_invalid_keys_do_not_evict_valid_ones(
+    db_session: AsyncSession, test_project: tuple[Project, str]
+):
+    from app.services import api_key_cache_service
+
+    project, raw_key = test_project
+    await validate_api_key(request=_mock_request(), x_api_key=raw_key, db=db_session)
+
+    for _ in range(api_key_cache_service._api_key_cache.max_size + 1):
+        api_key_cache_service.cache_invalid_key(uuid.uuid4().hex)
+
+    mock_db = AsyncMock()
+    cached = await validate_api_key(request=_mock_request(), x_api_key=raw_key, db=mock_db)
+    mock_db.execute.assert_not_awaited()
+    assert cached.id == project.id
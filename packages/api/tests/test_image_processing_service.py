@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import io
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock
+
+import pytest
+from httpx import AsyncClient
+
+import app.services.image_processing_service as image_mod
+from app.config import get_settings
+from app.models.project import Project
+from app.services.image_processing_service import mark_renditions_stored
+from app.services.storage_service import variant_key, with_variant_keys
+
+UPLOAD_KEY = f"{uuid.uuid4()}/{uuid.uuid4()}/{uuid.uuid4()}.png"
+REPORT_ID = uuid.uuid4()
+
+
+def _fake_render(data: bytes) -> tuple[bytes, bytes]:
+    return b"thumb:" + data[:4], b"opt:" + data
+
+
+@pytest.fixture()
+def pipeline(monkeypatch):
+    """Pipeline enabled, rendering on a thread with stubbed storage and DB I/O."""
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(image_mod, "Image", object())
+    monkeypatch.setattr(image_mod, "_get_executor", lambda: executor)
+    monkeypatch.setattr(image_mod, "render_variants", _fake_render)
+    download = AsyncMock(return_value=b"\x89PNG original")
+    store = AsyncMock()
+    mark = AsyncMock()
+    monkeypatch.setattr(image_mod, "download_file", download)
+    monkeypatch.setattr(image_mod, "store_variant", store)
+    monkeypatch.setattr(image_mod, "mark_renditions_stored", mark)
+    yield download, store, mark
+    executor.shutdown()
+
+
+def test_variant_keys():
+    stem = UPLOAD_KEY.rsplit(".", 1)[0]
+    assert variant_key(UPLOAD_KEY, "thumb") == f"{stem}.thumb.webp"
+    assert with_variant_keys([UPLOAD_KEY, "https://cdn.example.com/a.png"]) == [
+        UPLOAD_KEY,
+        "https://cdn.example.com/a.png",
+        f"{stem}.thumb.webp",
+        f"{stem}.opt.webp",
+    ]
+
+
+async def test_process_screenshot_stores_both_renditions(pipeline):
+    download, store, mark = pipeline
+
+    await image_mod.process_screenshot(REPORT_ID, UPLOAD_KEY)
+
+    download.assert_awaited_once_with(UPLOAD_KEY)
+    assert sorted(call.args for call in store.await_args_list) == [
+        (UPLOAD_KEY, "opt", b"opt:\x89PNG original"),
+        (UPLOAD_KEY, "thumb", b"thumb:\x89PNG"),
+    ]
+    mark.assert_awaited_once_with(REPORT_ID)
+
+
+async def test_process_screenshot_logs_render_failures(pipeline, monkeypatch):
+    _, store, mark = pipeline
+
+    def _broken(data: bytes) -> tuple[bytes, bytes]:
+        raise OSError("cannot identify image file")
+
+    monkeypatch.setattr(image_mod, "render_variants", _broken)
+
+    await image_mod.process_screenshot(REPORT_ID, UPLOAD_KEY)
+
+    store.assert_not_awaited()
+    mark.assert_not_awaited()
+
+
+async def test_process_screenshot_disabled_without_workers(pipeline, monkeypatch):
+    download, _, _ = pipeline
+    monkeypatch.setenv("IMAGE_PROCESSING_WORKERS", "0")
+    get_settings.cache_clear()
+    try:
+        await image_mod.process_screenshot(REPORT_ID, UPLOAD_KEY)
+    finally:
+        get_settings.cache_clear()
+
+    download.assert_not_awaited()
+
+
+async def _create_screenshot_report(client: AsyncClient, project: Project, raw_key: str) -> tuple[str, str]:
+    key = f"{project.owner_id}/{project.id}/{uuid.uuid4()}.png"
+    created = await client.post(
+        "/api/v1/reports",
+        json={
+            "title": "Screenshot bug",
+            "description": "Has a screenshot",
+            "severity": "low",
+            "category": "bug",
+            "screenshot_url": key,
+        },
+        headers={"X-API-Key": raw_key},
+    )
+    assert created.status_code == 201
+    return created.json()["id"], key.rsplit(".", 1)[0]
+
+
+async def test_report_detail_points_at_renditions(
+    pipeline,
+    monkeypatch,
+    client: AsyncClient,
+    test_project: tuple[Project, str],
+    auth_cookies: dict[str, str],
+    superadmin_cookies: dict[str, str],
+) -> None:
+    project, raw_key = test_project
+    monkeypatch.setattr(image_mod, "mark_renditions_stored", mark_renditions_stored)
+
+    # The background task renders the screenshot once the report exists
+    report_id, stem = await _create_screenshot_report(client, project, raw_key)
+
+    detail = (await client.get(f"/api/v1/reports/{report_id}", cookies=auth_cookies)).json()
+    assert f"{stem}.thumb.webp" in detail["screenshotThumbnailUrl"]
+    assert f"{stem}.opt.webp" in detail["screenshotOptimizedUrl"]
+
+    listing = (await client.get("/api/v1/reports", cookies=auth_cookies)).json()
+    assert f"{stem}.thumb.webp" in listing["items"][0]["screenshotThumbnailUrl"]
+
+    admin_listing = (await client.get("/api/v1/admin/reports", cookies=superadmin_cookies)).json()
+    assert f"{stem}.thumb.webp" in admin_listing["items"][0]["screenshotThumbnailUrl"]
+
+
+async def test_unprocessed_screenshot_has_no_rendition_urls(
+    pipeline,
+    monkeypatch,
+    client: AsyncClient,
+    test_project: tuple[Project, str],
+    auth_cookies: dict[str, str],
+) -> None:
+    """A failed render leaves nothing to sign, so clients use the original."""
+    project, raw_key = test_project
+    monkeypatch.setattr(image_mod, "mark_renditions_stored", mark_renditions_stored)
+    monkeypatch.setattr(image_mod, "download_file", AsyncMock(side_effect=OSError("gone")))
+
+    report_id, _ = await _create_screenshot_report(client, project, raw_key)
+
+    detail = (await client.get(f"/api/v1/reports/{report_id}", cookies=auth_cookies)).json()
+    assert detail["screenshotUrl"]
+    assert detail["screenshotThumbnailUrl"] is None
+    assert detail["screenshotOptimizedUrl"] is None
+
+    listing = (await client.get("/api/v1/reports", cookies=auth_cookies)).json()
+    assert listing["items"][0]["screenshotThumbnailUrl"] is None
+
+
+def test_render_variants_produces_small_webp():
+    image_module = pytest.importorskip("PIL.Image")
+    source = io.BytesIO()
+    image_module.new("RGBA", (2560, 1600), (200, 30, 30, 255)).save(source, "PNG")
+
+    thumbnail, optimized = image_mod.render_variants(source.getvalue())
+
+    with image_module.open(io.BytesIO(thumbnail)) as thumb:
+        assert thumb.format == "WEBP"
+        assert max(thumb.size) == max(image_mod.THUMBNAIL_MAX_SIZE)
+    with image_module.open(io.BytesIO(optimized)) as full:
+        assert full.size == (2560, 1600)
+
+
+def test_render_variants_rejects_images_over_the_pixel_limit(monkeypatch):
+    image_module = pytest.importorskip("PIL.Image")
+    source = io.BytesIO()
+    image_module.new("RGB", (12, 12)).save(source, "PNG")
+    # 144 pixels is within Pillow's warn-only band (1x-2x the limit)
+    monkeypatch.setattr(image_module, "MAX_IMAGE_PIXELS", 100)
+
+    with pytest.raises(image_module.DecompressionBombWarning):
+        image_mod.render_variants(source.getvalue())
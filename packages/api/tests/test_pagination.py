@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql.asyncpg import PGDialect_asyncpg
+
+from app.exceptions import BadRequestException
+from app.models.report import Report, Status
+from app.services.report_list_service import REPORT_LIST_COLUMNS
+from app.utils.pagination import count_rows, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc)
+    row_id = uuid.uuid4()
+    assert decode_cursor(encode_cursor(created_at, row_id)) == (created_at, row_id, None)
+    assert decode_cursor(encode_cursor(created_at, row_id, 0.0607927)) == (created_at, row_id, 0.0607927)
+
+
+@pytest.mark.parametrize("cursor", ["", "!!!", "bm90IGpzb24", "WyJ4IiwieSJd"])
+def test_decode_cursor_rejects_garbage(cursor: str):
+    with pytest.raises(BadRequestException):
+        decode_cursor(cursor)
+
+
+async def test_count_rows_uses_planner_estimate_on_postgres():
+    plan_result = MagicMock()
+    plan_result.scalar_one.return_value = [{"Plan": {"Plan Rows": 1234}}]
+    db = AsyncMock()
+    db.bind = MagicMock()
+    db.bind.dialect = PGDialect_asyncpg()
+    db.execute.return_value = plan_result
+
+    query = (
+        select(*REPORT_LIST_COLUMNS)
+        .where(Report.project_id == uuid.uuid4(), Report.status == Status.NEW)
+        .where(Report.title.ilike("%50\\% off%"))
+    )
+    assert await count_rows(db, query, exact=False) == (1234, True)
+
+    db.execute.assert_awaited_once()
+    compiled = db.execute.await_args.args[0].compile(dialect=PGDialect_asyncpg())
+    sql = str(compiled)
+    assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT")
+    # Filter values stay bound parameters, never inline SQL literals
+    assert "off" not in sql and "'new'" not in sql
+    assert "%50\\% off%" in compiled.params.values()
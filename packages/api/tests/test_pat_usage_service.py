@@ -0,0 +1,83 @@
+"""Tests for coalesced PAT last_used_at writes."""
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.dependencies import get_current_user
+from app.models.personal_access_token import PersonalAccessToken
+from app.models.user import User
+from app.services.auth_service import create_cli_pat
+from app.services.pat_usage_service import pat_usage_tracker
+
+
+def _bearer_request(raw_token: str) -> MagicMock:
+    request = MagicMock()
+    request.cookies = {}
+    request.headers = {"Authorization": f"Bearer {raw_token}", "Accept-Language": "en"}
+    return request
+
+
+async def _last_used(db_session: AsyncSession, token_id) -> object:
+    result = await db_session.execute(
+        select(PersonalAccessToken.last_used_at).where(PersonalAccessToken.id == token_id)
+    )
+    return result.scalar_one()
+
+
+async def test_pat_use_is_recorded_in_memory_then_flushed(db_session: AsyncSession, test_user: User):
+    raw_token, pat = create_cli_pat(test_user.id)
+    db_session.add(pat)
+    await db_session.commit()
+
+    user = await get_current_user(request=_bearer_request(raw_token), db=db_session)
+    assert user.id == test_user.id
+    assert await _last_used(db_session, pat.id) is None
+    assert pat_usage_tracker.pending_last_used(pat.id) is not None
+
+    assert await pat_usage_tracker.flush(db_session) == 1
+    assert await _last_used(db_session, pat.id) is not None
+    assert pat_usage_tracker.pending_last_used(pat.id) is None
+
+
+async def test_flush_writes_each_token_at_most_once_per_interval(
+    db_session: AsyncSession, test_user: User
+):
+    raw_token, pat = create_cli_pat(test_user.id)
+    db_session.add(pat)
+    await db_session.commit()
+    request = _bearer_request(raw_token)
+
+    with patch("app.services.pat_usage_service.time.monotonic", return_value=1000.0):
+        await get_current_user(request=request, db=db_session)
+        assert await pat_usage_tracker.flush(db_session) == 1
+        await get_current_user(request=request, db=db_session)
+        assert await pat_usage_tracker.flush(db_session) == 0
+
+    with patch("app.services.pat_usage_service.time.monotonic", return_value=1030.0):
+        # Shutdown flush ignores the interval
+        assert await pat_usage_tracker.flush(db_session, force=True) == 1
+    assert pat_usage_tracker.pending_last_used(pat.id) is None
+
+
+async def test_flush_skips_tokens_revoked_before_flush(db_session: AsyncSession, test_user: User):
+    raw_revoked, revoked = create_cli_pat(test_user.id)
+    raw_kept, kept = create_cli_pat(test_user.id)
+    db_session.add_all([revoked, kept])
+    await db_session.commit()
+
+    await get_current_user(request=_bearer_request(raw_revoked), db=db_session)
+    await get_current_user(request=_bearer_request(raw_kept), db=db_session)
+    await db_session.delete(revoked)
+    await db_session.commit()
+
+    await pat_usage_tracker.flush(db_session)
+
+    assert await _last_used(db_session, kept.id) is not None
+    assert pat_usage_tracker.pending_last_used(revoked.id) is None
+
+    # Later flushes keep working
+    await get_current_user(request=_bearer_request(raw_kept), db=db_session)
+    assert await pat_usage_tracker.flush(db_session, force=True) == 1
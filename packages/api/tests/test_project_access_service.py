@@ -0,0 +1,100 @@
+"""Tests for the cached accessible-project lookup and its invalidation."""
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.enums import Plan, Role
+from app.models.project import Project
+from app.models.project_member import ProjectMember
+from app.models.report import Report
+from app.models.user import User
+from app.services.auth_service import hash_password
+from app.services.project_access_service import (
+    accessible_project_filter,
+    get_accessible_project_ids,
+)
+from app.services.team_service import accept_invite, remove_member
+
+
+@pytest.fixture()
+async def teammate(db_session: AsyncSession) -> User:
+    user = User(
+        id=uuid.uuid4(),
+        email="teammate@example.com",
+        hashed_password=hash_password("Pass123!"),
+        name="Teammate",
+        role=Role.USER,
+        plan=Plan.FREE,
+        is_active=True,
+        created_at=datetime.now(timezone.utc),
+        updated_at=datetime.now(timezone.utc),
+    )
+    db_session.add(user)
+    await db_session.commit()
+    return user
+
+
+async def test_owner_projects_are_cached_until_create_project(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    auth_cookies: dict[str, str],
+    csrf_headers: dict[str, str],
+    test_user: User,
+    test_project: tuple[Project, str],
+):
+    project, _ = test_project
+    test_user.plan = Plan.TEAM
+    await db_session.commit()
+    assert await get_accessible_project_ids(project.owner_id, db_session) == {project.id}
+
+    db_session.add(
+        Project(
+            owner_id=project.owner_id,
+            name="Written directly",
+            domain="direct.example.com",
+            api_key_hash="x" * 64,
+            api_key_prefix="bsk_pub_xxxx",
+        )
+    )
+    await db_session.commit()
+    assert await get_accessible_project_ids(project.owner_id, db_session) == {project.id}
+
+    response = await client.post(
+        "/api/v1/projects",
+        json={"name": "New", "domain": "new.example.com"},
+        cookies=auth_cookies,
+        headers=csrf_headers,
+    )
+    assert response.status_code == 201
+    assert len(await get_accessible_project_ids(project.owner_id, db_session)) == 3
+
+
+async def test_accept_and_remove_invalidate_membership(
+    db_session: AsyncSession, test_project: tuple[Project, str], teammate: User
+):
+    project, _ = test_project
+    member = ProjectMember(
+        project_id=project.id, email=teammate.email, role="viewer", invite_token="invite-token"
+    )
+    db_session.add(member)
+    await db_session.commit()
+    assert await get_accessible_project_ids(teammate.id, db_session) == frozenset()
+
+    await accept_invite(db_session, "invite-token", teammate, "en")
+    assert await get_accessible_project_ids(teammate.id, db_session) == {project.id}
+
+    await remove_member(db_session, str(project.id), str(member.id), "en")
+    assert await get_accessible_project_ids(teammate.id, db_session) == frozenset()
+
+
+def test_list_filter_is_a_subquery_not_an_id_list():
+    condition = accessible_project_filter(uuid.uuid4(), Report.project_id)
+    sql = str(condition.compile(dialect=postgresql.dialect()))
+    assert sql.startswith("reports.project_id IN (SELECT projects.id")
+    assert "UNION SELECT project_members.project_id" in sql
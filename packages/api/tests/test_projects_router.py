@@ -98,8 +98,12 @@ async def test_rotate_api_key(
     csrf_headers: dict[str, str],
     test_project: tuple[Project, str],
 ):
-    project, _ = test_project
+    project, old_key = test_project
     original_prefix = project.api_key_prefix
+    # Warm the API-key cache with the old key
+    warm = await client.get(f"{BASE}/widget-config", headers={"X-API-Key": old_key})
+    assert warm.status_code == 200
+
     response = await client.post(
         f"{BASE}/{project.id}/rotate-key", cookies=auth_cookies, headers=csrf_headers
     )
@@ -109,7 +113,100 @@ async def test_rotate_api_key(
     # The full new key differs from just the old prefix
     assert data["apiKey"][:12] != original_prefix or len(data["apiKey"]) > 12
 
+    stale = await client.get(f"{BASE}/widget-config", headers={"X-API-Key": old_key})
+    assert stale.status_code == 401
+    fresh = await client.get(f"{BASE}/widget-config", headers={"X-API-Key": data["apiKey"]})
+    assert fresh.status_code == 200
+
 
 async def test_project_requires_auth(client: AsyncClient):
     response = await client.get(BASE)
     assert response.status_code == 401
+
+
+async def test_console_log_quota_reflects_reservations(
+    client: AsyncClient, test_project: tuple[Project, str]
+):
+    project, raw_key = test_project
+    headers = {"X-API-Key": raw_key}
+
+    response = await client.get(f"{BASE}/console-log-quota", headers=headers)
+    assert response.status_code == 200
+    assert response.json() == {"remaining": 5, "limit": 5, "allowed": True}
+
+    create = await client.post(
+        "/api/v1/reports",
+        json={
+            "title": "Console bug",
+            "severity": "low",
+            "category": "bug",
+            "console_logs": [{"level": "error", "message": "boom"}],
+        },
+        headers=headers,
+    )
+    assert create.status_code == 201
+    assert create.json()["consoleLogsIncluded"] is True
+
+    response = await client.get(f"{BASE}/console-log-quota", headers=headers)
+    assert response.json()["remaining"] == 4
+
+
+async def test_widget_bootstrap_revalidates_with_etag(
+    client: AsyncClient,
+    auth_cookies: dict[str, str],
+    csrf_headers: dict[str, str],
+    test_project: tuple[Project, str],
+):
+    project, raw_key = test_project
+    headers = {"X-API-Key": raw_key}
+
+    response = await client.get(f"{BASE}/widget-bootstrap", headers=headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["config"]["ownerPlan"] == "free"
+    assert data["consoleLogQuota"] == {"remaining": 5, "limit": 5, "allowed": True}
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+    not_modified = await client.get(
+        f"{BASE}/widget-bootstrap", headers={**headers, "If-None-Match": etag}
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+    await client.patch(
+        f"{BASE}/{project.id}",
+        json={"settings": {"widgetColor": "#000000"}},
+        cookies=auth_cookies,
+        headers=csrf_headers,
+    )
+    changed = await client.get(
+        f"{BASE}/widget-bootstrap", headers={**headers, "If-None-Match": etag}
+    )
+    assert changed.status_code == 200
+    assert changed.json()["config"]["primaryColor"] == "#000000"
+    assert changed.headers["ETag"] != etag
+
+
+async def test_widget_config_sends_cache_validators(
+    client: AsyncClient, test_project: tuple[Project, str]
+):
+    _, raw_key = test_project
+    headers = {"X-API-Key": raw_key}
+
+    response = await client.get(f"{BASE}/widget-config", headers=headers)
+    assert response.status_code == 200
+    assert "max-age" in response.headers["Cache-Control"]
+
+    # The widget middleware reflects Origin into ACAO, so shared caches must vary on it
+    cross_origin = await client.get(
+        f"{BASE}/widget-config", headers={**headers, "Origin": "https://customer.example.com"}
+    )
+    assert cross_origin.headers["Access-Control-Allow-Origin"] == "https://customer.example.com"
+    assert [v.strip() for v in cross_origin.headers["Vary"].split(",")] == ["X-API-Key", "Origin"]
+
+    not_modified = await client.get(
+        f"{BASE}/widget-config",
+        headers={**headers, "If-None-Match": response.headers["ETag"]},
+    )
+    assert not_modified.status_code == 304
@@ -0,0 +1,145 @@
+"""Tests for the consolidated report ingest path."""
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects.postgresql import asyncpg
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.exceptions import BadRequestException, ForbiddenException
+from app.models.enums import Plan, Role
+from app.models.project import Project
+from app.models.report import Status
+from app.schemas.report import ReportCreate
+from app.services.console_log_quota_service import get_console_log_usage
+from app.services import usage_service
+from app.services.report_ingest_service import _PG_INGEST_SQL, ingest_report
+from app.services.usage_counter_service import month_period
+
+
+def _body(**overrides) -> ReportCreate:
+    data = {
+        "title": "Checkout crash",
+        "description": "Crashes on submit",
+        "severity": "high",
+        "category": "crash",
+    }
+    data.update(overrides)
+    return ReportCreate(**data)
+
+
+@pytest.fixture
+def allocated_tracking_id():
+    """The PG path takes its tracking ID from the block allocator before the statement."""
+    with patch(
+        "app.services.report_ingest_service.generate_tracking_id",
+        AsyncMock(return_value="BUG-0007"),
+    ):
+        yield
+
+
+def _pg_session(row: SimpleNamespace) -> AsyncMock:
+    mock_result = MagicMock()
+    mock_result.one.return_value = row
+    mock_db = AsyncMock()
+    mock_db.bind = SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+    mock_db.execute.return_value = mock_result
+    mock_db.info = {}
+    return mock_db
+
+
+def _pg_project() -> SimpleNamespace:
+    owner = SimpleNamespace(id=uuid.uuid4(), role=Role.USER, plan=Plan.FREE)
+    return SimpleNamespace(id=uuid.uuid4(), owner_id=owner.id, owner=owner)
+
+
+def _gate_row(**overrides) -> SimpleNamespace:
+    now = datetime.now(timezone.utc)
+    row = {
+        "duplicate_created_at": None,
+        "project_limit_hit": False,
+        "monthly_limit_hit": False,
+        "tracking_id": "BUG-0007",
+        "status": "new",
+        "console_logs_included": False,
+        "created_at": now,
+        "updated_at": now,
+        "console_logs_used": None,
+    }
+    row.update(overrides)
+    return SimpleNamespace(**row)
+
+
+def test_pg_ingest_statement_compiles_for_asyncpg():
+    compiled = _PG_INGEST_SQL.compile(dialect=asyncpg.dialect())
+    assert "INSERT INTO reports" in str(compiled)
+    assert "UPDATE projects" not in str(compiled)
+    assert "INSERT INTO console_log_usage" in str(compiled)
+
+
+async def test_pg_ingest_uses_single_statement(allocated_tracking_id):
+    mock_db = _pg_session(_gate_row())
+
+    report = await ingest_report(mock_db, _pg_project(), _body())
+
+    mock_db.execute.assert_awaited_once()
+    mock_db.commit.assert_awaited_once()
+    assert report.tracking_id == "BUG-0007"
+    assert report.status == Status.NEW
+
+
+async def test_pg_ingest_caches_console_log_usage(allocated_tracking_id):
+    project = _pg_project()
+    mock_db = _pg_session(_gate_row(console_logs_included=True, console_logs_used=3))
+
+    report = await ingest_report(mock_db, project, _body(console_logs=[{"level": "error"}]))
+
+    assert report.console_logs_included is True
+    assert await get_console_log_usage(mock_db, project.id) == 3
+    mock_db.execute.assert_awaited_once()
+
+
+async def test_pg_ingest_evicts_usage_snapshot_on_commit(allocated_tracking_id):
+    project = _pg_project()
+    period = month_period()
+    usage_service._usage_cache.set(
+        (project.owner_id, period),
+        usage_service.UsageSnapshot(frozenset({project.id}), (), 4, 4),
+    )
+    mock_db = _pg_session(_gate_row())
+    # Stand in for the Session after_commit event the real session fires
+    mock_db.commit.side_effect = lambda: usage_service._apply_invalidations(mock_db)
+
+    await ingest_report(mock_db, project, _body())
+
+    assert usage_service._usage_cache.get((project.owner_id, period)) is None
+
+
+async def test_pg_ingest_rejects_duplicate(allocated_tracking_id):
+    mock_db = _pg_session(_gate_row(duplicate_created_at=datetime.now(timezone.utc), tracking_id=None))
+
+    with pytest.raises(BadRequestException, match="Duplicate"):
+        await ingest_report(mock_db, _pg_project(), _body())
+    mock_db.commit.assert_not_awaited()
+
+
+async def test_pg_ingest_reports_monthly_limit(allocated_tracking_id):
+    mock_db = _pg_session(_gate_row(monthly_limit_hit=True, tracking_id=None))
+
+    with pytest.raises(ForbiddenException, match="per month"):
+        await ingest_report(mock_db, _pg_project(), _body())
+
+
+async def test_fallback_ingest_rejects_duplicate(
+    db_session: AsyncSession, test_project: tuple[Project, str]
+):
+    project, _ = test_project
+    first = await ingest_report(db_session, project, _body())
+    assert first.tracking_id == "BUG-0001"
+
+    with pytest.raises(BadRequestException, match="Duplicate"):
+        await ingest_report(db_session, project, _body())
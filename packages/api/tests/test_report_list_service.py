@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from app.models.report import Category, Report, Severity, Status
+from app.services.report_list_service import (
+    count_report_facets,
+    report_search_filter,
+    search_prefix_query,
+)
+
+
+def test_search_prefix_query_keeps_only_words():
+    assert search_prefix_query("login  crash") == "login:* & crash:*"
+    assert search_prefix_query("BUG-004") == "BUG:* & 004:*"
+    assert search_prefix_query("it's | !(x)") == "it:* & s:* & x:*"
+    assert search_prefix_query("%%") is None
+
+
+def test_postgres_search_uses_full_text_index_and_rank():
+    condition, rank = report_search_filter(
+        "checkout crash",
+        dialect="postgresql",
+        fallback_columns=(Report.title, Report.description),
+    )
+    assert rank is not None
+    assert "reports.search_vector @@ to_tsquery" in str(condition.compile(dialect=postgresql.dialect()))
+    assert "ts_rank_cd(reports.search_vector" in str(rank.compile(dialect=postgresql.dialect()))
+
+
+def test_search_without_words_falls_back_to_ilike():
+    condition, rank = report_search_filter("%", dialect="postgresql", fallback_columns=(Report.title,))
+    assert rank is None
+    assert "ILIKE" in str(condition.compile(dialect=postgresql.dialect()))
+
+
+async def test_postgres_facets_come_from_one_grouping_sets_query():
+    def row(grouping_id, count, **values):
+        fields = {"status": None, "severity": None, "category": None, **values}
+        return SimpleNamespace(grouping_id=grouping_id, count=count, **fields)
+
+    result = MagicMock()
+    result.all.return_value = [
+        row(0b011, 4, status=Status.NEW),
+        row(0b011, 1, status=Status.RESOLVED),
+        row(0b101, 5, severity=Severity.HIGH),
+        row(0b110, 5, category=Category.UI),
+        row(0b111, 5),
+    ]
+    db = AsyncMock()
+    db.bind = MagicMock()
+    db.bind.dialect.name = "postgresql"
+    db.execute.return_value = result
+
+    facets = await count_report_facets(db, [Report.project_id.is_not(None)])
+
+    db.execute.assert_awaited_once()
+    sql = str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "GROUPING SETS(reports.status, reports.severity, reports.category, ())" in sql
+    assert facets.total == 5
+    assert facets.status["new"] == 4
+    assert facets.status["resolved"] == 1
+    assert facets.status["closed"] == 0
+    assert facets.severity == {"critical": 0, "high": 5, "medium": 0, "low": 0}
+    assert facets.category["ui"] == 5
@@ -92,6 +92,116 @@ async def test_list_reports(
     assert data["page"] == 1
 
 
+async def test_list_reports_truncates_description(
+    client: AsyncClient,
+    auth_cookies: dict[str, str],
+    db_session: AsyncSession,
+    test_project: tuple[Project, str],
+):
+    from app.services.report_list_service import LIST_DESCRIPTION_LENGTH
+
+    project, _ = test_project
+    report = await _create_report_in_db(db_session, project)
+    report.description = "x" * (LIST_DESCRIPTION_LENGTH + 500)
+    report.console_logs = [{"level": "error", "message": "boom"}]
+    await db_session.commit()
+
+    response = await client.get(BASE, cookies=auth_cookies)
+    assert response.status_code == 200
+    item = response.json()["items"][0]
+    assert item["description"] == "x" * LIST_DESCRIPTION_LENGTH
+    assert item["trackingId"] == "BUG-0001"
+    assert "consoleLogs" not in item
+
+
+async def test_list_reports_cursor_walks_all_pages(
+    client: AsyncClient,
+    auth_cookies: dict[str, str],
+    db_session: AsyncSession,
+    test_project: tuple[Project, str],
+):
+    project, _ = test_project
+    same_time = datetime.now(timezone.utc)
+    created = []
+    for _ in range(5):
+        report = await _create_report_in_db(db_session, project)
+        # Identical timestamps must still page without skips or repeats
+        report.created_at = same_time
+        created.append(report.id)
+    await db_session.commit()
+
+    seen: list[str] = []
+    cursor = None
+    for _ in range(3):
+        params = {"page_size": 2}
+        if cursor:
+            params["cursor"] = cursor
+        data = (await client.get(BASE, params=params, cookies=auth_cookies)).json()
+        seen.extend(item["id"] for item in data["items"])
+        assert data["total"] == 5
+        assert data["totalIsEstimate"] is False
+        cursor = data["nextCursor"]
+    assert cursor is None
+    assert sorted(seen) == sorted(str(report_id) for report_id in created)
+
+
+async def test_list_reports_rejects_bad_cursor(
+    client: AsyncClient,
+    auth_cookies: dict[str, str],
+):
+    response = await client.get(BASE, params={"cursor": "not-a-cursor"}, cookies=auth_cookies)
+    assert response.status_code == 400
+
+
+async def test_list_reports_search(
+    client: AsyncClient,
+    auth_cookies: dict[str, str],
+    db_session: AsyncSession,
+    test_project: tuple[Project, str],
+):
+    project, _ = test_project
+    report = await _create_report_in_db(db_session, project)
+    report.title = "Checkout button crashes"
+    await _create_report_in_db(db_session, project)
+    await db_session.commit()
+
+    response = await client.get(BASE, params={"search": "checkout"}, cookies=auth_cookies)
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["id"] for item in data["items"]] == [str(report.id)]
+    assert data["total"] == 1
+
+
+async def test_report_facets_follow_list_filters(
+    client: AsyncClient,
+    auth_cookies: dict[str, str],
+    db_session: AsyncSession,
+    test_project: tuple[Project, str],
+):
+    project, _ = test_project
+    resolved = await _create_report_in_db(db_session, project)
+    resolved.status = Status.RESOLVED
+    resolved.severity = Severity.HIGH
+    await _create_report_in_db(db_session, project)
+    await _create_report_in_db(db_session, project)
+    await db_session.commit()
+
+    response = await client.get(f"{BASE}/facets", cookies=auth_cookies)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 3
+    assert data["status"]["new"] == 2
+    assert data["status"]["resolved"] == 1
+    assert data["severity"]["medium"] == 2
+    assert data["severity"]["critical"] == 0
+    assert data["category"]["bug"] == 3
+
+    response = await client.get(f"{BASE}/facets", params={"severity": "high"}, cookies=auth_cookies)
+    data = response.json()
+    assert data["total"] == 1
+    assert data["status"] == {"new": 0, "triaging": 0, "in_progress": 0, "resolved": 1, "closed": 0}
+
+
 async def test_list_reports_with_filters(
     client: AsyncClient,
     auth_cookies: dict[str, str],
@@ -330,3 +440,98 @@ async def test_create_report_with_annotated_screenshot(
     get_data = get_response.json()
     assert get_data["annotatedScreenshotUrl"] is not None
     assert annotated_screenshot_key in get_data["annotatedScreenshotUrl"]
+
+
+def _batch_item(title: str, description: str = "Batch description") -> dict:
+    return {
+        "title": title,
+        "description": description,
+        "severity": "low",
+        "category": "bug",
+    }
+
+
+async def test_create_reports_batch(
+    client: AsyncClient, test_project: tuple[Project, str]
+):
+    project, raw_key = test_project
+    response = await client.post(
+        f"{BASE}/batch",
+        json={"reports": [_batch_item("Offline bug 1"), _batch_item("Offline bug 2")]},
+        headers=_api_key_headers(raw_key),
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 2
+    assert [r["status"] for r in data["results"]] == ["created", "created"]
+    assert [r["trackingId"] for r in data["results"]] == ["BUG-0001", "BUG-0002"]
+
+    # Single-report ingest continues from the reserved block
+    single = await client.post(
+        BASE, json=_batch_item("After batch"), headers=_api_key_headers(raw_key)
+    )
+    assert single.json()["trackingId"] == "BUG-0003"
+
+
+async def test_create_reports_batch_flags_duplicates_and_invalid_keys(
+    client: AsyncClient, db_session: AsyncSession, test_project: tuple[Project, str]
+):
+    project, raw_key = test_project
+    await _create_report_in_db(db_session, project)
+    bad_key_item = {**_batch_item("Bad key"), "screenshot_url": "../../etc/passwd"}
+    response = await client.post(
+        f"{BASE}/batch",
+        json={
+            "reports": [
+                _batch_item("Test Bug", "A test bug description"),
+                _batch_item("Repeated"),
+                _batch_item("Repeated"),
+                bad_key_item,
+            ]
+        },
+        headers=_api_key_headers(raw_key),
+    )
+    assert response.status_code == 200
+    statuses = [r["status"] for r in response.json()["results"]]
+    assert statuses == ["duplicate", "created", "duplicate", "invalid"]
+
+
+async def test_create_reports_batch_marks_items_over_quota(
+    client: AsyncClient, db_session: AsyncSession, test_project: tuple[Project, str]
+):
+    project, raw_key = test_project
+    # Free plan allows 50 reports per month
+    for i in range(49):
+        db_session.add(
+            Report(
+                project_id=project.id,
+                tracking_id=f"BUG-{i:04d}",
+                title=f"Existing {i}",
+                description="existing",
+                severity=Severity.LOW,
+                category=Category.BUG,
+            )
+        )
+    await db_session.commit()
+
+    response = await client.post(
+        f"{BASE}/batch",
+        json={"reports": [_batch_item("Fits"), _batch_item("Too many")]},
+        headers=_api_key_headers(raw_key),
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 1
+    assert [r["status"] for r in data["results"]] == ["created", "over_quota"]
+
+
+async def test_create_reports_batch_rejects_honeypot(
+    client: AsyncClient, test_project: tuple[Project, str]
+):
+    project, raw_key = test_project
+    response = await client.post(
+        f"{BASE}/batch",
+        json={"reports": [{**_batch_item("Spam"), "hpField": "gotcha"}]},
+        headers=_api_key_headers(raw_key),
+    )
+    assert response.status_code == 400
@@ -0,0 +1,384 @@
+"""Tests for the async S3 client, run against a local S3-compatible fake."""
+from __future__ import annotations
+
+import io
+import threading
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from botocore.auth import S3SigV4Auth, S3SigV4QueryAuth
+from botocore.awsrequest import AWSRequest
+from botocore.credentials import Credentials
+from fastapi import UploadFile
+from httpx import AsyncClient
+
+from app.exceptions import BadRequestException
+from app.models.project import Project
+from app.services import storage_service
+from app.services.s3_client import S3Client, S3Error
+from app.utils.sigv4 import EMPTY_PAYLOAD_SHA256, presign_url, sign_headers
+
+
+class _FakeS3(BaseHTTPRequestHandler):
+    objects: dict[str, bytes] = {}
+    requests: list[tuple[str, str]] = []
+    fail_next: int = 0
+
+    def _reply(self, status: int, body: bytes = b"") -> None:
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self) -> None:
+        type(self).requests.append((self.command, self.path))
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        presigned = "X-Amz-Credential=test-key%2F" in self.path
+        if not presigned and not self.headers.get("Authorization", "").startswith(
+            "AWS4-HMAC-SHA256 Credential=test-key/"
+        ):
+            return self._reply(403, b"<Error><Code>AccessDenied</Code><Message>unsigned</Message></Error>")
+        if type(self).fail_next:
+            type(self).fail_next -= 1
+            return self._reply(503, b"<Error><Code>SlowDown</Code><Message>busy</Message></Error>")
+
+        path = self.path.partition("?")[0]
+        if self.command in ("GET", "HEAD"):
+            data = type(self).objects.get(path)
+            if data is None:
+                return self._reply(404, b"" if self.command == "HEAD" else b"<Error><Code>NoSuchKey</Code></Error>")
+            if self.headers.get("Range"):
+                start, end = (int(n) for n in self.headers["Range"].removeprefix("bytes=").split("-"))
+                data = data[start : end + 1]
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            if self.command == "GET":
+                self.wfile.write(data)
+            return None
+        if self.command == "PUT":
+            type(self).objects[path] = body
+            return self._reply(200)
+        if self.command == "DELETE":
+            type(self).objects.pop(self.path, None)
+            return self._reply(204)
+        if self.command == "POST" and self.path.endswith("?delete="):
+            for key in body.decode().split("<Key>")[1:]:
+                type(self).objects.pop(f"/bucket/{key.split('</Key>')[0]}", None)
+            return self._reply(200, b"<DeleteResult></DeleteResult>")
+        return self._reply(400)
+
+    do_GET = _handle
+    do_HEAD = _handle
+    do_PUT = _handle
+    do_DELETE = _handle
+    do_POST = _handle
+
+    def log_message(self, *args) -> None:  # silence test output
+        pass
+
+
+@pytest.fixture()
+async def s3():
+    _FakeS3.objects = {}
+    _FakeS3.requests = []
+    _FakeS3.fail_next = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeS3)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = S3Client(
+        endpoint_url=f"http://127.0.0.1:{server.server_address[1]}",
+        bucket="bucket",
+        access_key="test-key",
+        secret_key="test-secret",
+        max_attempts=3,
+    )
+    yield client, _FakeS3
+    await client.aclose()
+    server.shutdown()
+    server.server_close()
+
+
+def test_sign_headers_matches_botocore():
+    now = datetime(2026, 10, 17, 12, 30, tzinfo=timezone.utc)
+    url = "https://storage.example.com/bucket/owner/a%20b.png"
+    ours = sign_headers(
+        "PUT",
+        url,
+        {"content-type": "image/png"},
+        access_key="AKID",
+        secret_key="secret",
+        region="us-east-1",
+        payload_hash=EMPTY_PAYLOAD_SHA256,
+        now=now,
+    )
+
+    request = AWSRequest(
+        method="PUT",
+        url=url,
+        headers={
+            "content-type": "image/png",
+            "x-amz-date": ours["x-amz-date"],
+            "x-amz-content-sha256": EMPTY_PAYLOAD_SHA256,
+        },
+        data=b"",
+    )
+    request.context["timestamp"] = ours["x-amz-date"]
+    auth = S3SigV4Auth(Credentials("AKID", "secret"), "s3", "us-east-1")
+    string_to_sign = auth.string_to_sign(request, auth.canonical_request(request))
+
+    assert ours["authorization"].endswith(f"Signature={auth.signature(string_to_sign, request)}")
+
+
+async def test_put_and_delete_round_trip(s3):
+    client, fake = s3
+
+    await client.put_object("owner/project/shot.png", b"\x89PNG data", "image/png")
+    await client.put_object("owner/project/other.png", b"\x89PNG more", "image/png")
+    assert fake.objects["/bucket/owner/project/shot.png"] == b"\x89PNG data"
+
+    await client.delete_object("owner/project/shot.png")
+    assert await client.delete_objects(["owner/project/other.png"]) == []
+    assert fake.objects == {}
+
+
+async def test_retries_throttled_requests_within_budget(s3):
+    client, fake = s3
+    fake.fail_next = 2
+
+    await client.put_object("k.png", b"data", "image/png")
+
+    assert [method for method, _ in fake.requests] == ["PUT", "PUT", "PUT"]
+
+
+async def test_gives_up_after_retry_budget(s3):
+    client, fake = s3
+    fake.fail_next = 5
+
+    with pytest.raises(S3Error) as exc_info:
+        await client.put_object("k.png", b"data", "image/png")
+
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.code == "SlowDown"
+    assert len(fake.requests) == 3
+
+
+async def test_connection_errors_surface_as_s3_error():
+    client = S3Client(
+        endpoint_url="http://127.0.0.1:9",
+        bucket="bucket",
+        access_key="test-key",
+        secret_key="test-secret",
+        max_attempts=1,
+    )
+    with pytest.raises(S3Error) as exc_info:
+        await client.delete_object("k.png")
+    await client.aclose()
+
+    assert exc_info.value.status_code == 0
+
+
+def test_presign_url_matches_botocore():
+    now = datetime(2026, 10, 17, 12, 30, tzinfo=timezone.utc)
+    url = "https://storage.example.com/bucket/owner/shot.png"
+    ours = presign_url(
+        "GET", url, access_key="AKID", secret_key="secret", region="auto", expires_in=900, now=now
+    )
+
+    request = AWSRequest(method="GET", url=url)
+    request.context["timestamp"] = "20261017T123000Z"
+    auth = S3SigV4QueryAuth(Credentials("AKID", "secret"), "s3", "auto", expires=900)
+    auth._modify_request_before_signing(request)
+    string_to_sign = auth.string_to_sign(request, auth.canonical_request(request))
+
+    assert ours.endswith(f"&X-Amz-Signature={auth.signature(string_to_sign, request)}")
+
+
+# ---------- Streaming uploads through storage_service ----------
+
+PNG_HEADER = b"\x89PNG\r\n\x1a\n" + b"\x00" * 8
+
+
+def _spooled(data: bytes) -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), size=len(data))
+
+
+@pytest.fixture()
+def storage(s3, monkeypatch):
+    client, fake = s3
+    monkeypatch.setattr(storage_service, "_get_s3_client", lambda: client)
+    monkeypatch.setattr(storage_service, "STREAM_CHUNK_SIZE_BYTES", 64)
+    return fake
+
+
+async def test_upload_stream_sends_one_put_from_the_file(storage):
+    data = PNG_HEADER + bytes(range(256)) * 2
+
+    key = await storage_service.upload_stream(_spooled(data), "image/png", "owner", "project")
+
+    assert storage.objects[f"/bucket/{key}"] == data
+    assert [method for method, _ in storage.requests] == ["PUT"]
+
+
+async def test_upload_stream_rewinds_the_file_on_retry(storage):
+    storage.fail_next = 1
+    data = PNG_HEADER + b"x" * 300
+
+    key = await storage_service.upload_stream(_spooled(data), "image/png", "owner", "project")
+
+    assert storage.objects[f"/bucket/{key}"] == data
+    assert [method for method, _ in storage.requests] == ["PUT", "PUT"]
+
+
+async def test_upload_stream_rejects_oversized_files_before_uploading(storage, monkeypatch):
+    monkeypatch.setattr(storage_service, "MAX_FILE_SIZE_BYTES", 200)
+    data = PNG_HEADER + b"x" * 300
+
+    with pytest.raises(BadRequestException, match="maximum size"):
+        await storage_service.upload_stream(_spooled(data), "image/png", "owner", "project")
+
+    assert storage.requests == []
+
+
+async def test_upload_stream_rejects_bad_magic_bytes_before_uploading(storage):
+    data = b"GIF89a" + b"x" * 200
+
+    with pytest.raises(BadRequestException, match="does not match"):
+        await storage_service.upload_stream(_spooled(data), "image/png", "owner", "project")
+
+    assert storage.requests == []
+
+
+async def test_delete_files_splits_keys_into_batches(storage, monkeypatch):
+    monkeypatch.setattr(storage_service, "DELETE_BATCH_SIZE", 2)
+    keys = [f"owner/project/shot-{n}.png" for n in range(5)]
+    for key in keys:
+        storage.objects[f"/bucket/{key}"] = PNG_HEADER
+
+    await storage_service.delete_files(keys)
+
+    assert storage.objects == {}
+    assert [method for method, _ in storage.requests] == ["POST", "POST", "POST"]
+
+
+async def test_upload_endpoint_streams_the_spooled_file(
+    storage, client: AsyncClient, test_project: tuple[Project, str]
+) -> None:
+    project, api_key = test_project
+    data = PNG_HEADER + b"x" * 500
+
+    response = await client.post(
+        "/api/v1/upload/screenshot",
+        files={"file": ("shot.png", data, "image/png")},
+        headers={"X-API-Key": api_key},
+    )
+
+    assert response.status_code == 200
+    key = response.json()["key"]
+    assert key.startswith(f"{project.owner_id}/{project.id}/")
+    assert storage.objects[f"/bucket/{key}"] == data
+
+
+def test_presign_url_with_signed_headers_matches_botocore():
+    now = datetime(2026, 10, 17, 12, 30, tzinfo=timezone.utc)
+    url = "https://storage.example.com/bucket/owner/shot.png"
+    ours = presign_url(
+        "PUT",
+        url,
+        access_key="AKID",
+        secret_key="secret",
+        region="auto",
+        expires_in=300,
+        headers={"content-type": "image/png", "content-length": "2048"},
+        now=now,
+    )
+
+    request = AWSRequest(
+        method="PUT", url=url, headers={"content-type": "image/png", "content-length": "2048"}
+    )
+    request.context["timestamp"] = "20261017T123000Z"
+    auth = S3SigV4QueryAuth(Credentials("AKID", "secret"), "s3", "auto", expires=300)
+    auth._modify_request_before_signing(request)
+    string_to_sign = auth.string_to_sign(request, auth.canonical_request(request))
+
+    assert "X-Amz-SignedHeaders=content-length%3Bcontent-type%3Bhost" in ours
+    assert ours.endswith(f"&X-Amz-Signature={auth.signature(string_to_sign, request)}")
+
+
+# ---------- Direct (presigned) uploads from the widget ----------
+
+
+async def test_direct_upload_flow(
+    storage, client: AsyncClient, test_project: tuple[Project, str]
+) -> None:
+    _, api_key = test_project
+    data = PNG_HEADER + b"x" * 100
+
+    resp = await client.post(
+        "/api/v1/upload/screenshot/presign",
+        json={"contentType": "image/png", "size": len(data)},
+        headers={"X-API-Key": api_key},
+    )
+    assert resp.status_code == 200
+    upload = resp.json()
+    assert upload["headers"] == {"Content-Type": "image/png"}
+
+    async with AsyncClient() as http:
+        put = await http.put(upload["url"], content=data, headers=upload["headers"])
+    assert put.status_code == 200
+    assert [method for method, _ in storage.requests] == ["PUT"]
+
+    resp = await client.post(
+        "/api/v1/upload/screenshot/complete",
+        json={"key": upload["key"]},
+        headers={"X-API-Key": api_key},
+    )
+    assert resp.status_code == 200
+    assert resp.json() == {"key": upload["key"]}
+
+
+async def test_direct_upload_rejects_oversized_request(
+    storage, client: AsyncClient, test_project: tuple[Project, str]
+) -> None:
+    _, api_key = test_project
+
+    resp = await client.post(
+        "/api/v1/upload/screenshot/presign",
+        json={"contentType": "image/png", "size": storage_service.MAX_FILE_SIZE_BYTES + 1},
+        headers={"X-API-Key": api_key},
+    )
+
+    assert resp.status_code == 400
+
+
+async def test_complete_deletes_object_with_wrong_content(
+    storage, client: AsyncClient, test_project: tuple[Project, str]
+) -> None:
+    project, api_key = test_project
+    key = f"{project.owner_id}/{project.id}/{uuid.uuid4()}.png"
+    storage.objects[f"/bucket/{key}"] = b"<html>not an image</html>"
+
+    resp = await client.post(
+        "/api/v1/upload/screenshot/complete", json={"key": key}, headers={"X-API-Key": api_key}
+    )
+
+    assert resp.status_code == 400
+    assert storage.objects == {}
+
+
+async def test_complete_rejects_missing_and_foreign_keys(
+    storage, client: AsyncClient, test_project: tuple[Project, str]
+) -> None:
+    project, api_key = test_project
+    missing = f"{project.owner_id}/{project.id}/{uuid.uuid4()}.png"
+    foreign = f"{uuid.uuid4()}/{uuid.uuid4()}/{uuid.uuid4()}.png"
+    storage.objects[f"/bucket/{foreign}"] = PNG_HEADER
+
+    for key in (missing, foreign):
+        resp = await client.post(
+            "/api/v1/upload/screenshot/complete", json={"key": key}, headers={"X-API-Key": api_key}
+        )
+        assert resp.status_code == 400
+    assert f"/bucket/{foreign}" in storage.objects
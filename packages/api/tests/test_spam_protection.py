@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import time
 import uuid
-from datetime import datetime, timezone
-from unittest.mock import MagicMock
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -10,10 +11,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.project import Project
 from app.models.report import Category, Report, Severity, Status
 from app.services.spam_protection_service import (
+    DUPLICATE_WINDOW,
     check_honeypot,
+    find_duplicate_reports,
     is_duplicate_report,
+    remember_fingerprint,
     validate_origin,
 )
+from app.utils.fingerprint import fingerprint_range, report_fingerprint
 
 
 class TestCheckHoneypot:
@@ -108,6 +113,115 @@ class TestIsDuplicateReport:
         assert result is False
 
 
+class TestReportFingerprint:
+    def test_ignores_case_and_whitespace(self) -> None:
+        assert report_fingerprint("Crash on  login", "Boom\n") == report_fingerprint(
+            "crash on login", "  boom"
+        )
+
+    def test_title_only_range_covers_any_description(self) -> None:
+        low, high = fingerprint_range("Crash on login", "")
+        assert low <= report_fingerprint("Crash on login", "details") <= high
+        assert not low <= report_fingerprint("Other", "details") <= high
+
+    def test_range_with_description_is_exact(self) -> None:
+        fingerprint = report_fingerprint("Crash on login", "details")
+        assert fingerprint_range("Crash on login", "details") == (fingerprint, fingerprint)
+
+    @pytest.mark.asyncio
+    async def test_normalized_repeat_is_duplicate(
+        self, db_session: AsyncSession, test_project: tuple[Project, str]
+    ) -> None:
+        project, _ = test_project
+        db_session.add(Report(
+            id=uuid.uuid4(),
+            project_id=project.id,
+            tracking_id="TST-5",
+            title="Crash on login",
+            description="App crashes when clicking login",
+            severity=Severity.HIGH,
+            category=Category.BUG,
+            created_at=datetime.now(timezone.utc),
+        ))
+        await db_session.commit()
+
+        result = await is_duplicate_report(
+            db_session, str(project.id), "CRASH on login", "App crashes  when clicking login"
+        )
+        assert result is True
+
+    @pytest.mark.asyncio
+    async def test_cached_fingerprint_skips_database(self) -> None:
+        project_id = str(uuid.uuid4())
+        remember_fingerprint(project_id, report_fingerprint("Flood", "same text"))
+        mock_db = AsyncMock()
+
+        assert await is_duplicate_report(mock_db, project_id, "Flood", "same text") is True
+        assert await is_duplicate_report(mock_db, project_id, "Flood") is True
+        mock_db.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_cached_repeat_expires_with_the_original(
+        self, db_session: AsyncSession, test_project: tuple[Project, str], monkeypatch
+    ) -> None:
+        project, _ = test_project
+        report = Report(
+            id=uuid.uuid4(),
+            project_id=project.id,
+            tracking_id="TST-6",
+            title="Crash on logout",
+            description="App crashes when clicking logout",
+            severity=Severity.HIGH,
+            category=Category.BUG,
+            created_at=datetime.now(timezone.utc) - DUPLICATE_WINDOW + timedelta(seconds=2),
+        )
+        db_session.add(report)
+        await db_session.commit()
+        assert await is_duplicate_report(db_session, str(project.id), "Crash on logout") is True
+
+        # Three seconds later the original has left the window
+        report.created_at -= timedelta(seconds=3)
+        await db_session.commit()
+        later = time.monotonic() + 3
+        monkeypatch.setattr("app.utils.ttl_cache.time.monotonic", lambda: later)
+
+        assert await is_duplicate_report(db_session, str(project.id), "Crash on logout") is False
+
+
+class TestFindDuplicateReports:
+    @pytest.mark.asyncio
+    async def test_flags_existing_and_in_batch_duplicates(
+        self, db_session: AsyncSession, test_project: tuple[Project, str]
+    ) -> None:
+        project, _ = test_project
+        report = Report(
+            id=uuid.uuid4(),
+            project_id=project.id,
+            tracking_id="TST-4",
+            title="Crash on login",
+            description="App crashes when clicking login",
+            severity=Severity.HIGH,
+            category=Category.BUG,
+            status=Status.NEW,
+            created_at=datetime.now(timezone.utc),
+            updated_at=datetime.now(timezone.utc),
+        )
+        db_session.add(report)
+        await db_session.commit()
+
+        flags = await find_duplicate_reports(
+            db_session,
+            str(project.id),
+            [
+                ("Crash on login", "App crashes when clicking login"),
+                ("Crash on login", "Different details"),
+                ("New bug", "Details"),
+                ("New bug", "Details"),
+            ],
+        )
+        assert flags == [True, False, False, True]
+
+
 def _make_request(headers: dict[str, str] | None = None) -> MagicMock:
     mock_request = MagicMock()
     mock_request.headers = headers or {}
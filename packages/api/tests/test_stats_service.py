@@ -0,0 +1,167 @@
+"""Tests for dashboard stats served from the trigger-maintained daily rollup."""
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from httpx import AsyncClient
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.project import Project
+from app.models.report import Category, Report, Severity, Status
+from app.models.report_daily_stat import ReportDailyStat
+from app.models.user import User
+from app.services.stats_service import (
+    get_aggregated_project_stats,
+    get_overview_stats,
+    get_project_stats,
+    rebuild_report_daily_stats,
+)
+
+
+async def _add_report(
+    db_session: AsyncSession,
+    project: Project,
+    severity: Severity,
+    status: Status = Status.NEW,
+    created_at: datetime | None = None,
+    updated_at: datetime | None = None,
+) -> Report:
+    created_at = created_at or datetime.now(timezone.utc)
+    report = Report(
+        id=uuid.uuid4(),
+        project_id=project.id,
+        tracking_id=f"BUG-{uuid.uuid4().hex[:6]}",
+        title="Rollup bug",
+        description="counted",
+        severity=severity,
+        category=Category.BUG,
+        status=status,
+        created_at=created_at,
+        updated_at=updated_at or created_at,
+    )
+    db_session.add(report)
+    await db_session.commit()
+    return report
+
+
+async def test_stats_follow_inserts_updates_and_deletes(
+    db_session: AsyncSession, test_user: User, test_project: tuple[Project, str]
+):
+    project, _ = test_project
+    now = datetime.now(timezone.utc)
+    first = await _add_report(db_session, project, Severity.HIGH)
+    await _add_report(db_session, project, Severity.LOW, created_at=now - timedelta(days=2))
+    await _add_report(
+        db_session,
+        project,
+        Severity.LOW,
+        status=Status.CLOSED,
+        created_at=now - timedelta(days=3),
+        updated_at=now - timedelta(days=3) + timedelta(hours=6),
+    )
+
+    stats = await get_project_stats(db_session, str(project.id))
+    assert stats.bugs_by_severity == {"high": 1, "low": 2}
+    assert stats.bugs_by_status == {"new": 2, "closed": 1}
+    assert [trend.count for trend in stats.bugs_by_day] == [1, 1, 1]
+
+    overview = await get_overview_stats(db_session, str(test_user.id))
+    assert (overview.total_bugs, overview.open_bugs, overview.avg_resolution_hours) == (3, 2, 6.0)
+
+    await db_session.execute(
+        update(Report).where(Report.id == first.id).values(status=Status.RESOLVED)
+    )
+    await db_session.commit()
+
+    stats = await get_project_stats(db_session, str(project.id))
+    assert stats.bugs_by_status == {"new": 1, "resolved": 1, "closed": 1}
+    overview = await get_overview_stats(db_session, str(test_user.id), project.id)
+    assert (overview.open_bugs, overview.resolved_today) == (1, 1)
+
+    await db_session.execute(delete(Report).where(Report.id == first.id))
+    await db_session.commit()
+
+    stats = await get_aggregated_project_stats(db_session, None)
+    assert stats.bugs_by_severity == {"low": 2}
+    assert stats.bugs_by_status == {"new": 1, "closed": 1}
+
+
+async def test_stats_are_scoped_to_owned_projects(
+    db_session: AsyncSession, test_user: User, test_project: tuple[Project, str], test_superadmin: User
+):
+    project, _ = test_project
+    other = Project(
+        id=uuid.uuid4(),
+        owner_id=test_superadmin.id,
+        name="Other",
+        domain="other.example.com",
+        api_key_hash=uuid.uuid4().hex,
+        api_key_prefix="bsk_pub_othr",
+        settings={},
+        is_active=True,
+    )
+    db_session.add(other)
+    await db_session.commit()
+    await _add_report(db_session, project, Severity.MEDIUM)
+    await _add_report(db_session, other, Severity.CRITICAL)
+
+    mine = await get_aggregated_project_stats(db_session, str(test_user.id))
+    everyone = await get_aggregated_project_stats(db_session, None)
+
+    assert mine.bugs_by_severity == {"medium": 1}
+    assert everyone.bugs_by_severity == {"medium": 1, "critical": 1}
+
+
+async def test_rebuild_repairs_drift(
+    db_session: AsyncSession, test_user: User, test_project: tuple[Project, str]
+):
+    project, _ = test_project
+    await _add_report(db_session, project, Severity.HIGH)
+    await _add_report(db_session, project, Severity.HIGH, created_at=datetime.now(timezone.utc) - timedelta(days=5))
+    await db_session.execute(update(ReportDailyStat).values(report_count=40))
+    await db_session.commit()
+
+    rows = await rebuild_report_daily_stats(db_session, project.id)
+
+    assert rows == 2
+    counts = (await db_session.execute(select(ReportDailyStat.report_count))).scalars().all()
+    assert sorted(counts) == [1, 1]
+
+
+async def test_stats_sum_over_shards(
+    db_session: AsyncSession, test_user: User, test_project: tuple[Project, str]
+):
+    project, _ = test_project
+    report = await _add_report(db_session, project, Severity.HIGH)
+    # What a PostgreSQL ingest on another connection leaves behind
+    db_session.add(
+        ReportDailyStat(
+            project_id=project.id,
+            day=report.created_at.date(),
+            severity=Severity.HIGH,
+            status=Status.NEW,
+            category=Category.BUG,
+            shard=7,
+            report_count=2,
+            resolution_seconds=0,
+        )
+    )
+    await db_session.commit()
+
+    stats = await get_project_stats(db_session, str(project.id))
+
+    assert stats.bugs_by_severity == {"high": 3}
+
+
+async def test_overview_endpoint_reads_rollup(
+    client: AsyncClient, db_session: AsyncSession, auth_cookies: dict[str, str], test_project: tuple[Project, str]
+):
+    project, _ = test_project
+    await _add_report(db_session, project, Severity.LOW)
+
+    response = await client.get("/api/v1/stats/overview", cookies=auth_cookies)
+
+    assert response.status_code == 200
+    assert response.json()["totalBugs"] == 1
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+import app.services.storage_service as storage_mod
 from app.exceptions import BadRequestException
 from app.services.storage_service import (
     ALLOWED_CONTENT_TYPES,
@@ -28,7 +29,7 @@ def _clear_settings_cache():
 @patch("app.services.storage_service._get_s3_client")
 @pytest.mark.asyncio
 async def test_upload_file_valid_png(mock_get_client: MagicMock):
-    mock_client = MagicMock()
+    mock_client = AsyncMock()
     mock_get_client.return_value = mock_client
 
     file_content = b"\x89PNG\r\n\x1a\n" + b"\x00" * 100
@@ -38,10 +39,7 @@ async def test_upload_file_valid_png(mock_get_client: MagicMock):
 
     assert result.startswith(f"{owner_id}/{project_id}/")
     assert result.endswith(".png")
-    mock_client.put_object.assert_called_once()
-    call_kwargs = mock_client.put_object.call_args.kwargs
-    assert call_kwargs["ContentType"] == "image/png"
-    assert call_kwargs["Body"] == file_content
+    mock_client.put_object.assert_awaited_once_with(result, file_content, "image/png")
 
 
 @pytest.mark.asyncio
@@ -59,18 +57,23 @@ async def test_upload_file_rejects_oversized_file():
         await upload_file(oversized_content, "image/png", "owner-id", "project-id")
 
 
-@patch("app.services.storage_service._get_s3_client")
 @pytest.mark.asyncio
-async def test_generate_presigned_url(mock_get_client: MagicMock):
-    mock_client = MagicMock()
-    mock_client.generate_presigned_url.return_value = "https://s3.example.com/signed-url"
-    mock_get_client.return_value = mock_client
-
+async def test_generate_presigned_url():
     result = await generate_presigned_url("screenshots/abc.png")
 
-    assert result == "https://s3.example.com/signed-url"
-    mock_client.generate_presigned_url.assert_called_once_with(
-        "get_object",
-        Params={"Bucket": "bugspark-uploads", "Key": "screenshots/abc.png"},
-        ExpiresIn=900,
-    )
+    assert result.startswith("http://localhost:9000/bugspark-uploads/screenshots/abc.png?")
+    assert "X-Amz-Expires=900" in result
+    assert "X-Amz-Signature=" in result
+
+
+@pytest.mark.asyncio
+async def test_generate_presigned_url_reuses_cached_url():
+    first = await generate_presigned_url("screenshots/abc.png")
+
+    with patch("app.services.storage_service._get_s3_client") as mock_get_client:
+        assert await generate_presigned_url("screenshots/abc.png") == first
+        mock_get_client.assert_not_called()
+
+    # Short-lived URLs are not worth caching
+    await generate_presigned_url("screenshots/abc.png", expires_in=60)
+    assert len(storage_mod._presigned_url_cache) == 1
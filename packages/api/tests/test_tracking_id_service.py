@@ -1,57 +1,105 @@
 from __future__ import annotations
 
 import uuid
-from datetime import datetime, timezone
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
-import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.services.tracking_id_service import generate_tracking_id
+from app.models.project import Project
+from app.services.tracking_id_service import (
+    TrackingIdAllocator,
+    format_tracking_id,
+    generate_tracking_id,
+    generate_tracking_ids,
+)
 
 
-async def test_first_tracking_id_is_bug_0001():
-    """generate_tracking_id should return BUG-0001 when counter goes from 0 to 1."""
-    mock_result = MagicMock()
-    mock_result.scalar_one.return_value = 1
+def _stub_refills(allocator: TrackingIdAllocator, *last_numbers: int) -> AsyncMock:
+    """Make the allocator's block refills return ``last_numbers`` in turn."""
+    reserve = AsyncMock(side_effect=list(last_numbers))
+    allocator._reserve_block = reserve
+    return reserve
 
-    mock_db = AsyncMock()
-    mock_db.execute.return_value = mock_result
 
-    tracking_id = await generate_tracking_id(mock_db, str(uuid.uuid4()))
-    assert tracking_id == "BUG-0001"
+def test_tracking_id_zero_pads():
+    """Tracking IDs should be zero-padded to 4 digits."""
+    assert format_tracking_id(1) == "BUG-0001"
+    assert format_tracking_id(42) == "BUG-0042"
 
 
-async def test_increments_tracking_id():
-    """generate_tracking_id should use the returned counter value."""
-    mock_result = MagicMock()
-    mock_result.scalar_one.return_value = 5
+def test_large_tracking_id():
+    """Tracking IDs above 9999 should extend naturally."""
+    assert format_tracking_id(12345) == "BUG-12345"
 
-    mock_db = AsyncMock()
-    mock_db.execute.return_value = mock_result
 
-    tracking_id = await generate_tracking_id(mock_db, str(uuid.uuid4()))
-    assert tracking_id == "BUG-0005"
+async def test_first_tracking_id_is_bug_0001(
+    db_session: AsyncSession, test_project: tuple[Project, str]
+):
+    """generate_tracking_id should return BUG-0001 for a fresh project."""
+    project, _ = test_project
+    assert await generate_tracking_id(db_session, str(project.id)) == "BUG-0001"
+    assert await generate_tracking_id(db_session, str(project.id)) == "BUG-0002"
 
 
-async def test_tracking_id_zero_pads():
-    """Tracking IDs should be zero-padded to 4 digits."""
-    mock_result = MagicMock()
-    mock_result.scalar_one.return_value = 42
+async def test_numbers_come_from_memory_within_a_block():
+    allocator = TrackingIdAllocator(min_block_size=5)
+    reserve = _stub_refills(allocator, 5)
+    mock_db = MagicMock()
+    project_id = uuid.uuid4()
 
-    mock_db = AsyncMock()
-    mock_db.execute.return_value = mock_result
+    assert await allocator.allocate(mock_db, project_id) == [1]
+    assert await allocator.allocate(mock_db, project_id, 3) == [2, 3, 4]
 
-    tracking_id = await generate_tracking_id(mock_db, str(uuid.uuid4()))
-    assert tracking_id == "BUG-0042"
+    reserve.assert_awaited_once_with(mock_db.bind, project_id, 5)
 
 
-async def test_large_tracking_id():
-    """Tracking IDs above 9999 should extend naturally."""
-    mock_result = MagicMock()
-    mock_result.scalar_one.return_value = 12345
+async def test_refill_spans_blocks_and_stays_increasing():
+    allocator = TrackingIdAllocator(min_block_size=2)
+    # Another worker took 3-4, so this worker's second block is 5-8
+    reserve = _stub_refills(allocator, 2, 8)
+    mock_db = MagicMock()
+    project_id = uuid.uuid4()
+
+    assert await allocator.allocate(mock_db, project_id) == [1]
+    assert await allocator.allocate(mock_db, project_id, 3) == [2, 5, 6]
+    assert await allocator.allocate(mock_db, project_id) == [7]
+    assert reserve.await_count == 2
+
+
+async def test_block_size_grows_under_load_and_resets_when_idle():
+    allocator = TrackingIdAllocator(min_block_size=1, max_block_size=4)
+    project_id = uuid.uuid4()
+
+    _stub_refills(allocator, 1)
+    with patch("app.services.tracking_id_service.time.monotonic", return_value=0.0):
+        await allocator.allocate(MagicMock(), project_id)
+        assert allocator._next_size(project_id, 1) == 2
+    with patch("app.services.tracking_id_service.time.monotonic", return_value=3600.0):
+        assert allocator._next_size(project_id, 1) == 1
+
+
+async def test_generate_tracking_ids_reserves_block(
+    db_session: AsyncSession, test_project: tuple[Project, str]
+):
+    """generate_tracking_ids should return increasing IDs and bump the counter once."""
+    project, _ = test_project
+    tracking_ids = await generate_tracking_ids(db_session, str(project.id), 3)
+    assert tracking_ids == ["BUG-0001", "BUG-0002", "BUG-0003"]
+
+    result = await db_session.execute(select(Project.report_counter).where(Project.id == project.id))
+    assert result.scalar_one() == 3
+
 
-    mock_db = AsyncMock()
-    mock_db.execute.return_value = mock_result
+async def test_refill_leaves_caller_session_uncommitted(
+    db_session: AsyncSession, test_project: tuple[Project, str]
+):
+    """A block refill commits on its own session, not the caller's."""
+    project, _ = test_project
+    pending = Project(
+        owner_id=project.owner_id, name="Pending", api_key_hash="x" * 64, api_key_prefix="bsk_pub_pend"
+    )
+    db_session.add(pending)
 
-    tracking_id = await generate_tracking_id(mock_db, str(uuid.uuid4()))
-    assert tracking_id == "BUG-12345"
+    assert await generate_tracking_id(db_session, str(project.id)) == "BUG-0001"
+    assert pending in db_session.new
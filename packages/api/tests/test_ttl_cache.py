@@ -0,0 +1,126 @@
+"""Tests for the in-process TTL cache."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+from app.utils.ttl_cache import TTLCache
+
+
+def test_get_returns_value_until_expiry():
+    cache: TTLCache[str, int] = TTLCache(ttl_seconds=10)
+    with patch("app.utils.ttl_cache.time.monotonic", return_value=100.0):
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+    with patch("app.utils.ttl_cache.time.monotonic", return_value=110.0):
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+
+def test_per_entry_ttl_override():
+    cache: TTLCache[str, int] = TTLCache(ttl_seconds=10)
+    with patch("app.utils.ttl_cache.time.monotonic", return_value=0.0):
+        cache.set("short", 1, ttl_seconds=1)
+        cache.set("long", 2)
+    with patch("app.utils.ttl_cache.time.monotonic", return_value=5.0):
+        assert "short" not in cache
+        assert "long" in cache
+
+
+def test_evicts_least_recently_used():
+    cache: TTLCache[str, int] = TTLCache(ttl_seconds=60, max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+
+
+def test_get_default_distinguishes_cached_none():
+    cache: TTLCache[str, int | None] = TTLCache(ttl_seconds=60)
+    sentinel = object()
+    cache.set("negative", None)
+    assert cache.get("negative", sentinel) is None
+    assert cache.get("missing", sentinel) is sentinel
+
+
+def test_pop_and_clear():
+    cache: TTLCache[str, int] = TTLCache(ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.pop("a")
+    cache.pop("missing")
+    assert "a" not in cache
+    cache.clear()
+    assert len(cache) == 0
+
+
+async def test_get_or_load_coalesces_concurrent_misses():
+    cache: TTLCache[str, int] = TTLCache(ttl_seconds=60)
+    calls = 0
+    release = asyncio.Event()
+
+    async def load() -> int:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return 42
+
+    waiters = [asyncio.create_task(cache.get_or_load("k", load)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*waiters) == [42] * 5
+    assert calls == 1
+    assert cache.get("k") == 42
+
+
+async def test_get_or_load_shares_errors_without_caching():
+    cache: TTLCache[str, int] = TTLCache(ttl_seconds=60)
+    release = asyncio.Event()
+
+    async def fail() -> int:
+        await release.wait()
+        raise RuntimeError("boom")
+
+    waiters = [asyncio.create_task(cache.get_or_load("k", fail)) for _ in range(2)]
+    await asyncio.sleep(0)
+    release.set()
+
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert "k" not in cache
+
+
+async def test_get_or_load_discards_result_invalidated_mid_load():
+    cache: TTLCache[str, int] = TTLCache(ttl_seconds=60)
+
+    async def load() -> int:
+        cache.clear()  # an invalidation lands while the load is running
+        return 1
+
+    assert await cache.get_or_load("k", load) == 1
+    assert "k" not in cache
+
+
+async def test_waiter_takes_over_when_loader_is_cancelled():
+    cache: TTLCache[str, int] = TTLCache(ttl_seconds=60)
+    started = asyncio.Event()
+
+    async def hang() -> int:
+        started.set()
+        await asyncio.Event().wait()
+        return 0
+
+    async def quick() -> int:
+        return 7
+
+    leader = asyncio.create_task(cache.get_or_load("k", hang))
+    await started.wait()
+    follower = asyncio.create_task(cache.get_or_load("k", quick))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == 7
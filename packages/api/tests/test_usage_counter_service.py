@@ -0,0 +1,141 @@
+"""Tests for trigger-maintained usage counters."""
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.project import Project
+from app.models.report import Category, Report, Severity
+from app.models.usage_counter import TOTAL_PERIOD, UsageCounter
+from app.models.user import User
+from app.services.usage_counter_service import (
+    get_max_project_report_count,
+    get_monthly_report_count,
+    get_project_report_count,
+    month_period,
+    reconcile_usage_counters,
+)
+
+
+async def _add_reports(db_session: AsyncSession, project: Project, count: int) -> list[Report]:
+    reports = [
+        Report(
+            id=uuid.uuid4(),
+            project_id=project.id,
+            tracking_id=f"BUG-{i + 1:04d}",
+            title=f"Counter bug {i}",
+            description="counted",
+            severity=Severity.LOW,
+            category=Category.BUG,
+            created_at=datetime.now(timezone.utc),
+        )
+        for i in range(count)
+    ]
+    db_session.add_all(reports)
+    await db_session.commit()
+    return reports
+
+
+async def test_counters_follow_inserts_and_deletes(
+    db_session: AsyncSession, test_user: User, test_project: tuple[Project, str]
+):
+    project, _ = test_project
+    reports = await _add_reports(db_session, project, 3)
+
+    assert await get_project_report_count(db_session, project.id) == 3
+    assert await get_monthly_report_count(db_session, test_user.id, month_period()) == 3
+    assert await get_max_project_report_count(db_session, test_user.id) == 3
+
+    await db_session.execute(delete(Report).where(Report.id == reports[0].id))
+    await db_session.commit()
+
+    assert await get_project_report_count(db_session, project.id) == 2
+    assert await get_monthly_report_count(db_session, test_user.id, month_period()) == 2
+
+
+async def test_reconcile_repairs_drift(
+    db_session: AsyncSession, test_user: User, test_project: tuple[Project, str]
+):
+    project, _ = test_project
+    await _add_reports(db_session, project, 2)
+    await db_session.execute(
+        update(UsageCounter)
+        .where(UsageCounter.project_id == project.id, UsageCounter.period == TOTAL_PERIOD)
+        .values(report_count=40)
+    )
+    await db_session.commit()
+
+    repaired = await reconcile_usage_counters(db_session)
+
+    assert repaired == 1
+    assert await get_project_report_count(db_session, project.id) == 2
+    assert await reconcile_usage_counters(db_session) == 0
+
+
+async def test_counters_sum_over_shards(
+    db_session: AsyncSession, test_user: User, test_project: tuple[Project, str]
+):
+    """Readers add up shard rows; reconcile corrects the sum through shard 0."""
+    project, _ = test_project
+    await _add_reports(db_session, project, 2)
+    # What a PostgreSQL delete on another connection leaves behind
+    db_session.add_all([
+        UsageCounter(owner_id=test_user.id, project_id=project.id, period=TOTAL_PERIOD, shard=5, report_count=3),
+        UsageCounter(owner_id=test_user.id, project_id=project.id, period=month_period(), shard=5, report_count=-1),
+    ])
+    await db_session.commit()
+
+    assert await get_project_report_count(db_session, project.id) == 5
+    assert await get_monthly_report_count(db_session, test_user.id, month_period()) == 1
+    assert await get_max_project_report_count(db_session, test_user.id) == 5
+
+    assert await reconcile_usage_counters(db_session) == 2
+    assert await get_project_report_count(db_session, project.id) == 2
+    assert await get_monthly_report_count(db_session, test_user.id, month_period()) == 2
+    assert await reconcile_usage_counters(db_session) == 0
+
+
+async def test_reconcile_keeps_reports_added_before_the_write(
+    db_session: AsyncSession, test_user: User, test_project: tuple[Project, str], monkeypatch
+):
+    """A report ingested after the recount but before the correction is not lost."""
+    project, _ = test_project
+    await _add_reports(db_session, project, 2)
+    await db_session.execute(
+        update(UsageCounter)
+        .where(UsageCounter.project_id == project.id, UsageCounter.period == TOTAL_PERIOD)
+        .values(report_count=40)
+    )
+    await db_session.commit()
+
+    execute = db_session.execute
+    late_report: list[Report] = []
+
+    async def _execute(statement, *args, **kwargs):
+        if statement.is_dml and not late_report:
+            late_report.append(
+                Report(
+                    id=uuid.uuid4(),
+                    project_id=project.id,
+                    tracking_id="BUG-0003",
+                    title="Late bug",
+                    description="counted",
+                    severity=Severity.LOW,
+                    category=Category.BUG,
+                    created_at=datetime.now(timezone.utc),
+                )
+            )
+            db_session.add(late_report[0])
+            await db_session.flush()
+        return await execute(statement, *args, **kwargs)
+
+    monkeypatch.setattr(db_session, "execute", _execute)
+    assert await reconcile_usage_counters(db_session) == 1
+    monkeypatch.undo()
+
+    assert late_report
+    assert await get_project_report_count(db_session, project.id) == 3
+    assert await reconcile_usage_counters(db_session) == 0
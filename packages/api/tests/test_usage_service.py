@@ -0,0 +1,130 @@
+"""Tests for the cached, N+1-free usage snapshot."""
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timezone
+
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.enums import Plan
+from app.models.project import Project
+from app.models.project_member import ProjectMember
+from app.models.report import Category, Report, Severity
+from app.models.user import User
+from app.services.usage_service import get_user_usage
+
+
+def _project(owner: User, name: str) -> Project:
+    return Project(
+        id=uuid.uuid4(),
+        owner_id=owner.id,
+        name=name,
+        domain=f"{name.lower()}.example.com",
+        api_key_hash=uuid.uuid4().hex,
+        api_key_prefix=f"bsk_pub_{name[:4].lower()}",
+        settings={},
+        is_active=True,
+        created_at=datetime.now(timezone.utc),
+    )
+
+
+def _count_statements(db_session: AsyncSession) -> list[str]:
+    statements: list[str] = []
+
+    @event.listens_for(db_session.bind.sync_engine, "before_cursor_execute")
+    def _record(_conn, _cursor, statement, *_args) -> None:
+        statements.append(statement)
+
+    return statements
+
+
+async def test_query_count_does_not_grow_with_projects(db_session: AsyncSession, test_user: User):
+    test_user.plan = Plan.ENTERPRISE
+    projects = [_project(test_user, f"Proj{i}") for i in range(6)]
+    db_session.add_all(projects)
+    await db_session.flush()
+    db_session.add_all(
+        ProjectMember(project_id=project.id, email=f"m{i}@example.com", role="member")
+        for i, project in enumerate(projects[:3])
+    )
+    await db_session.commit()
+
+    statements = _count_statements(db_session)
+    usage = await get_user_usage(db_session, test_user)
+
+    assert len(statements) == 2
+    assert usage.projects_count == 6
+    assert [p.member_count for p in usage.team_members_per_project] == [2, 2, 2, 1, 1, 1]
+
+
+async def test_snapshot_is_cached_until_reports_change(
+    db_session: AsyncSession, test_user: User, test_project: tuple[Project, str]
+):
+    project, _ = test_project
+    assert (await get_user_usage(db_session, test_user)).monthly_reports_count == 0
+
+    statements = _count_statements(db_session)
+    await get_user_usage(db_session, test_user)
+    assert statements == []
+
+    db_session.add(
+        Report(
+            project_id=project.id,
+            tracking_id="BUG-0001",
+            title="Counted",
+            description="Counted",
+            severity=Severity.LOW,
+            category=Category.BUG,
+        )
+    )
+    await db_session.commit()
+
+    usage = await get_user_usage(db_session, test_user)
+    assert usage.monthly_reports_count == 1
+    assert usage.reports_per_project_count == 1
+
+
+async def test_snapshot_follows_members_and_plan(
+    db_session: AsyncSession, test_user: User, test_project: tuple[Project, str]
+):
+    project, _ = test_project
+    usage = await get_user_usage(db_session, test_user)
+    assert usage.team_members_per_project[0].member_count == 1
+    assert usage.projects_limit == 1
+
+    db_session.add(ProjectMember(project_id=project.id, email="new@example.com", role="member"))
+    test_user.plan = Plan.TEAM
+    await db_session.commit()
+
+    usage = await get_user_usage(db_session, test_user)
+    assert usage.team_members_per_project[0].member_count == 2
+    assert usage.projects_limit != 1
+
+
+async def test_batch_ingest_evicts_snapshot(
+    client: AsyncClient, db_session: AsyncSession, test_user: User, test_project: tuple[Project, str]
+):
+    _, raw_key = test_project
+    assert (await get_user_usage(db_session, test_user)).monthly_reports_count == 0
+
+    # The batch endpoint inserts with a core INSERT, which never flushes ORM objects
+    resp = await client.post(
+        "/api/v1/reports/batch",
+        json={
+            "reports": [
+                {
+                    "title": f"Offline bug {i}",
+                    "description": "Queued offline",
+                    "severity": "low",
+                    "category": "bug",
+                }
+                for i in range(2)
+            ]
+        },
+        headers={"X-API-Key": raw_key},
+    )
+    assert resp.json()["created"] == 2
+
+    assert (await get_user_usage(db_session, test_user)).monthly_reports_count == 2
@@ -7,7 +7,7 @@ import { PageHeader } from "@/components/shared/page-header";
 import { BugFiltersBar } from "@/components/bugs/bug-filters";
 import { BugTable } from "@/components/bugs/bug-table";
 import { KanbanBoard } from "@/components/bugs/kanban-board";
-import { useBugs } from "@/hooks/use-bugs";
+import { useBugs, useBugFacets } from "@/hooks/use-bugs";
 import { useProjectContext } from "@/providers/project-provider";
 import { cn } from "@/lib/utils";
 import type { BugFilters } from "@/types";
@@ -30,6 +30,13 @@ export default function BugsPage() {
     ...filters,
     projectId: selectedProjectId,
   });
+  // Chip counts ignore the status and severity selection, so every chip
+  // shows how many reports it would add for the current search and dates
+  const { data: facets } = useBugFacets({
+    projectId: selectedProjectId,
+    search: filters.search,
+    dateRange: filters.dateRange,
+  });
 
   return (
     <div>
@@ -65,7 +72,11 @@ export default function BugsPage() {
         }
       />
 
-      <BugFiltersBar filters={filters} onFiltersChange={setFilters} />
+      <BugFiltersBar
+        filters={filters}
+        facets={facets}
+        onFiltersChange={setFilters}
+      />
 
       {viewMode === "table" ? (
         <BugTable bugs={data?.items} isLoading={isLoading} />
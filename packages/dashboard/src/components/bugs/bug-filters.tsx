@@ -3,10 +3,11 @@
 import { useState, useEffect, useRef } from "react";
 import { Search, X } from "lucide-react";
 import { useTranslations } from "next-intl";
-import type { BugFilters, Severity, Status } from "@/types";
+import type { BugFacets, BugFilters, Severity, Status } from "@/types";
 
 interface BugFiltersBarProps {
   filters: BugFilters;
+  facets?: BugFacets;
   onFiltersChange: (filters: BugFilters) => void;
 }
 
@@ -29,7 +30,7 @@ const DATE_OPTION_KEYS = [
 const FIXED_STATUSES: Status[] = ["resolved", "closed"];
 const NON_FIXED_STATUSES: Status[] = ["new", "triaging", "in_progress"];
 
-export function BugFiltersBar({ filters, onFiltersChange }: BugFiltersBarProps) {
+export function BugFiltersBar({ filters, facets, onFiltersChange }: BugFiltersBarProps) {
   const t = useTranslations("bugs");
   const [searchInput, setSearchInput] = useState(filters.search ?? "");
   const filtersRef = useRef(filters);
@@ -140,6 +141,9 @@ export function BugFiltersBar({ filters, onFiltersChange }: BugFiltersBarProps)
               }`}
             >
               {t(statusKeyMap[status])}
+              {facets && (
+                <span className="ml-1 opacity-70">{facets.status[status] ?? 0}</span>
+              )}
             </button>
           );
         })}
@@ -169,6 +173,9 @@ export function BugFiltersBar({ filters, onFiltersChange }: BugFiltersBarProps)
               }`}
             >
               {t(severityKeyMap[severity])}
+              {facets && (
+                <span className="ml-1 opacity-70">{facets.severity[severity] ?? 0}</span>
+              )}
             </button>
           );
         })}
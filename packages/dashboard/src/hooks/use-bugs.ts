@@ -6,7 +6,24 @@ import {
 } from "@tanstack/react-query";
 import apiClient from "@/lib/api-client";
 import { queryKeys } from "@/lib/query-keys";
-import type { BugReport, BugListItem, BugFilters, PaginatedResponse } from "@/types";
+import type {
+  BugFacets,
+  BugReport,
+  BugListItem,
+  BugFilters,
+  PaginatedResponse,
+} from "@/types";
+
+function bugFilterParams(filters: BugFilters): URLSearchParams {
+  const params = new URLSearchParams();
+  if (filters.projectId) params.set("project_id", filters.projectId);
+  if (filters.search) params.set("search", filters.search);
+  if (filters.status?.length) params.set("status", filters.status.join(","));
+  if (filters.severity?.length)
+    params.set("severity", filters.severity.join(","));
+  if (filters.dateRange) params.set("date_range", filters.dateRange);
+  return params;
+}
 
 export function useBugs(filters: BugFilters) {
   return useQuery({
@@ -15,14 +32,7 @@ export function useBugs(filters: BugFilters) {
     staleTime: 30_000,
     gcTime: 5 * 60 * 1000,
     queryFn: async (): Promise<PaginatedResponse<BugListItem>> => {
-      const params = new URLSearchParams();
-      if (filters.projectId) params.set("project_id", filters.projectId);
-      if (filters.search) params.set("search", filters.search);
-      if (filters.status?.length)
-        params.set("status", filters.status.join(","));
-      if (filters.severity?.length)
-        params.set("severity", filters.severity.join(","));
-      if (filters.dateRange) params.set("date_range", filters.dateRange);
+      const params = bugFilterParams(filters);
       if (filters.page) params.set("page", String(filters.page));
       if (filters.pageSize) params.set("page_size", String(filters.pageSize));
       if (filters.sortBy) params.set("sort_by", filters.sortBy);
@@ -36,6 +46,27 @@ export function useBugs(filters: BugFilters) {
   });
 }
 
+export type BugFacetFilters = Pick<
+  BugFilters,
+  "projectId" | "search" | "status" | "severity" | "dateRange"
+>;
+
+export function useBugFacets(filters: BugFacetFilters) {
+  return useQuery({
+    queryKey: queryKeys.bugs.facets(filters),
+    placeholderData: keepPreviousData,
+    staleTime: 30_000,
+    gcTime: 5 * 60 * 1000,
+    queryFn: async (): Promise<BugFacets> => {
+      const params = bugFilterParams(filters);
+      const response = await apiClient.get<BugFacets>(
+        `/reports/facets?${params.toString()}`,
+      );
+      return response.data;
+    },
+  });
+}
+
 export function useBug(id: string) {
   return useQuery({
     queryKey: queryKeys.bugs.detail(id),
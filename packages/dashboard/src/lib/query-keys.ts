@@ -4,6 +4,7 @@ export const queryKeys = {
   bugs: {
     all: ["bugs"] as const,
     list: (filters: BugFilters) => ["bugs", "list", filters] as const,
+    facets: (filters: BugFilters) => ["bugs", "facets", filters] as const,
     detail: (id: string) => ["bugs", "detail", id] as const,
   },
   projects: {
@@ -192,6 +192,15 @@ export interface PaginatedResponse<T> {
   total: number;
   page: number;
   pageSize: number;
+  nextCursor?: string | null;
+  totalIsEstimate?: boolean;
+}
+
+export interface BugFacets {
+  total: number;
+  status: Record<string, number>;
+  severity: Record<string, number>;
+  category: Record<string, number>;
 }
 
 export interface BugListItem {
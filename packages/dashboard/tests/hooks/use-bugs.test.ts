@@ -2,7 +2,7 @@ import { describe, it, expect, vi, beforeEach } from 'vitest';
 import { renderHook, waitFor } from '@testing-library/react';
 import { QueryClient, QueryClientProvider } from '@tanstack/react-query';
 import { createElement, type ReactNode } from 'react';
-import { useBugs, useBug, useUpdateBug, useDeleteBug } from '@/hooks/use-bugs';
+import { useBugs, useBugFacets, useBug, useUpdateBug, useDeleteBug } from '@/hooks/use-bugs';
 import apiClient from '@/lib/api-client';
 
 vi.mock('@/lib/api-client', () => ({
@@ -54,6 +54,34 @@ describe('useBugs', () => {
   });
 });
 
+describe('useBugFacets', () => {
+  beforeEach(() => {
+    vi.clearAllMocks();
+  });
+
+  it('fetches facet counts with the list filter params', async () => {
+    const mockFacets = {
+      total: 3,
+      status: { new: 2, closed: 1 },
+      severity: { high: 3 },
+      category: { bug: 3 },
+    };
+    mockApiClient.get.mockResolvedValueOnce({ data: mockFacets });
+
+    const { result } = renderHook(
+      () => useBugFacets({ projectId: 'p-1', search: 'crash', dateRange: '7d' }),
+      { wrapper: createWrapper() },
+    );
+
+    await waitFor(() => expect(result.current.isSuccess).toBe(true));
+
+    expect(mockApiClient.get).toHaveBeenCalledWith(
+      '/reports/facets?project_id=p-1&search=crash&date_range=7d',
+    );
+    expect(result.current.data).toEqual(mockFacets);
+  });
+});
+
 describe('useBug', () => {
   beforeEach(() => {
     vi.clearAllMocks();
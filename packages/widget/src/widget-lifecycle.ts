@@ -57,16 +57,31 @@ export function init(userConfig: Partial<BugSparkConfig>): void {
   checkForUpdates();
 }
 
-function fetchRemoteConfig(currentConfig: BugSparkConfig): void {
-  fetch(`${currentConfig.endpoint}/projects/widget-config`, {
+interface WidgetBootstrap {
+  config?: Record<string, unknown>;
+  consoleLogQuota?: { allowed?: boolean };
+}
+
+// Config and quota come from one endpoint; the browser revalidates it with
+// If-None-Match, so repeat calls are usually answered with a 304.
+function fetchBootstrap(currentConfig: BugSparkConfig): Promise<WidgetBootstrap | undefined> {
+  return fetch(`${currentConfig.endpoint}/projects/widget-bootstrap`, {
     headers: { 'X-API-Key': currentConfig.projectKey },
-  })
-    .then((res) => {
-      if (!res.ok) return;
-      return res.json();
-    })
-    .then((data: Record<string, unknown> | undefined) => {
-      if (!data || !config) return;
+  }).then((res) => {
+    if (!res.ok) return undefined;
+    return res.json() as Promise<WidgetBootstrap>;
+  });
+}
+
+function fetchRemoteConfig(currentConfig: BugSparkConfig): void {
+  fetchBootstrap(currentConfig)
+    .then((bootstrap) => {
+      if (!bootstrap || !config) return;
+      if (bootstrap.consoleLogQuota?.allowed === false) {
+        consoleLogAllowed = false;
+      }
+      const data = bootstrap.config;
+      if (!data) return;
       let shouldUpdateTheme = false;
 
       if (typeof data.enableScreenshot === 'boolean') {
@@ -128,12 +143,8 @@ let consoleLogAllowed = true;
 async function fetchConsoleLogQuota(): Promise<boolean> {
   if (!config) return true;
   try {
-    const res = await fetch(`${config.endpoint}/projects/console-log-quota`, {
-      headers: { 'X-API-Key': config.projectKey },
-    });
-    if (!res.ok) return true;
-    const data = await res.json() as { allowed: boolean };
-    return data.allowed !== false;
+    const bootstrap = await fetchBootstrap(config);
+    return bootstrap?.consoleLogQuota?.allowed !== false;
   } catch {
     return true;
   }